@@ -23,7 +23,14 @@ from __future__ import annotations
 
 import logging
 
-from .api import from_bytes, from_fp, from_path, is_binary
+from .api import (
+    CharsetDetector,
+    from_bytes,
+    from_fp,
+    from_path,
+    from_paths,
+    is_binary,
+)
 from .legacy import detect
 from .models import CharsetMatch, CharsetMatches
 from .utils import set_logging_handler
@@ -32,8 +39,10 @@ from .version import VERSION, __version__
 __all__ = (
     "from_fp",
     "from_path",
+    "from_paths",
     "from_bytes",
     "is_binary",
+    "CharsetDetector",
     "detect",
     "CharsetMatch",
     "CharsetMatches",
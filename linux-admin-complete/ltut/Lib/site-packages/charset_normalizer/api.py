@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import logging
-from os import PathLike
-from typing import BinaryIO
+from codecs import IncrementalDecoder, getincrementaldecoder
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from mmap import ACCESS_READ, mmap
+from os import PathLike, fstat
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, TypeVar
 
 from .cd import (
     coherence_ratio,
@@ -10,9 +16,20 @@ from .cd import (
     mb_encoding_languages,
     merge_coherence_ratios,
 )
-from .constant import IANA_SUPPORTED, TOO_BIG_SEQUENCE, TOO_SMALL_SEQUENCE, TRACE
+from .constant import (
+    CONTROL_BYTES,
+    FINGERPRINT_SAMPLE_COUNT,
+    FINGERPRINT_SAMPLE_SIZE,
+    FILES_PER_BATCH,
+    IANA_SUPPORTED,
+    RE_UTF8_C1_CONTROL,
+    STRICT_DECODE_SLICE,
+    TOO_BIG_SEQUENCE,
+    TOO_SMALL_SEQUENCE,
+    TRACE,
+)
 from .md import mess_ratio
-from .models import CharsetMatch, CharsetMatches
+from .models import CharsetMatch, CharsetMatches, CoherenceMatches
 from .utils import (
     any_specified_encoding,
     cut_sequence_chunks,
@@ -29,9 +46,400 @@ explain_handler.setFormatter(
     logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
 )
 
+# Every byte but the control characters, for bytes.translate() to delete.
+_NON_CONTROL_BYTES: bytes = bytes(b for b in range(256) if b not in CONTROL_BYTES)
+
+
+class _Probe:
+    """
+    Outcome of probing a single code page against a payload, see _probe_encoding().
+    """
+
+    # The code page has no incremental decoder.
+    UNSUPPORTED = "unsupported"
+    # The code page is too similar to one that was deemed too messy already.
+    SIMILAR = "similar"
+    # The payload cannot be decoded at all.
+    HARD_FAILURE = "hard_failure"
+    # The payload decodes, but too messy.
+    SOFT_FAILURE = "soft_failure"
+    PASSED = "passed"
+
+    def __init__(
+        self,
+        status: str,
+        decoded_payload: str | None = None,
+        mean_mess_ratio: float = 0.0,
+        lazy_str_hard_failure: bool = False,
+        languages: CoherenceMatches | None = None,
+    ):
+        self.status: str = status
+        self.decoded_payload: str | None = decoded_payload
+        self.mean_mess_ratio: float = mean_mess_ratio
+        self.lazy_str_hard_failure: bool = lazy_str_hard_failure
+        self.languages: CoherenceMatches = languages or []
+
+
+def _strict_decode(
+    sequences: bytes | bytearray | mmap, encoding_iana: str, start: int = 0
+) -> None:
+    """
+    Decode the payload from start on with errors="strict", STRICT_DECODE_SLICE bytes at a time, so that neither it nor
+    its decoded text is ever held in memory as a whole. Raise UnicodeDecodeError as a plain decode would.
+    """
+    decoder = getincrementaldecoder(encoding_iana)()
+
+    with memoryview(sequences) as view:
+        for i in range(start, len(view), STRICT_DECODE_SLICE):
+            with view[i : i + STRICT_DECODE_SLICE] as chunk:
+                decoder.decode(chunk)
+
+    decoder.decode(b"", final=True)
+
+
+def _probe_encoding(
+    encoding_iana: str,
+    tested_but_soft_failure: list[str],
+    sequences: bytes | bytearray | mmap,
+    steps: int,
+    chunk_size: int,
+    threshold: float,
+    sig_encoding: str | None,
+    sig_payload: bytes,
+    is_too_large_sequence: bool,
+    explain_mess: bool,
+    language_threshold: float,
+    measure_coherence: bool = True,
+) -> _Probe:
+    """
+    Decode the payload with given code page, then measure the mess of some chunks of it
+    and, if low enough and measure_coherence is set, their coherence. This does not depend
+    on any other code page but those given in tested_but_soft_failure, that are not worth
+    the measure when similar. Thus, different code pages can be probed concurrently.
+    """
+    length: int = len(sequences)
+
+    decoded_payload: str | None = None
+    bom_or_sig_available: bool = sig_encoding == encoding_iana
+    strip_sig_or_bom: bool = bom_or_sig_available and should_strip_sig_or_bom(
+        encoding_iana
+    )
+
+    try:
+        is_multi_byte_decoder: bool = is_multi_byte_encoding(encoding_iana)
+    except (ModuleNotFoundError, ImportError):
+        logger.log(
+            TRACE,
+            "Encoding %s does not provide an IncrementalDecoder",
+            encoding_iana,
+        )
+        return _Probe(_Probe.UNSUPPORTED)
+
+    # A large mapped payload is never read as a whole, only where sampled and slice by slice.
+    is_mapped: bool = isinstance(sequences, mmap)
+
+    try:
+        if is_too_large_sequence and (is_multi_byte_decoder is False or is_mapped):
+            # Not final, a character cut at the end of the head is no error.
+            getincrementaldecoder(encoding_iana)().decode(
+                sequences[: int(50e4)]
+                if strip_sig_or_bom is False
+                else sequences[len(sig_payload) : int(50e4)]
+            )
+        else:
+            decoded_payload = str(
+                (
+                    sequences
+                    if strip_sig_or_bom is False
+                    else sequences[len(sig_payload) :]
+                ),
+                encoding=encoding_iana,
+            )
+    except (UnicodeDecodeError, LookupError) as e:
+        if not isinstance(e, LookupError):
+            logger.log(
+                TRACE,
+                "Code page %s does not fit given bytes sequence at ALL. %s",
+                encoding_iana,
+                str(e),
+            )
+        return _Probe(_Probe.HARD_FAILURE)
+
+    for encoding_soft_failed in tested_but_soft_failure:
+        if is_cp_similar(encoding_iana, encoding_soft_failed):
+            return _Probe(_Probe.SIMILAR)
+
+    r_ = range(
+        0 if not bom_or_sig_available else len(sig_payload),
+        length,
+        int(length / steps),
+    )
+
+    multi_byte_bonus: bool = (
+        is_multi_byte_decoder
+        and decoded_payload is not None
+        and len(decoded_payload) < length
+    )
+
+    if multi_byte_bonus:
+        logger.log(
+            TRACE,
+            "Code page %s is a multi byte encoding table and it appear that at least one character "
+            "was encoded using n-bytes.",
+            encoding_iana,
+        )
+
+    max_chunk_gave_up: int = int(len(r_) / 4)
+
+    max_chunk_gave_up = max(max_chunk_gave_up, 2)
+    early_stop_count: int = 0
+    lazy_str_hard_failure = False
+
+    md_chunks: list[str] = []
+    md_ratios = []
+
+    try:
+        for chunk in cut_sequence_chunks(
+            sequences,
+            encoding_iana,
+            r_,
+            chunk_size,
+            bom_or_sig_available,
+            strip_sig_or_bom,
+            sig_payload,
+            is_multi_byte_decoder,
+            decoded_payload,
+        ):
+            md_chunks.append(chunk)
+
+            md_ratios.append(
+                mess_ratio(
+                    chunk,
+                    threshold,
+                    explain_mess,
+                )
+            )
+
+            if md_ratios[-1] >= threshold:
+                early_stop_count += 1
+
+            if (early_stop_count >= max_chunk_gave_up) or (
+                bom_or_sig_available and strip_sig_or_bom is False
+            ):
+                break
+    except (
+        UnicodeDecodeError
+    ) as e:  # Lazy str loading may have missed something there
+        logger.log(
+            TRACE,
+            "LazyStr Loading: After MD chunk decode, code page %s does not fit given bytes sequence at ALL. %s",
+            encoding_iana,
+            str(e),
+        )
+        early_stop_count = max_chunk_gave_up
+        lazy_str_hard_failure = True
+
+    # We might want to check the sequence again with the whole content
+    # Only if initial MD tests passes
+    if (
+        not lazy_str_hard_failure
+        and is_too_large_sequence
+        and (not is_multi_byte_decoder or is_mapped)
+    ):
+        try:
+            if is_mapped:
+                _strict_decode(
+                    sequences,
+                    encoding_iana,
+                    len(sig_payload) if strip_sig_or_bom else 0,
+                )
+            else:
+                sequences[int(50e3) :].decode(encoding_iana, errors="strict")
+        except UnicodeDecodeError as e:
+            logger.log(
+                TRACE,
+                "LazyStr Loading: After final lookup, code page %s does not fit given bytes sequence at ALL. %s",
+                encoding_iana,
+                str(e),
+            )
+            return _Probe(_Probe.HARD_FAILURE)
+
+    mean_mess_ratio: float = sum(md_ratios) / len(md_ratios) if md_ratios else 0.0
+    if mean_mess_ratio >= threshold or early_stop_count >= max_chunk_gave_up:
+        logger.log(
+            TRACE,
+            "%s was excluded because of initial chaos probing. Gave up %i time(s). "
+            "Computed mean chaos is %f %%.",
+            encoding_iana,
+            early_stop_count,
+            round(mean_mess_ratio * 100, ndigits=3),
+        )
+        return _Probe(
+            _Probe.SOFT_FAILURE,
+            decoded_payload,
+            mean_mess_ratio,
+            lazy_str_hard_failure,
+        )
+
+    logger.log(
+        TRACE,
+        "%s passed initial chaos probing. Mean measured chaos is %f %%",
+        encoding_iana,
+        round(mean_mess_ratio * 100, ndigits=3),
+    )
+
+    if not measure_coherence:
+        return _Probe(_Probe.PASSED, decoded_payload, mean_mess_ratio)
+
+    if not is_multi_byte_decoder:
+        target_languages: list[str] = encoding_languages(encoding_iana)
+    else:
+        target_languages = mb_encoding_languages(encoding_iana)
+
+    if target_languages:
+        logger.log(
+            TRACE,
+            "{} should target any language(s) of {}".format(
+                encoding_iana, str(target_languages)
+            ),
+        )
+
+    cd_ratios = []
+
+    # We shall skip the CD when its about ASCII
+    # Most of the time its not relevant to run "language-detection" on it.
+    if encoding_iana != "ascii":
+        for chunk in md_chunks:
+            chunk_languages = coherence_ratio(
+                chunk,
+                language_threshold,
+                ",".join(target_languages) if target_languages else None,
+            )
+
+            cd_ratios.append(chunk_languages)
+
+    cd_ratios_merged = merge_coherence_ratios(cd_ratios)
+
+    if cd_ratios_merged:
+        logger.log(
+            TRACE,
+            "We detected language {} using {}".format(
+                cd_ratios_merged, encoding_iana
+            ),
+        )
+
+    return _Probe(
+        _Probe.PASSED,
+        decoded_payload,
+        mean_mess_ratio,
+        languages=cd_ratios_merged,
+    )
+
+
+def _submit_probes(
+    executor: Executor,
+    probes: dict[str, Future[_Probe]],
+    encodings: list[str],
+    tested: set[str],
+    cp_isolation: list[str],
+    cp_exclusion: list[str],
+    sig_encoding: str | None,
+    probe_arguments: tuple[Any, ...],
+) -> None:
+    """
+    Submit the probes of given code pages, but those from_bytes() would pass over anyway.
+    """
+    for encoding_iana in encodings:
+        if (
+            encoding_iana in probes
+            or encoding_iana in tested
+            or (cp_isolation and encoding_iana not in cp_isolation)
+            or encoding_iana in cp_exclusion
+            or (
+                encoding_iana in {"utf_16", "utf_32", "utf_7"}
+                and encoding_iana != sig_encoding
+            )
+        ):
+            continue
+
+        probes[encoding_iana] = executor.submit(
+            _probe_encoding, encoding_iana, [], *probe_arguments
+        )
+
+
+def _cancel_probes(probes: dict[str, Future[_Probe]]) -> None:
+    """
+    Cancel the probes that are not running yet, once the detection is over.
+    """
+    for probe in probes.values():
+        probe.cancel()
+
+
+def _fast_match(
+    probe_arguments: tuple[Any, ...],
+    specified_encoding: str | None,
+    sig_encoding: str | None,
+    cp_isolation: list[str],
+    cp_exclusion: list[str],
+) -> CharsetMatch | None:
+    """
+    Settle the detection right away for the most common case, a payload that is plain ASCII or UTF-8, with no control
+    character, and does not declare any other encoding. Only that code page is probed, and its match kept where the
+    full detection would stop at it: no mess at all, or for UTF-8 that is not ASCII nor declared, less than 0.1 of it.
+    The languages are only measured once asked for. Return None when that does not apply.
+    """
+    sequences: bytes | bytearray = probe_arguments[0]
+
+    if sig_encoding not in {None, "utf_8"}:
+        return None
+
+    if specified_encoding not in {None, "ascii", "utf_8"}:
+        return None
+
+    # Deleting every other byte leaves the control characters, if any.
+    if sequences.translate(None, _NON_CONTROL_BYTES):
+        return None
+
+    if b"\xc2" in sequences and RE_UTF8_C1_CONTROL.search(sequences) is not None:
+        return None
+
+    is_ascii: bool = sig_encoding is None and sequences.isascii()
+
+    encoding_iana: str = (specified_encoding or "ascii") if is_ascii else "utf_8"
+
+    if (cp_isolation and encoding_iana not in cp_isolation) or (
+        encoding_iana in cp_exclusion
+    ):
+        return None
+
+    # Not valid UTF-8 is a hard failure, left to the full detection as well.
+    probe: _Probe = _probe_encoding(
+        encoding_iana, [], *probe_arguments, measure_coherence=False
+    )
+
+    if probe.status != _Probe.PASSED:
+        return None
+
+    # Otherwise, the full detection would weigh other code pages against it.
+    if probe.mean_mess_ratio > 0.0 and (
+        is_ascii or specified_encoding is not None or probe.mean_mess_ratio >= 0.1
+    ):
+        return None
+
+    return CharsetMatch(
+        sequences,
+        encoding_iana,
+        probe.mean_mess_ratio,
+        sig_encoding is not None,
+        # Like the detection, skip the languages when it is about ASCII.
+        [] if encoding_iana == "ascii" else None,
+        probe.decoded_payload,
+        preemptive_declaration=specified_encoding,
+    )
+
 
 def from_bytes(
-    sequences: bytes | bytearray,
+    sequences: bytes | bytearray | mmap,
     steps: int = 5,
     chunk_size: int = 512,
     threshold: float = 0.2,
@@ -41,6 +449,7 @@ def from_bytes(
     explain: bool = False,
     language_threshold: float = 0.1,
     enable_fallback: bool = True,
+    executor: Executor | None = None,
 ) -> CharsetMatches:
     """
     Given a raw bytes sequence, return the best possibles charset usable to render str objects.
@@ -58,15 +467,28 @@ def from_bytes(
     By default the library does not setup any handler other than the NullHandler, if you choose to set the 'explain'
     toggle to True it will alter the logger configuration to add a StreamHandler that is suitable for debugging.
     Custom logging format and handler can be set manually.
+
+    Given a concurrent.futures executor, the code pages are probed concurrently. The result is the same as without,
+    and the code pages not probed yet are cancelled as soon as a prioritized one settles the detection. With a
+    ProcessPoolExecutor, the payload is copied to the worker for each code page.
+
+    A mmap is accepted too. Past TOO_BIG_SEQUENCE bytes, it is never copied as a whole: the chunks sampled are read
+    from it, and a code page that passes the probing is checked to decode all of it strictly, slice by slice. The
+    matches then read through the mapping rather than hold a copy, so it must stay open for as long as they are used.
+    It cannot be sent to a ProcessPoolExecutor.
     """
 
-    if not isinstance(sequences, (bytearray, bytes)):
+    if not isinstance(sequences, (bytearray, bytes, mmap)):
         raise TypeError(
-            "Expected object of type bytes or bytearray, got: {}".format(
+            "Expected object of type bytes, bytearray or mmap, got: {}".format(
                 type(sequences)
             )
         )
 
+    if isinstance(sequences, mmap) and len(sequences) < TOO_BIG_SEQUENCE:
+        # Read whole by the detection anyway.
+        sequences = sequences[:]
+
     if explain:
         previous_logger_level: int = logger.level
         logger.addHandler(explain_handler)
@@ -177,7 +599,72 @@ def from_bytes(
     if "utf_8" not in prioritized_encodings:
         prioritized_encodings.append("utf_8")
 
-    for encoding_iana in prioritized_encodings + IANA_SUPPORTED:
+    candidates: list[str] = prioritized_encodings + IANA_SUPPORTED
+
+    probe_arguments: tuple[Any, ...] = (
+        sequences,
+        steps,
+        chunk_size,
+        threshold,
+        sig_encoding,
+        sig_payload,
+        is_too_large_sequence,
+        explain is True and 1 <= len(cp_isolation) <= 2,
+        language_threshold,
+    )
+
+    # Its checks would read a mapped payload as a whole.
+    fast_match: CharsetMatch | None = (
+        _fast_match(
+            probe_arguments,
+            specified_encoding,
+            sig_encoding,
+            cp_isolation,
+            cp_exclusion,
+        )
+        if not isinstance(sequences, mmap)
+        else None
+    )
+
+    if fast_match is not None:
+        logger.debug(
+            "Encoding detection: %s is most likely the one as the payload is free of control characters and mess.",
+            fast_match.encoding,
+        )
+        if explain:  # Defensive: ensure exit path clean handler
+            logger.removeHandler(explain_handler)
+            logger.setLevel(previous_logger_level)
+        return CharsetMatches([fast_match])
+
+    probes: dict[str, Future[_Probe]] = {}
+
+    if executor is not None:
+        # Only the prioritized code pages can end the detection early. Hold the
+        # others back until those are settled so that we may not need them at all.
+        _submit_probes(
+            executor,
+            probes,
+            prioritized_encodings,
+            tested,
+            cp_isolation,
+            cp_exclusion,
+            sig_encoding,
+            probe_arguments,
+        )
+
+    for position, encoding_iana in enumerate(candidates):
+        if executor is not None and position == len(prioritized_encodings):
+            _submit_probes(
+                executor,
+                probes,
+                candidates[position:],
+                tested,
+                cp_isolation,
+                cp_exclusion,
+                sig_encoding,
+                probe_arguments,
+            )
+
         if cp_isolation and encoding_iana not in cp_isolation:
             continue
 
@@ -189,11 +676,7 @@ def from_bytes(
 
         tested.add(encoding_iana)
 
-        decoded_payload: str | None = None
         bom_or_sig_available: bool = sig_encoding == encoding_iana
-        strip_sig_or_bom: bool = bom_or_sig_available and should_strip_sig_or_bom(
-            encoding_iana
-        )
 
         if encoding_iana in {"utf_16", "utf_32"} and not bom_or_sig_available:
             logger.log(
@@ -210,43 +693,19 @@ def from_bytes(
             )
             continue
 
-        try:
-            is_multi_byte_decoder: bool = is_multi_byte_encoding(encoding_iana)
-        except (ModuleNotFoundError, ImportError):
-            logger.log(
-                TRACE,
-                "Encoding %s does not provide an IncrementalDecoder",
-                encoding_iana,
+        # Probes run ahead by the executor did not know which code pages would
+        # soft fail before them, the similarity is checked below in any case.
+        if encoding_iana in probes:
+            probe: _Probe = probes.pop(encoding_iana).result()
+        else:
+            probe = _probe_encoding(
+                encoding_iana, tested_but_soft_failure, *probe_arguments
             )
+
+        if probe.status == _Probe.UNSUPPORTED:
             continue
 
-        try:
-            if is_too_large_sequence and is_multi_byte_decoder is False:
-                str(
-                    (
-                        sequences[: int(50e4)]
-                        if strip_sig_or_bom is False
-                        else sequences[len(sig_payload) : int(50e4)]
-                    ),
-                    encoding=encoding_iana,
-                )
-            else:
-                decoded_payload = str(
-                    (
-                        sequences
-                        if strip_sig_or_bom is False
-                        else sequences[len(sig_payload) :]
-                    ),
-                    encoding=encoding_iana,
-                )
-        except (UnicodeDecodeError, LookupError) as e:
-            if not isinstance(e, LookupError):
-                logger.log(
-                    TRACE,
-                    "Code page %s does not fit given bytes sequence at ALL. %s",
-                    encoding_iana,
-                    str(e),
-                )
+        if probe.status == _Probe.HARD_FAILURE:
             tested_but_hard_failure.append(encoding_iana)
             continue
 
@@ -266,111 +725,16 @@ def from_bytes(
             )
             continue
 
-        r_ = range(
-            0 if not bom_or_sig_available else len(sig_payload),
-            length,
-            int(length / steps),
-        )
-
-        multi_byte_bonus: bool = (
-            is_multi_byte_decoder
-            and decoded_payload is not None
-            and len(decoded_payload) < length
-        )
-
-        if multi_byte_bonus:
-            logger.log(
-                TRACE,
-                "Code page %s is a multi byte encoding table and it appear that at least one character "
-                "was encoded using n-bytes.",
-                encoding_iana,
-            )
-
-        max_chunk_gave_up: int = int(len(r_) / 4)
-
-        max_chunk_gave_up = max(max_chunk_gave_up, 2)
-        early_stop_count: int = 0
-        lazy_str_hard_failure = False
+        decoded_payload: str | None = probe.decoded_payload
+        mean_mess_ratio: float = probe.mean_mess_ratio
 
-        md_chunks: list[str] = []
-        md_ratios = []
-
-        try:
-            for chunk in cut_sequence_chunks(
-                sequences,
-                encoding_iana,
-                r_,
-                chunk_size,
-                bom_or_sig_available,
-                strip_sig_or_bom,
-                sig_payload,
-                is_multi_byte_decoder,
-                decoded_payload,
-            ):
-                md_chunks.append(chunk)
-
-                md_ratios.append(
-                    mess_ratio(
-                        chunk,
-                        threshold,
-                        explain is True and 1 <= len(cp_isolation) <= 2,
-                    )
-                )
-
-                if md_ratios[-1] >= threshold:
-                    early_stop_count += 1
-
-                if (early_stop_count >= max_chunk_gave_up) or (
-                    bom_or_sig_available and strip_sig_or_bom is False
-                ):
-                    break
-        except (
-            UnicodeDecodeError
-        ) as e:  # Lazy str loading may have missed something there
-            logger.log(
-                TRACE,
-                "LazyStr Loading: After MD chunk decode, code page %s does not fit given bytes sequence at ALL. %s",
-                encoding_iana,
-                str(e),
-            )
-            early_stop_count = max_chunk_gave_up
-            lazy_str_hard_failure = True
-
-        # We might want to check the sequence again with the whole content
-        # Only if initial MD tests passes
-        if (
-            not lazy_str_hard_failure
-            and is_too_large_sequence
-            and not is_multi_byte_decoder
-        ):
-            try:
-                sequences[int(50e3) :].decode(encoding_iana, errors="strict")
-            except UnicodeDecodeError as e:
-                logger.log(
-                    TRACE,
-                    "LazyStr Loading: After final lookup, code page %s does not fit given bytes sequence at ALL. %s",
-                    encoding_iana,
-                    str(e),
-                )
-                tested_but_hard_failure.append(encoding_iana)
-                continue
-
-        mean_mess_ratio: float = sum(md_ratios) / len(md_ratios) if md_ratios else 0.0
-        if mean_mess_ratio >= threshold or early_stop_count >= max_chunk_gave_up:
+        if probe.status == _Probe.SOFT_FAILURE:
             tested_but_soft_failure.append(encoding_iana)
-            logger.log(
-                TRACE,
-                "%s was excluded because of initial chaos probing. Gave up %i time(s). "
-                "Computed mean chaos is %f %%.",
-                encoding_iana,
-                early_stop_count,
-                round(mean_mess_ratio * 100, ndigits=3),
-            )
             # Preparing those fallbacks in case we got nothing.
             if (
                 enable_fallback
                 and encoding_iana in ["ascii", "utf_8", specified_encoding]
-                and not lazy_str_hard_failure
+                and not probe.lazy_str_hard_failure
             ):
                 fallback_entry = CharsetMatch(
                     sequences,
@@ -389,60 +753,17 @@ def from_bytes(
                     fallback_u8 = fallback_entry
             continue
 
-        logger.log(
-            TRACE,
-            "%s passed initial chaos probing. Mean measured chaos is %f %%",
-            encoding_iana,
-            round(mean_mess_ratio * 100, ndigits=3),
-        )
-
-        if not is_multi_byte_decoder:
-            target_languages: list[str] = encoding_languages(encoding_iana)
-        else:
-            target_languages = mb_encoding_languages(encoding_iana)
-
-        if target_languages:
-            logger.log(
-                TRACE,
-                "{} should target any language(s) of {}".format(
-                    encoding_iana, str(target_languages)
-                ),
-            )
-
-        cd_ratios = []
-
-        # We shall skip the CD when its about ASCII
-        # Most of the time its not relevant to run "language-detection" on it.
-        if encoding_iana != "ascii":
-            for chunk in md_chunks:
-                chunk_languages = coherence_ratio(
-                    chunk,
-                    language_threshold,
-                    ",".join(target_languages) if target_languages else None,
-                )
-
-                cd_ratios.append(chunk_languages)
-
-        cd_ratios_merged = merge_coherence_ratios(cd_ratios)
-
-        if cd_ratios_merged:
-            logger.log(
-                TRACE,
-                "We detected language {} using {}".format(
-                    cd_ratios_merged, encoding_iana
-                ),
-            )
-
         current_match = CharsetMatch(
             sequences,
             encoding_iana,
             mean_mess_ratio,
             bom_or_sig_available,
-            cd_ratios_merged,
+            probe.languages,
+            # Past the size fingerprinted in full, only the likely outcomes keep theirs.
             (
                 decoded_payload
                 if (
-                    is_too_large_sequence is False
+                    length <= FINGERPRINT_SAMPLE_COUNT * FINGERPRINT_SAMPLE_SIZE
                     or encoding_iana in [specified_encoding, "ascii", "utf_8"]
                 )
                 else None
@@ -462,6 +783,7 @@ def from_bytes(
                     "Encoding detection: %s is most likely the one.",
                     current_match.encoding,
                 )
+                _cancel_probes(probes)
                 if explain:  # Defensive: ensure exit path clean handler
                     logger.removeHandler(explain_handler)
                     logger.setLevel(previous_logger_level)
@@ -480,6 +802,7 @@ def from_bytes(
                 "Encoding detection: %s is most likely the one.",
                 probable_result.encoding,
             )
+            _cancel_probes(probes)
             if explain:  # Defensive: ensure exit path clean handler
                 logger.removeHandler(explain_handler)
                 logger.setLevel(previous_logger_level)
@@ -492,6 +815,7 @@ def from_bytes(
                 "the beginning of the sequence.",
                 encoding_iana,
             )
+            _cancel_probes(probes)
             if explain:  # Defensive: ensure exit path clean handler
                 logger.removeHandler(explain_handler)
                 logger.setLevel(previous_logger_level)
@@ -552,6 +876,7 @@ def from_fp(
     explain: bool = False,
     language_threshold: float = 0.1,
     enable_fallback: bool = True,
+    executor: Executor | None = None,
 ) -> CharsetMatches:
     """
     Same thing than the function from_bytes but using a file pointer that is already ready.
@@ -568,6 +893,7 @@ def from_fp(
         explain,
         language_threshold,
         enable_fallback,
+        executor,
     )
 
 
@@ -582,14 +908,34 @@ def from_path(
     explain: bool = False,
     language_threshold: float = 0.1,
     enable_fallback: bool = True,
+    executor: Executor | None = None,
 ) -> CharsetMatches:
     """
     Same thing than the function from_bytes but with one extra step. Opening and reading given file path in binary mode.
-    Can raise IOError.
+    A file of TOO_BIG_SEQUENCE bytes or more is memory-mapped rather than read, so that it is never loaded as a whole
+    during the detection. Its matches keep the mapping open until they are released. Can raise IOError.
     """
     with open(path, "rb") as fp:
-        return from_fp(
-            fp,
+        if fstat(fp.fileno()).st_size < TOO_BIG_SEQUENCE or isinstance(
+            executor, ProcessPoolExecutor
+        ):
+            return from_fp(
+                fp,
+                steps,
+                chunk_size,
+                threshold,
+                cp_isolation,
+                cp_exclusion,
+                preemptive_behaviour,
+                explain,
+                language_threshold,
+                enable_fallback,
+                executor,
+            )
+
+        # The mapping outlives the file, for as long as the matches refer to it.
+        return from_bytes(
+            mmap(fp.fileno(), 0, access=ACCESS_READ),
             steps,
             chunk_size,
             threshold,
@@ -599,9 +945,91 @@ def from_path(
             explain,
             language_threshold,
             enable_fallback,
+            executor,
         )
 
 
+_Item = TypeVar("_Item")
+_Result = TypeVar("_Result")
+
+
+def _call_batch(
+    function: Callable[[_Item], _Result], batch: list[_Item]
+) -> list[_Result]:
+    return [function(item) for item in batch]
+
+
+def _map_batches(
+    function: Callable[[_Item], _Result], items: Iterable[_Item], workers: int
+) -> Iterator[tuple[_Item, _Result]]:
+    """
+    Apply a picklable function to every item across a process pool, in batches of FILES_PER_BATCH items, and yield
+    each item with its result in the given order. Only a few batches per worker are in flight at any time so that
+    results do not pile up ahead of the consumer, and the items may come from a lazy iterable.
+    """
+    iterator: Iterator[_Item] = iter(items)
+    pending: deque[tuple[list[_Item], Future[list[_Result]]]] = deque()
+
+    with ProcessPoolExecutor(workers) as executor:
+        try:
+            while True:
+                while len(pending) < 2 * workers:
+                    batch: list[_Item] = list(islice(iterator, FILES_PER_BATCH))
+                    if not batch:
+                        break
+                    pending.append(
+                        (batch, executor.submit(_call_batch, function, batch))
+                    )
+
+                if not pending:
+                    return
+
+                batch, future = pending.popleft()
+                yield from zip(batch, future.result())
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def from_paths(
+    paths: Iterable[str | bytes | PathLike],  # type: ignore[type-arg]
+    steps: int = 5,
+    chunk_size: int = 512,
+    threshold: float = 0.20,
+    cp_isolation: list[str] | None = None,
+    cp_exclusion: list[str] | None = None,
+    preemptive_behaviour: bool = True,
+    explain: bool = False,
+    language_threshold: float = 0.1,
+    enable_fallback: bool = True,
+    workers: int | None = None,
+) -> Iterator[tuple[str | bytes | PathLike, CharsetMatches]]:  # type: ignore[type-arg]
+    """
+    Same thing than the function from_path but over many files, yielding each path along with its matches, in the
+    given order. Given more than one worker, the files are dealt in batches across a pool of that many processes.
+    Can raise IOError, as soon as the concerned path is reached.
+    """
+    detect = partial(
+        from_path,
+        steps=steps,
+        chunk_size=chunk_size,
+        threshold=threshold,
+        cp_isolation=cp_isolation,
+        cp_exclusion=cp_exclusion,
+        preemptive_behaviour=preemptive_behaviour,
+        explain=explain,
+        language_threshold=language_threshold,
+        enable_fallback=enable_fallback,
+    )
+
+    if workers is None or workers <= 1:
+        for path in paths:
+            yield path, detect(path)
+        return
+
+    yield from _map_batches(detect, paths, workers)
+
+
 def is_binary(
     fp_or_path_or_payload: PathLike | str | BinaryIO | bytes,  # type: ignore[type-arg]
     steps: int = 5,
@@ -666,3 +1094,466 @@ def is_binary(
         )
 
     return not guesses
+
+
+class _StreamCandidate:
+    """
+    Running state of a single code page within a CharsetDetector.
+    """
+
+    def __init__(self, encoding: str, is_multi_byte_decoder: bool, has_sig: bool):
+        self.encoding: str = encoding
+        self.is_multi_byte_decoder: bool = is_multi_byte_decoder
+        self.has_sig: bool = has_sig
+        self.decoder: IncrementalDecoder = getincrementaldecoder(encoding)()
+
+        self.hard_failure: bool = False
+        self.soft_failure: bool = False
+        # Too similar to a code page that soft failed before it.
+        self.skipped: bool = False
+
+        # Characters decoded so far, and where the next sample window begins.
+        self.decoded: int = 0
+        self.next_window_at: int = 0
+        self.window: list[str] = []
+        self.window_length: int = 0
+        self.window_start: int = 0
+
+        self.samples: int = 0
+        self.mess_sum: float = 0.0
+        self.early_stop_count: int = 0
+
+        # The first windows are only measured for coherence once the code page has
+        # gone through the initial chaos probing, like from_bytes() does.
+        self.pending_windows: list[str] = []
+        self.languages: dict[str, list[float]] = {}
+
+    @property
+    def alive(self) -> bool:
+        return not (self.hard_failure or self.soft_failure or self.skipped)
+
+    @property
+    def mean_mess_ratio(self) -> float:
+        return self.mess_sum / self.samples if self.samples else 0.0
+
+    @property
+    def coherence(self) -> CoherenceMatches:
+        """
+        Same as merge_coherence_ratios() over every window measured so far.
+        """
+        merge = [
+            (language, round(ratio_sum / ratio_count, 4))
+            for language, (ratio_sum, ratio_count) in self.languages.items()
+        ]
+        return sorted(merge, key=lambda x: x[1], reverse=True)
+
+
+class CharsetDetector:
+    """
+    Incremental counterpart of from_bytes(), for payloads that do not fit in memory or that arrive over time.
+    Feed it the payload piece by piece then call close() to retrieve the matches. Memory usage does not depend on
+    the payload size.
+
+    Every candidate code page decodes the whole payload as it comes, so that any byte that does not fit rules it
+    out. The mess and coherence are measured on windows of chunk_size characters, the first steps windows being
+    contiguous, then taken further and further apart, each steps windows doubling the gap. The measures are kept
+    as running statistics per code page. Once the outcome is known, done is set and further feeding is ignored.
+
+    >>> detector = CharsetDetector()
+    >>> for chunk in iter(lambda: fp.read(65536), b""):
+    ...     detector.feed(chunk)
+    ...     if detector.done:
+    ...         break
+    >>> detector.close().best()
+
+    The matches rely upon the beginning of the payload only, that is the 8192 bytes kept in memory. That is what
+    str(), output() and raw of those will give, their partial property telling when more than that was fed.
+    """
+
+    #: Bytes held back before starting, to look for a BOM/SIG or a declarative mark.
+    HEAD_SIZE: int = 8192
+
+    def __init__(
+        self,
+        steps: int = 5,
+        chunk_size: int = 512,
+        threshold: float = 0.2,
+        cp_isolation: list[str] | None = None,
+        cp_exclusion: list[str] | None = None,
+        preemptive_behaviour: bool = True,
+        language_threshold: float = 0.1,
+        enable_fallback: bool = True,
+    ):
+        self._steps: int = steps
+        self._chunk_size: int = chunk_size
+        self._threshold: float = threshold
+        self._cp_isolation: list[str] = [
+            iana_name(cp, False) for cp in cp_isolation or []
+        ]
+        self._cp_exclusion: list[str] = [
+            iana_name(cp, False) for cp in cp_exclusion or []
+        ]
+        self._preemptive_behaviour: bool = preemptive_behaviour
+        self._language_threshold: float = language_threshold
+        self._enable_fallback: bool = enable_fallback
+
+        self._head: bytearray = bytearray()
+        # Bytes given to feed(), including those ignored once done.
+        self._fed: int = 0
+        self._candidates: list[_StreamCandidate] | None = None
+        self._specified_encoding: str | None = None
+        self._sig_encoding: str | None = None
+        self._done: bool = False
+        self._closed: bool = False
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the detection outcome is known already, feeding more is pointless then.
+        """
+        return self._done
+
+    def feed(self, chunk: bytes | bytearray) -> None:
+        """
+        Analyse the next piece of the payload.
+        """
+        if not isinstance(chunk, (bytearray, bytes)):
+            raise TypeError(
+                "Expected object of type bytes or bytearray, got: {}".format(
+                    type(chunk)
+                )
+            )
+
+        if self._closed:
+            raise ValueError("Cannot feed a CharsetDetector that was closed.")
+
+        self._fed += len(chunk)
+
+        if self._done or not chunk:
+            return
+
+        if self._candidates is None:
+            self._head += chunk
+
+            if len(self._head) < self.HEAD_SIZE:
+                return
+
+            self._start()
+            return
+
+        self._feed_candidates(chunk)
+
+    def close(self) -> CharsetMatches:
+        """
+        Conclude the detection and return the matches, ordered from the most probable to the less one.
+        """
+        if self._closed:
+            raise ValueError("CharsetDetector was closed already.")
+
+        if self._candidates is None:
+            if not self._head:
+                self._closed = True
+                logger.debug(
+                    "Encoding detection on empty bytes, assuming utf_8 intention."
+                )
+                return CharsetMatches(
+                    [CharsetMatch(b"", "utf_8", 0.0, False, [], "")]
+                )
+            self._start()
+
+        self._closed = True
+        payload: bytes = bytes(self._head)
+        partial: bool = self._fed > len(payload)
+
+        for candidate in self._alive():
+            # A short payload, or a last partial window, that was never measured.
+            if candidate.window and candidate.samples == 0:
+                self._measure(candidate, "".join(candidate.window))
+            if candidate.alive and candidate.mean_mess_ratio >= self._threshold:
+                self._give_up(candidate)
+            if candidate.alive:
+                self._measure_coherence(candidate, flush=True)
+
+        results: CharsetMatches = CharsetMatches()
+        early_stop_results: CharsetMatches = CharsetMatches()
+        fallbacks: dict[str, CharsetMatch] = {}
+        prioritized: list[str | None] = [self._specified_encoding, "ascii", "utf_8"]
+
+        for candidate in self._candidates:
+            if candidate.hard_failure or candidate.skipped:
+                continue
+
+            decoded_payload: str = getincrementaldecoder(candidate.encoding)(
+                errors="ignore"
+            ).decode(self._payload_for(candidate, payload))
+
+            if candidate.soft_failure:
+                if self._enable_fallback and candidate.encoding in prioritized:
+                    fallbacks[candidate.encoding] = CharsetMatch(
+                        payload,
+                        candidate.encoding,
+                        self._threshold,
+                        False,
+                        [],
+                        decoded_payload,
+                        preemptive_declaration=self._specified_encoding,
+                        partial=partial,
+                    )
+                continue
+
+            current_match = CharsetMatch(
+                payload,
+                candidate.encoding,
+                candidate.mean_mess_ratio,
+                candidate.has_sig,
+                candidate.coherence,
+                decoded_payload,
+                preemptive_declaration=self._specified_encoding,
+                partial=partial,
+            )
+
+            if candidate.has_sig:
+                return CharsetMatches([current_match])
+
+            results.append(current_match)
+
+            if candidate.encoding in prioritized and candidate.mean_mess_ratio < 0.1:
+                if candidate.mean_mess_ratio == 0.0:
+                    return CharsetMatches([current_match])
+                early_stop_results.append(current_match)
+
+        if early_stop_results:
+            return CharsetMatches([early_stop_results.best()])  # type: ignore[list-item]
+
+        if not results and fallbacks:
+            logger.log(
+                TRACE,
+                "Nothing got out of the detection process. Using ASCII/UTF-8/Specified fallback.",
+            )
+            for encoding in (self._specified_encoding, "utf_8", "ascii"):
+                if encoding in fallbacks:
+                    results.append(fallbacks[encoding])
+                    break
+
+        return results
+
+    def _payload_for(self, candidate: _StreamCandidate, payload: bytes) -> bytes:
+        if candidate.has_sig and should_strip_sig_or_bom(candidate.encoding):
+            return payload[len(identify_sig_or_bom(payload)[1]) :]
+        return payload
+
+    def _alive(self) -> list[_StreamCandidate]:
+        return [c for c in self._candidates or [] if c.alive]
+
+    def _start(self) -> None:
+        """
+        Set up the candidate code pages, in the order from_bytes() tries them, then feed them the head.
+        """
+        head: bytes = bytes(self._head)
+        prioritized_encodings: list[str] = []
+
+        if self._preemptive_behaviour:
+            self._specified_encoding = any_specified_encoding(head)
+
+        if self._specified_encoding is not None:
+            prioritized_encodings.append(self._specified_encoding)
+            logger.log(
+                TRACE,
+                "Detected declarative mark in sequence. Priority +1 given for %s.",
+                self._specified_encoding,
+            )
+
+        self._sig_encoding, sig_payload = identify_sig_or_bom(head)
+
+        if self._sig_encoding is not None:
+            prioritized_encodings.append(self._sig_encoding)
+
+        prioritized_encodings.append("ascii")
+
+        if "utf_8" not in prioritized_encodings:
+            prioritized_encodings.append("utf_8")
+
+        self._candidates = []
+        tested: set[str] = set()
+
+        for encoding_iana in prioritized_encodings + IANA_SUPPORTED:
+            if (
+                encoding_iana in tested
+                or (self._cp_isolation and encoding_iana not in self._cp_isolation)
+                or encoding_iana in self._cp_exclusion
+            ):
+                continue
+
+            tested.add(encoding_iana)
+            has_sig: bool = encoding_iana == self._sig_encoding
+
+            if encoding_iana in {"utf_16", "utf_32", "utf_7"} and not has_sig:
+                continue
+
+            try:
+                is_multi_byte_decoder: bool = is_multi_byte_encoding(encoding_iana)
+                candidate = _StreamCandidate(
+                    encoding_iana, is_multi_byte_decoder, has_sig
+                )
+            except (ModuleNotFoundError, ImportError, LookupError):
+                logger.log(
+                    TRACE,
+                    "Encoding %s does not provide an IncrementalDecoder",
+                    encoding_iana,
+                )
+                continue
+
+            self._candidates.append(candidate)
+
+        for candidate in self._candidates:
+            self._feed_candidate(candidate, self._payload_for(candidate, head))
+
+        self._update_done()
+
+    def _feed_candidates(self, chunk: bytes | bytearray) -> None:
+        for candidate in self._alive():
+            if candidate.alive:
+                self._feed_candidate(candidate, chunk)
+
+        self._update_done()
+
+    def _feed_candidate(
+        self, candidate: _StreamCandidate, chunk: bytes | bytearray
+    ) -> None:
+        try:
+            text: str = candidate.decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            logger.log(
+                TRACE,
+                "Code page %s does not fit given bytes sequence at ALL. %s",
+                candidate.encoding,
+                str(e),
+            )
+            candidate.hard_failure = True
+            return
+
+        start: int = candidate.decoded
+        candidate.decoded += len(text)
+        offset: int = 0
+
+        while offset < len(text) and candidate.alive:
+            if not candidate.window:
+                if candidate.next_window_at >= candidate.decoded:
+                    break
+                offset = max(offset, candidate.next_window_at - start)
+                candidate.window_start = start + offset
+
+            piece: str = text[
+                offset : offset + self._chunk_size - candidate.window_length
+            ]
+            offset += len(piece)
+            candidate.window.append(piece)
+            candidate.window_length += len(piece)
+
+            if candidate.window_length >= self._chunk_size:
+                self._measure(candidate, "".join(candidate.window))
+
+    def _measure(self, candidate: _StreamCandidate, window: str) -> None:
+        candidate.window = []
+        candidate.window_length = 0
+
+        ratio: float = mess_ratio(window, self._threshold)
+        candidate.samples += 1
+        candidate.mess_sum += ratio
+        candidate.next_window_at = candidate.window_start + self._chunk_size * 2 ** (
+            candidate.samples // self._steps
+        )
+
+        if ratio >= self._threshold:
+            candidate.early_stop_count += 1
+
+        if candidate.early_stop_count >= max(int(candidate.samples / 4), 2) or (
+            candidate.samples >= self._steps
+            and candidate.mean_mess_ratio >= self._threshold
+        ):
+            self._give_up(candidate)
+            return
+
+        if candidate.encoding != "ascii":
+            candidate.pending_windows.append(window)
+            self._measure_coherence(candidate)
+
+    def _measure_coherence(
+        self, candidate: _StreamCandidate, flush: bool = False
+    ) -> None:
+        if not flush and candidate.samples < self._steps:
+            return
+
+        if not candidate.pending_windows:
+            return
+
+        if not candidate.is_multi_byte_decoder:
+            target_languages: list[str] = encoding_languages(candidate.encoding)
+        else:
+            target_languages = mb_encoding_languages(candidate.encoding)
+
+        for window in candidate.pending_windows:
+            for language, ratio in coherence_ratio(
+                window,
+                self._language_threshold,
+                ",".join(target_languages) if target_languages else None,
+            ):
+                ratios = candidate.languages.setdefault(language, [0.0, 0])
+                ratios[0] += ratio
+                ratios[1] += 1
+
+        candidate.pending_windows = []
+
+    def _give_up(self, candidate: _StreamCandidate) -> None:
+        """
+        Rule out a code page for being too messy, along with the following ones that are too similar to it.
+        """
+        logger.log(
+            TRACE,
+            "%s was excluded because of initial chaos probing. Gave up %i time(s). "
+            "Computed mean chaos is %f %%.",
+            candidate.encoding,
+            candidate.early_stop_count,
+            round(candidate.mean_mess_ratio * 100, ndigits=3),
+        )
+        candidate.soft_failure = True
+        candidate.window = []
+        candidate.pending_windows = []
+
+        assert self._candidates is not None
+        for other in self._candidates[self._candidates.index(candidate) + 1 :]:
+            if other.alive and is_cp_similar(other.encoding, candidate.encoding):
+                logger.log(
+                    TRACE,
+                    "%s is deemed too similar to code page %s and was consider unsuited already. Continuing!",
+                    other.encoding,
+                    candidate.encoding,
+                )
+                other.skipped = True
+                other.window = []
+                other.pending_windows = []
+
+    def _update_done(self) -> None:
+        """
+        Tell whether the outcome is settled: every code page was ruled out, one with a BOM/SIG passed its initial
+        probing, one of the prioritized code pages did with a low enough mess, or the remaining ones were all
+        sampled over four rounds of steps windows, the last round spanning more than half of what they decoded.
+        """
+        alive: list[_StreamCandidate] = self._alive()
+        prioritized: list[str | None] = [self._specified_encoding, "ascii", "utf_8"]
+
+        self._done = (
+            not alive
+            or any(
+                candidate.samples >= self._steps
+                and (
+                    candidate.has_sig
+                    or (
+                        candidate.encoding in prioritized
+                        and candidate.mean_mess_ratio < 0.1
+                    )
+                )
+                for candidate in alive
+            )
+            or all(candidate.samples >= 4 * self._steps for candidate in alive)
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import importlib
+from bisect import bisect_left, insort
 from codecs import IncrementalDecoder
 from collections import Counter
 from functools import lru_cache
@@ -134,6 +135,14 @@ def get_target_features(language: str) -> tuple[bool, bool]:
     return target_have_accents, target_pure_latin
 
 
+@lru_cache(maxsize=LANGUAGE_SUPPORTED_COUNT)
+def _language_ranks(language: str) -> dict[str, int]:
+    """
+    Index the characters of a supported language by their rank in FREQUENCIES, for constant time lookups.
+    """
+    return {character: rank for rank, character in enumerate(FREQUENCIES[language])}
+
+
 def alphabet_languages(
     characters: list[str], ignore_non_latin: bool = False
 ) -> list[str]:
@@ -143,6 +152,7 @@ def alphabet_languages(
     languages: list[tuple[str, float]] = []
 
     source_have_accents = any(is_accentuated(character) for character in characters)
+    characters_set: set[str] = set(characters)
 
     for language, language_characters in FREQUENCIES.items():
         target_have_accents, target_pure_latin = get_target_features(language)
@@ -156,7 +166,7 @@ def alphabet_languages(
         character_count: int = len(language_characters)
 
         character_match_count: int = len(
-            [c for c in language_characters if c in characters]
+            _language_ranks(language).keys() & characters_set
         )
 
         ratio: float = character_match_count / character_count
@@ -180,24 +190,54 @@ def characters_popularity_compare(
     if language not in FREQUENCIES:
         raise ValueError(f"{language} not available")
 
+    character_rank_in_language_of: dict[str, int] = _language_ranks(language)
     character_approved_count: int = 0
-    FREQUENCIES_language_set = set(FREQUENCIES[language])
 
     ordered_characters_count: int = len(ordered_characters)
     target_language_characters_count: int = len(FREQUENCIES[language])
 
     large_alphabet: bool = target_language_characters_count > 26
+    expected_projection_ratio: float = (
+        target_language_characters_count / ordered_characters_count
+    )
 
-    for character, character_rank in zip(
-        ordered_characters, range(0, ordered_characters_count)
-    ):
-        if character not in FREQUENCIES_language_set:
+    # Characters shared by ordered_characters[rank:] and FREQUENCIES[language][rank_in_language:], for each
+    # rank. Counted from the end with the sorted language ranks of the distinct characters met so far.
+    after_match_counts: list[int] = [0] * ordered_characters_count
+    seen_characters: set[str] = set()
+    seen_ranks: list[int] = []
+
+    for character_rank in range(ordered_characters_count - 1, -1, -1):
+        character: str = ordered_characters[character_rank]
+
+        if character not in character_rank_in_language_of:
             continue
 
-        character_rank_in_language: int = FREQUENCIES[language].index(character)
-        expected_projection_ratio: float = (
-            target_language_characters_count / ordered_characters_count
+        character_rank_in_language: int = character_rank_in_language_of[character]
+
+        if character not in seen_characters:
+            seen_characters.add(character)
+            insort(seen_ranks, character_rank_in_language)
+
+        after_match_counts[character_rank] = len(seen_ranks) - bisect_left(
+            seen_ranks, character_rank_in_language
         )
+
+    # Likewise for ordered_characters[:rank] and FREQUENCIES[language][:rank_in_language], from the start.
+    seen_characters.clear()
+    seen_ranks.clear()
+
+    for character_rank, character in enumerate(ordered_characters):
+        if character not in character_rank_in_language_of:
+            continue
+
+        character_rank_in_language = character_rank_in_language_of[character]
+        before_match_count: int = bisect_left(seen_ranks, character_rank_in_language)
+
+        if character not in seen_characters:
+            seen_characters.add(character)
+            insort(seen_ranks, character_rank_in_language)
+
         character_rank_projection: int = int(character_rank * expected_projection_ratio)
 
         if (
@@ -214,34 +254,23 @@ def characters_popularity_compare(
             character_approved_count += 1
             continue
 
-        characters_before_source: list[str] = FREQUENCIES[language][
-            0:character_rank_in_language
-        ]
-        characters_after_source: list[str] = FREQUENCIES[language][
-            character_rank_in_language:
-        ]
-        characters_before: list[str] = ordered_characters[0:character_rank]
-        characters_after: list[str] = ordered_characters[character_rank:]
-
-        before_match_count: int = len(
-            set(characters_before) & set(characters_before_source)
+        characters_before_source_count: int = character_rank_in_language
+        characters_after_source_count: int = (
+            target_language_characters_count - character_rank_in_language
         )
+        after_match_count: int = after_match_counts[character_rank]
 
-        after_match_count: int = len(
-            set(characters_after) & set(characters_after_source)
-        )
-
-        if len(characters_before_source) == 0 and before_match_count <= 4:
+        if characters_before_source_count == 0 and before_match_count <= 4:
             character_approved_count += 1
             continue
 
-        if len(characters_after_source) == 0 and after_match_count <= 4:
+        if characters_after_source_count == 0 and after_match_count <= 4:
             character_approved_count += 1
             continue
 
         if (
-            before_match_count / len(characters_before_source) >= 0.4
-            or after_match_count / len(characters_after_source) >= 0.4
+            before_match_count / characters_before_source_count >= 0.4
+            or after_match_count / characters_after_source_count >= 0.4
         ):
             character_approved_count += 1
             continue
@@ -255,9 +284,20 @@ def alpha_unicode_split(decoded_sequence: str) -> list[str]:
     Ex. a text containing English/Latin with a bit a Hebrew will return two items in the resulting list;
     One containing the latin letters and the other hebrew.
     """
-    layers: dict[str, str] = {}
+    layers: dict[str, list[str]] = {}
+    # A character always lands in the same layer, new layers only ever come after the ones it was compared to.
+    character_layers: dict[str, tuple[list[str], str] | None] = {}
 
     for character in decoded_sequence:
+        if character in character_layers:
+            known_layer = character_layers[character]
+
+            if known_layer is not None:
+                known_layer[0].append(known_layer[1])
+            continue
+
+        character_layers[character] = None
+
         if character.isalpha() is False:
             continue
 
@@ -280,12 +320,12 @@ def alpha_unicode_split(decoded_sequence: str) -> list[str]:
             layer_target_range = character_range
 
         if layer_target_range not in layers:
-            layers[layer_target_range] = character.lower()
-            continue
+            layers[layer_target_range] = []
 
-        layers[layer_target_range] += character.lower()
+        character_layers[character] = (layers[layer_target_range], character.lower())
+        layers[layer_target_range].append(character.lower())
 
-    return list(layers.values())
+    return ["".join(layer) for layer in layers.values()]
 
 
 def merge_coherence_ratios(results: list[CoherenceMatches]) -> CoherenceMatches:
@@ -3,14 +3,16 @@ from __future__ import annotations
 import argparse
 import sys
 import typing
+from functools import partial
 from json import dumps
 from os.path import abspath, basename, dirname, join, realpath
 from platform import python_version
 from unicodedata import unidata_version
 
 import charset_normalizer.md as md_module
-from charset_normalizer import from_fp
-from charset_normalizer.models import CliDetectionResult
+from charset_normalizer import from_fp, from_path
+from charset_normalizer.api import _map_batches
+from charset_normalizer.models import CharsetMatches, CliDetectionResult
 from charset_normalizer.version import __version__
 
 
@@ -106,6 +108,87 @@ class FileType:
         return f"{type(self).__name__}({args_str})"
 
 
+def _detection_results(
+    path: str, matches: CharsetMatches, alternatives: bool = False
+) -> list[CliDetectionResult]:
+    """
+    Describe the best match of a file, followed by the other ones if alternatives are asked for.
+    When nothing matched, a single result with an undefined encoding is given.
+    """
+    best_guess = matches.best()
+
+    if best_guess is None:
+        return [
+            CliDetectionResult(
+                path,
+                None,
+                [],
+                [],
+                "Unknown",
+                [],
+                False,
+                1.0,
+                0.0,
+                None,
+                True,
+            )
+        ]
+
+    results = [
+        CliDetectionResult(
+            path,
+            best_guess.encoding,
+            best_guess.encoding_aliases,
+            [cp for cp in best_guess.could_be_from_charset if cp != best_guess.encoding],
+            best_guess.language,
+            best_guess.alphabets,
+            best_guess.bom,
+            best_guess.percent_chaos,
+            best_guess.percent_coherence,
+            None,
+            True,
+        )
+    ]
+
+    if len(matches) > 1 and alternatives:
+        for el in matches:
+            if el != best_guess:
+                results.append(
+                    CliDetectionResult(
+                        path,
+                        el.encoding,
+                        el.encoding_aliases,
+                        [cp for cp in el.could_be_from_charset if cp != el.encoding],
+                        el.language,
+                        el.alphabets,
+                        el.bom,
+                        el.percent_chaos,
+                        el.percent_coherence,
+                        None,
+                        False,
+                    )
+                )
+
+    return results
+
+
+def _detect_path(
+    path: str,
+    threshold: float,
+    explain: bool,
+    preemptive_behaviour: bool,
+    alternatives: bool,
+) -> list[CliDetectionResult]:
+    # Run in the worker processes of --jobs, the whole result being built there.
+    matches = from_path(
+        path,
+        threshold=threshold,
+        explain=explain,
+        preemptive_behaviour=preemptive_behaviour,
+    )
+    return _detection_results(abspath(path), matches, alternatives)
+
+
 def cli_detect(argv: list[str] | None = None) -> int:
     """
     CLI assistant using ARGV and ArgumentParser
@@ -187,6 +270,16 @@ def cli_detect(argv: list[str] | None = None) -> int:
         dest="threshold",
         help="Define a custom maximum amount of noise allowed in decoded content. 0. <= noise <= 1.",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        default=None,
+        type=int,
+        dest="jobs",
+        help="Analyse files in batches across that many processes. "
+        "Output one JSON line per result, as soon as it is available.",
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -222,6 +315,9 @@ def cli_detect(argv: list[str] | None = None) -> int:
         print("--threshold VALUE should be between 0. AND 1.", file=sys.stderr)
         return 1
 
+    if args.jobs is not None:
+        return _cli_detect_jobs(args)
+
     x_ = []
 
     for my_file in args.files:
@@ -234,6 +330,10 @@ def cli_detect(argv: list[str] | None = None) -> int:
 
         best_guess = matches.best()
 
+        x_.extend(
+            _detection_results(abspath(my_file.name), matches, args.alternatives)
+        )
+
         if best_guess is None:
             print(
                 'Unable to identify originating encoding for "{}". {}'.format(
@@ -246,110 +346,51 @@ def cli_detect(argv: list[str] | None = None) -> int:
                 ),
                 file=sys.stderr,
             )
-            x_.append(
-                CliDetectionResult(
-                    abspath(my_file.name),
-                    None,
-                    [],
-                    [],
-                    "Unknown",
-                    [],
-                    False,
-                    1.0,
-                    0.0,
-                    None,
-                    True,
+        elif args.normalize is True:
+            if best_guess.encoding.startswith("utf") is True:
+                print(
+                    '"{}" file does not need to be normalized, as it already came from unicode.'.format(
+                        my_file.name
+                    ),
+                    file=sys.stderr,
                 )
-            )
-        else:
-            x_.append(
-                CliDetectionResult(
-                    abspath(my_file.name),
-                    best_guess.encoding,
-                    best_guess.encoding_aliases,
-                    [
-                        cp
-                        for cp in best_guess.could_be_from_charset
-                        if cp != best_guess.encoding
-                    ],
-                    best_guess.language,
-                    best_guess.alphabets,
-                    best_guess.bom,
-                    best_guess.percent_chaos,
-                    best_guess.percent_coherence,
-                    None,
-                    True,
+                if my_file.closed is False:
+                    my_file.close()
+                continue
+
+            dir_path = dirname(realpath(my_file.name))
+            file_name = basename(realpath(my_file.name))
+
+            o_: list[str] = file_name.split(".")
+
+            if args.replace is False:
+                o_.insert(-1, best_guess.encoding)
+                if my_file.closed is False:
+                    my_file.close()
+            elif (
+                args.force is False
+                and query_yes_no(
+                    'Are you sure to normalize "{}" by replacing it ?'.format(
+                        my_file.name
+                    ),
+                    "no",
                 )
-            )
-
-            if len(matches) > 1 and args.alternatives:
-                for el in matches:
-                    if el != best_guess:
-                        x_.append(
-                            CliDetectionResult(
-                                abspath(my_file.name),
-                                el.encoding,
-                                el.encoding_aliases,
-                                [
-                                    cp
-                                    for cp in el.could_be_from_charset
-                                    if cp != el.encoding
-                                ],
-                                el.language,
-                                el.alphabets,
-                                el.bom,
-                                el.percent_chaos,
-                                el.percent_coherence,
-                                None,
-                                False,
-                            )
-                        )
-
-            if args.normalize is True:
-                if best_guess.encoding.startswith("utf") is True:
-                    print(
-                        '"{}" file does not need to be normalized, as it already came from unicode.'.format(
-                            my_file.name
-                        ),
-                        file=sys.stderr,
-                    )
-                    if my_file.closed is False:
-                        my_file.close()
-                    continue
-
-                dir_path = dirname(realpath(my_file.name))
-                file_name = basename(realpath(my_file.name))
-
-                o_: list[str] = file_name.split(".")
-
-                if args.replace is False:
-                    o_.insert(-1, best_guess.encoding)
-                    if my_file.closed is False:
-                        my_file.close()
-                elif (
-                    args.force is False
-                    and query_yes_no(
-                        'Are you sure to normalize "{}" by replacing it ?'.format(
-                            my_file.name
-                        ),
-                        "no",
-                    )
-                    is False
-                ):
-                    if my_file.closed is False:
-                        my_file.close()
-                    continue
-
-                try:
-                    x_[0].unicode_path = join(dir_path, ".".join(o_))
-
-                    with open(x_[0].unicode_path, "wb") as fp:
-                        fp.write(best_guess.output())
-                except OSError as e:
-                    print(str(e), file=sys.stderr)
-                    if my_file.closed is False:
-                        my_file.close()
-                    return 2
+                is False
+            ):
+                if my_file.closed is False:
+                    my_file.close()
+                continue
+
+            try:
+                x_[0].unicode_path = join(dir_path, ".".join(o_))
+
+                with open(x_[0].unicode_path, "wb") as fp:
+                    fp.write(best_guess.output())
+            except OSError as e:
+                print(str(e), file=sys.stderr)
+                if my_file.closed is False:
+                    my_file.close()
+                return 2
 
         if my_file.closed is False:
             my_file.close()
@@ -377,5 +418,64 @@ def cli_detect(argv: list[str] | None = None) -> int:
     return 0
 
 
+def _cli_detect_jobs(args: argparse.Namespace) -> int:
+    """
+    The --jobs flavour of cli_detect, streaming results as JSON lines (or encodings, given --minimal).
+    """
+    paths: list[str] = [my_file.name for my_file in args.files]
+    stdin_given: bool = any(my_file is sys.stdin.buffer for my_file in args.files)
+
+    for my_file in args.files:
+        my_file.close()
+
+    if args.jobs < 1:
+        print("--jobs VALUE should be at least 1.", file=sys.stderr)
+        return 1
+
+    if args.normalize is True:
+        print("Use --normalize without --jobs only.", file=sys.stderr)
+        return 1
+
+    if stdin_given:
+        print("Use --jobs with file paths only.", file=sys.stderr)
+        return 1
+
+    detect = partial(
+        _detect_path,
+        threshold=args.threshold,
+        explain=args.verbose,
+        preemptive_behaviour=args.no_preemptive is False,
+        alternatives=args.alternatives,
+    )
+
+    for path, results in (
+        _map_batches(detect, paths, args.jobs)
+        if args.jobs > 1
+        else ((path, detect(path)) for path in paths)
+    ):
+        if results[0].encoding is None:
+            print(
+                'Unable to identify originating encoding for "{}". {}'.format(
+                    path,
+                    (
+                        "Maybe try increasing maximum amount of chaos."
+                        if args.threshold < 1.0
+                        else ""
+                    ),
+                ),
+                file=sys.stderr,
+            )
+
+        if args.minimal is False:
+            for el in results:
+                print(el.to_json(indent=None), flush=True)
+        else:
+            print(
+                ", ".join([el.encoding or "undefined" for el in results]), flush=True
+            )
+
+    return 0
+
+
 if __name__ == "__main__":
     cli_detect()
@@ -23,7 +23,16 @@ ENCODING_MARKS: dict[str, bytes | list[bytes]] = {
 TOO_SMALL_SEQUENCE: int = 32
 TOO_BIG_SEQUENCE: int = int(10e6)
 
+# Past that many chunks of that size, fingerprints are computed over samples of the payload.
+FINGERPRINT_SAMPLE_COUNT: int = 16
+FINGERPRINT_SAMPLE_SIZE: int = 4096
+
+# Files handed at once to a worker process by from_paths().
+FILES_PER_BATCH: int = 16
+
 UTF8_MAXIMAL_ALLOCATION: int = 1_112_064
+# Bytes decoded at once when checking a large payload decodes strictly.
+STRICT_DECODE_SLICE: int = 1_048_576
 
 # Up-to-date Unicode ucd/15.0.0
 UNICODE_RANGES_COMBINED: dict[str, range] = {
@@ -381,6 +390,10 @@ RE_POSSIBLE_ENCODING_INDICATION = re_compile(
     IGNORECASE,
 )
 
+# Control characters other than whitespace: C0 and DEL as bytes, C1 as encoded in UTF-8.
+CONTROL_BYTES: bytes = bytes([*range(0x09), *range(0x0E, 0x20), 0x7F])
+RE_UTF8_C1_CONTROL = re_compile(rb"\xc2[\x80-\x9f]")
+
 IANA_NO_ALIASES = [
     "cp720",
     "cp737",
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from array import array
 from functools import lru_cache
 from logging import getLogger
 
 from .constant import (
     COMMON_SAFE_ASCII_CHARACTERS,
     TRACE,
+    UNICODE_RANGES_COMBINED,
     UNICODE_SECONDARY_RANGE_KEYWORD,
 )
 from .utils import (
@@ -579,6 +581,432 @@ def is_suspiciously_successive_range(
     return True
 
 
+# Character classes used by the built-in detectors, computed once per code point
+# so that mess_ratio() needs a single table lookup per character rather than a
+# round of eligible()/feed() calls on every plugin.
+_PRINTABLE = 1 << 0
+_ALPHA = 1 << 1
+_ACCENTUATED = 1 << 2
+_PUNCTUATION = 1 << 3
+_SPACE = 1 << 4
+_DIGIT = 1 << 5
+_UPPER = 1 << 6
+_LOWER = 1 << 7
+_ASCII = 1 << 8
+_CJK = 1 << 9
+_CJK_UNCOMMON = 1 << 10
+_ARABIC = 1 << 11
+_ARABIC_ISOLATED = 1 << 12
+_UNPRINTABLE = 1 << 13
+# CJK, Hangul, Katakana, Hiragana or Thai.
+_GLYPH = 1 << 14
+# Alphabetic and either non-Latin or accentuated, and not a glyph.
+_FOREIGN = 1 << 15
+_LATIN_LETTER = 1 << 16
+_CASED_LETTER = 1 << 17
+# Punctuation / symbols weighted by TooManySymbolOrPunctuationPlugin.
+_COUNTED_PUNCTUATION = 1 << 18
+_COUNTED_SYMBOL = 1 << 19
+# Characters resetting SuspiciousRange.
+_RANGE_BREAK = 1 << 20
+# Characters ending a word, or marking it bad, in SuperWeirdWordPlugin.
+_WORD_END = 1 << 21
+_WORD_SYMBOL = 1 << 22
+# The bits above this hold the index of the character's range in _RANGE_NAMES.
+_RANGE_SHIFT = 32
+
+# Range names by index, 0 standing for characters outside of any known range.
+_RANGE_NAMES: list[str | None] = [None, *UNICODE_RANGES_COMBINED]
+_RANGE_INDEXES: dict[str | None, int] = {
+    name: index for index, name in enumerate(_RANGE_NAMES)
+}
+
+_BLOCK_SHIFT = 8
+_BLOCK_SIZE = 1 << _BLOCK_SHIFT
+
+# Code point classes, by block of 256 code points, built on first use.
+_CHARACTER_CLASSES: list[array | None] = [None] * (0x110000 >> _BLOCK_SHIFT)
+# Whether two ranges seen next to each other are suspicious, by range index pair.
+_SUSPICIOUS_RANGE_PAIRS: dict[int, bool] = {}
+
+
+def _character_class(character: str) -> int:
+    """
+    Compute the class bits of a single character, as the built-in plugins see it.
+    Use the unwrapped helpers so that filling a block does not flood their caches.
+    """
+    flags: int = (
+        _RANGE_INDEXES[unicode_range.__wrapped__(character)] << _RANGE_SHIFT
+    )
+
+    alpha = character.isalpha()
+    accentuated = is_accentuated.__wrapped__(character)
+    punctuation = is_punctuation.__wrapped__(character)
+    digit = character.isdigit()
+    space = character.isspace()
+    safe = character in COMMON_SAFE_ASCII_CHARACTERS
+    cjk = is_cjk.__wrapped__(character)
+    glyph = (
+        cjk
+        or is_hangul.__wrapped__(character)
+        or is_katakana.__wrapped__(character)
+        or is_hiragana.__wrapped__(character)
+        or is_thai.__wrapped__(character)
+    )
+    latin = is_latin.__wrapped__(character)
+    symbol = is_symbol.__wrapped__(character)
+
+    if character.isprintable():
+        flags |= _PRINTABLE
+    if alpha:
+        flags |= _ALPHA
+        if latin:
+            flags |= _LATIN_LETTER
+        if is_case_variable.__wrapped__(character):
+            flags |= _CASED_LETTER
+        if (not latin or accentuated) and not glyph:
+            flags |= _FOREIGN
+    if accentuated:
+        flags |= _ACCENTUATED
+    if punctuation:
+        flags |= _PUNCTUATION
+    if space:
+        flags |= _SPACE
+    if digit:
+        flags |= _DIGIT
+    if character.isupper():
+        flags |= _UPPER
+    if character.islower():
+        flags |= _LOWER
+    if character.isascii():
+        flags |= _ASCII
+    if cjk:
+        flags |= _CJK
+        if is_cjk_uncommon.__wrapped__(character):
+            flags |= _CJK_UNCOMMON
+    if glyph:
+        flags |= _GLYPH
+    if is_arabic.__wrapped__(character):
+        flags |= _ARABIC
+        if is_arabic_isolated_form.__wrapped__(character):
+            flags |= _ARABIC_ISOLATED
+    if is_unprintable.__wrapped__(character):
+        flags |= _UNPRINTABLE
+    if not safe:
+        if punctuation:
+            flags |= _COUNTED_PUNCTUATION
+        elif not digit and symbol and not is_emoticon.__wrapped__(character):
+            flags |= _COUNTED_SYMBOL
+    if space or punctuation or safe:
+        flags |= _RANGE_BREAK
+    if space or punctuation or is_separator.__wrapped__(character):
+        flags |= _WORD_END
+    if character not in {"<", ">", "-", "=", "~", "|", "_"} and not digit and symbol:
+        flags |= _WORD_SYMBOL
+
+    return flags
+
+
+def _character_classes(block: int) -> array:
+    """
+    Return the classes of the code points in the given block, building them if needed.
+    """
+    classes = _CHARACTER_CLASSES[block]
+
+    if classes is None:
+        first: int = block << _BLOCK_SHIFT
+        classes = array(
+            "Q", [_character_class(chr(first + i)) for i in range(_BLOCK_SIZE)]
+        )
+        _CHARACTER_CLASSES[block] = classes
+
+    return classes
+
+
+def _is_suspicious_range_pair(range_a: int, range_b: int) -> bool:
+    key: int = range_a << 16 | range_b
+    suspicious = _SUSPICIOUS_RANGE_PAIRS.get(key)
+
+    if suspicious is None:
+        suspicious = _SUSPICIOUS_RANGE_PAIRS[key] = is_suspiciously_successive_range(
+            _RANGE_NAMES[range_a], _RANGE_NAMES[range_b]
+        )
+
+    return suspicious
+
+
+# The detectors computed by _scan(), in the order of their ratios.
+_BUILTIN_DETECTORS: tuple[type[MessDetectorPlugin], ...] = (
+    TooManySymbolOrPunctuationPlugin,
+    TooManyAccentuatedPlugin,
+    UnprintablePlugin,
+    SuspiciousDuplicateAccentPlugin,
+    SuspiciousRange,
+    SuperWeirdWordPlugin,
+    CjkUncommonPlugin,
+    ArchaicUpperLowerPlugin,
+    ArabicIsolatedFormPlugin,
+)
+
+
+def _scan(
+    decoded_sequence: str,
+    maximum_threshold: float,
+    intermediary_mean_mess_ratio_calc: int,
+    detectors: list[MessDetectorPlugin],
+) -> list[float]:
+    """
+    Run the built-in detectors over the sequence in a single pass, then any other
+    MessDetectorPlugin given. Every intermediary_mean_mess_ratio_calc characters
+    the sum of the ratios is checked against the maximum threshold, exactly as
+    feeding each plugin in turn would. Return the ratios, built-in ones first.
+    """
+    character_classes = _CHARACTER_CLASSES
+    load_classes = _character_classes
+    suspicious_range_pairs = _SUSPICIOUS_RANGE_PAIRS
+
+    # TooManySymbolOrPunctuationPlugin
+    tms_count = tms_weight = 0
+    tms_last: str | None = None
+    # TooManyAccentuatedPlugin
+    acc_count = acc_accentuated = 0
+    # UnprintablePlugin
+    unp_count = unp_unprintable = 0
+    # SuspiciousDuplicateAccentPlugin
+    dup_count = dup_successive = 0
+    dup_last: str | None = None
+    dup_last_flags = 0
+    # SuspiciousRange, a last range of -1 standing for no printable seen.
+    sr_count = sr_successive = 0
+    sr_last = -1
+    # SuperWeirdWordPlugin, keeping counts of the buffer rather than the buffer.
+    sww_words = sww_bad_words = sww_foreign_long = 0
+    sww_characters = sww_bad_characters = 0
+    sww_bad = sww_watch = False
+    buffer_length = buffer_accents = buffer_glyphs = buffer_uppers = 0
+    buffer_last_flags = 0
+    # CjkUncommonPlugin
+    cjk_count = cjk_uncommon = 0
+    # ArchaicUpperLowerPlugin
+    aul_buf = False
+    aul_since_sep = aul_successive = aul_successive_final = aul_count = 0
+    aul_last: int | None = None
+    aul_ascii_only = True
+    # ArabicIsolatedFormPlugin
+    ar_count = ar_isolated = 0
+
+    sequence: str = decoded_sequence + "\n"
+    length: int = len(sequence)
+    ratios: list[float] = []
+    start: int = 0
+
+    step: int = intermediary_mean_mess_ratio_calc
+    # Chunks end right after each index the ratios are checked at.
+    for end in [*range(step + 1, length, step), length]:
+        chunk: str = sequence[start:end]
+        start = end
+
+        for character in chunk:
+            code_point = ord(character)
+            classes = character_classes[code_point >> _BLOCK_SHIFT]
+            if classes is None:
+                classes = load_classes(code_point >> _BLOCK_SHIFT)
+            flags = classes[code_point & 0xFF]
+
+            unp_count += 1
+            if flags & _UNPRINTABLE:
+                unp_unprintable += 1
+
+            if flags & _PRINTABLE:
+                tms_count += 1
+                if character != tms_last:
+                    if flags & _COUNTED_PUNCTUATION:
+                        tms_weight += 1
+                    elif flags & _COUNTED_SYMBOL:
+                        tms_weight += 2
+                tms_last = character
+
+                sr_count += 1
+                if flags & _RANGE_BREAK:
+                    sr_last = -1
+                else:
+                    range_index = flags >> _RANGE_SHIFT
+                    # Characters of a same known range are never suspicious.
+                    if sr_last != -1 and (sr_last != range_index or not range_index):
+                        suspicious = suspicious_range_pairs.get(
+                            sr_last << 16 | range_index
+                        )
+                        if suspicious is None:
+                            suspicious = _is_suspicious_range_pair(
+                                sr_last, range_index
+                            )
+                        if suspicious:
+                            sr_successive += 1
+                    sr_last = range_index
+
+            if flags & _CJK:
+                cjk_count += 1
+                if flags & _CJK_UNCOMMON:
+                    cjk_uncommon += 1
+
+            if flags & _ARABIC:
+                ar_count += 1
+                if flags & _ARABIC_ISOLATED:
+                    ar_isolated += 1
+
+            if flags & _ALPHA:
+                acc_count += 1
+                if flags & _ACCENTUATED:
+                    acc_accentuated += 1
+
+                if flags & _LATIN_LETTER:
+                    dup_count += 1
+                    if (
+                        dup_last is not None
+                        and flags & _ACCENTUATED
+                        and dup_last_flags & _ACCENTUATED
+                    ):
+                        if flags & _UPPER and dup_last_flags & _UPPER:
+                            dup_successive += 1
+                        # Worse if its the same char duplicated with different accent.
+                        if remove_accent(character) == remove_accent(dup_last):
+                            dup_successive += 1
+                    dup_last = character
+                    dup_last_flags = flags
+
+                buffer_length += 1
+                buffer_last_flags = flags
+                if flags & _UPPER:
+                    buffer_uppers += 1
+                if flags & _ACCENTUATED:
+                    buffer_accents += 1
+                if flags & _FOREIGN:
+                    sww_watch = True
+                if flags & _GLYPH:
+                    buffer_glyphs += 1
+            # Anything else ends the word in SuperWeirdWordPlugin, or spoils it.
+            elif buffer_length and flags & _WORD_END:
+                sww_words += 1
+                sww_characters += buffer_length
+
+                if buffer_length >= 4:
+                    if buffer_accents / buffer_length >= 0.5:
+                        sww_bad = True
+                    # Word/Buffer ending with an upper case accentuated letter are so rare,
+                    # that we will consider them all as suspicious. Same weight as foreign_long suspicious.
+                    elif (
+                        buffer_last_flags & _ACCENTUATED
+                        and buffer_last_flags & _UPPER
+                        and buffer_uppers != buffer_length
+                    ):
+                        sww_foreign_long += 1
+                        sww_bad = True
+                    elif buffer_glyphs == 1:
+                        sww_bad = True
+                        sww_foreign_long += 1
+                if buffer_length >= 24 and sww_watch:
+                    probable_camel_cased: bool = (
+                        buffer_uppers > 0 and buffer_uppers / buffer_length <= 0.3
+                    )
+
+                    if not probable_camel_cased:
+                        sww_foreign_long += 1
+                        sww_bad = True
+
+                if sww_bad:
+                    sww_bad_words += 1
+                    sww_bad_characters += buffer_length
+                    sww_bad = False
+
+                sww_watch = False
+                buffer_length = buffer_accents = buffer_glyphs = buffer_uppers = 0
+            elif buffer_length and flags & _WORD_SYMBOL:
+                sww_bad = True
+                buffer_length += 1
+                buffer_last_flags = flags
+                if flags & _UPPER:
+                    buffer_uppers += 1
+
+            if not flags & _CASED_LETTER and aul_since_sep > 0:
+                if (
+                    aul_since_sep <= 64
+                    and not flags & _DIGIT
+                    and aul_ascii_only is False
+                ):
+                    aul_successive_final += aul_successive
+
+                aul_successive = 0
+                aul_since_sep = 0
+                aul_last = None
+                aul_buf = False
+                aul_count += 1
+                aul_ascii_only = True
+            else:
+                if aul_ascii_only and not flags & _ASCII:
+                    aul_ascii_only = False
+
+                if aul_last is not None:
+                    if (flags & _UPPER and aul_last & _LOWER) or (
+                        flags & _LOWER and aul_last & _UPPER
+                    ):
+                        if aul_buf:
+                            aul_successive += 2
+                            aul_buf = False
+                        else:
+                            aul_buf = True
+                    else:
+                        aul_buf = False
+
+                aul_count += 1
+                aul_since_sep += 1
+                aul_last = flags
+
+        for detector in detectors:
+            for character in chunk:
+                if detector.eligible(character):
+                    detector.feed(character)
+
+        ratios = []
+
+        if tms_count:
+            ratio: float = tms_weight / tms_count
+            ratios.append(ratio if ratio >= 0.3 else 0.0)
+        else:
+            ratios.append(0.0)
+
+        if acc_count >= 8:
+            ratio = acc_accentuated / acc_count
+            ratios.append(ratio if ratio >= 0.35 else 0.0)
+        else:
+            ratios.append(0.0)
+
+        ratios.append((unp_unprintable * 8) / unp_count)
+        ratios.append((dup_successive * 2) / dup_count if dup_count else 0.0)
+        ratios.append((sr_successive * 2) / sr_count if sr_count > 13 else 0.0)
+
+        if sww_words <= 10 and sww_foreign_long == 0:
+            ratios.append(0.0)
+        else:
+            ratios.append(sww_bad_characters / sww_characters)
+
+        if cjk_count >= 8:
+            ratio = cjk_uncommon / cjk_count
+            # we can be pretty sure it's garbage when uncommon characters are widely
+            # used. otherwise it could just be traditional chinese for example.
+            ratios.append(ratio / 10 if ratio > 0.5 else 0.0)
+        else:
+            ratios.append(0.0)
+
+        ratios.append(aul_successive_final / aul_count)
+        ratios.append(ar_isolated / ar_count if ar_count >= 8 else 0.0)
+        ratios.extend(detector.ratio for detector in detectors)
+
+        if sum(ratios) >= maximum_threshold:
+            break
+
+    return ratios
+
+
 @lru_cache(maxsize=2048)
 def mess_ratio(
     decoded_sequence: str, maximum_threshold: float = 0.2, debug: bool = False
@@ -587,14 +1015,15 @@ def mess_ratio(
     Compute a mess ratio given a decoded bytes sequence. The maximum threshold does stop the computation earlier.
     """
 
+    # Plugins other than the built-in ones are still fed character by character.
     detectors: list[MessDetectorPlugin] = [
-        md_class() for md_class in MessDetectorPlugin.__subclasses__()
+        md_class()
+        for md_class in MessDetectorPlugin.__subclasses__()
+        if md_class not in _BUILTIN_DETECTORS
     ]
 
     length: int = len(decoded_sequence) + 1
 
-    mean_mess_ratio: float = 0.0
-
     if length < 512:
         intermediary_mean_mess_ratio_calc: int = 32
     elif length <= 1024:
@@ -602,18 +1031,13 @@ def mess_ratio(
     else:
         intermediary_mean_mess_ratio_calc = 128
 
-    for character, index in zip(decoded_sequence + "\n", range(length)):
-        for detector in detectors:
-            if detector.eligible(character):
-                detector.feed(character)
-
-        if (
-            index > 0 and index % intermediary_mean_mess_ratio_calc == 0
-        ) or index == length - 1:
-            mean_mess_ratio = sum(dt.ratio for dt in detectors)
-
-            if mean_mess_ratio >= maximum_threshold:
-                break
+    ratios: list[float] = _scan(
+        decoded_sequence,
+        maximum_threshold,
+        intermediary_mean_mess_ratio_calc,
+        detectors,
+    )
+    mean_mess_ratio: float = sum(ratios)
 
     if debug:
         logger = getLogger("charset_normalizer")
@@ -629,7 +1053,9 @@ def mess_ratio(
             logger.log(TRACE, f"Starting with: {decoded_sequence[:16]}")
             logger.log(TRACE, f"Ending with: {decoded_sequence[-16::]}")
 
-        for dt in detectors:
-            logger.log(TRACE, f"{dt.__class__}: {dt.ratio}")
+        for md_class, ratio in zip(
+            [*_BUILTIN_DETECTORS, *(dt.__class__ for dt in detectors)], ratios
+        ):
+            logger.log(TRACE, f"{md_class}: {ratio}")
 
     return round(mean_mess_ratio, 3)
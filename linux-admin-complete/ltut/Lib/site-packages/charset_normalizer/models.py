@@ -3,29 +3,63 @@ from __future__ import annotations
 from encodings.aliases import aliases
 from hashlib import sha256
 from json import dumps
+from mmap import mmap
 from re import sub
 from typing import Any, Iterator, List, Tuple
 
-from .constant import RE_POSSIBLE_ENCODING_INDICATION, TOO_BIG_SEQUENCE
-from .utils import iana_name, is_multi_byte_encoding, unicode_range
+from .constant import (
+    FINGERPRINT_SAMPLE_COUNT,
+    FINGERPRINT_SAMPLE_SIZE,
+    RE_POSSIBLE_ENCODING_INDICATION,
+    TOO_BIG_SEQUENCE,
+)
+from .utils import (
+    cut_sequence_chunks,
+    iana_name,
+    identify_sig_or_bom,
+    is_multi_byte_encoding,
+    should_strip_sig_or_bom,
+    unicode_range,
+)
 
 
 class CharsetMatch:
+    __slots__ = (
+        "_payload",
+        "_encoding",
+        "_mean_mess_ratio",
+        "_languages",
+        "_has_sig_or_bom",
+        "_unicode_ranges",
+        "_leaves",
+        "_mean_coherence_ratio",
+        "_output_payload",
+        "_output_encoding",
+        "_string",
+        "_decoded_length",
+        "_fingerprint",
+        "_preemptive_declaration",
+        "_partial",
+    )
+
     def __init__(
         self,
-        payload: bytes,
+        payload: bytes | bytearray | mmap,
         guessed_encoding: str,
         mean_mess_ratio: float,
         has_sig_or_bom: bool,
-        languages: CoherenceMatches,
+        languages: CoherenceMatches | None,
         decoded_payload: str | None = None,
         preemptive_declaration: str | None = None,
+        partial: bool = False,
     ):
-        self._payload: bytes = payload
+        # Shared with every other match of the same payload, never copied but by raw out of a mapping.
+        self._payload: bytes | bytearray | mmap = payload
 
         self._encoding: str = guessed_encoding
         self._mean_mess_ratio: float = mean_mess_ratio
-        self._languages: CoherenceMatches = languages
+        # None until measured, see _coherence_matches.
+        self._languages: CoherenceMatches | None = languages
         self._has_sig_or_bom: bool = has_sig_or_bom
         self._unicode_ranges: list[str] | None = None
 
@@ -35,9 +69,18 @@ class CharsetMatch:
         self._output_payload: bytes | None = None
         self._output_encoding: str | None = None
 
+        # Decoded on demand only, see __str__.
         self._string: str | None = decoded_payload
+        self._decoded_length: int | None = None
+        self._fingerprint: str | None = None
 
         self._preemptive_declaration: str | None = preemptive_declaration
+        self._partial: bool = partial
+
+    def __getstate__(self) -> tuple[None, dict[str, Any]]:
+        # A mapping cannot be pickled, as when returned from a worker process by from_paths(). Its bytes are instead.
+        self.raw
+        return None, {name: getattr(self, name) for name in self.__slots__}
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, CharsetMatch):
@@ -70,12 +113,30 @@ class CharsetMatch:
 
     @property
     def multi_byte_usage(self) -> float:
-        return 1.0 - (len(str(self)) / len(self.raw))
+        if self._decoded_length is None:
+            # Not keeping the decoded str around for its length only.
+            self._decoded_length = len(
+                self._string if self._string is not None else self._decode()
+            )
+        return 1.0 - (self._decoded_length / len(self._payload))
+
+    def _decode(self) -> str:
+        """
+        Decode the payload, less the SIG/BOM wherever the detection strips it.
+        """
+        if not self._has_sig_or_bom or not should_strip_sig_or_bom(self._encoding):
+            return str(self._payload, self._encoding, "strict")
+
+        sig_length: int = len(identify_sig_or_bom(self._payload)[1])
+
+        # Released right away, a bytearray cannot be resized while a view exists.
+        with memoryview(self._payload) as view:
+            return str(view[sig_length:], self._encoding, "strict")
 
     def __str__(self) -> str:
         # Lazy Str Loading
         if self._string is None:
-            self._string = str(self._payload, self._encoding, "strict")
+            self._string = self._decode()
         return self._string
 
     def __repr__(self) -> str:
@@ -123,7 +184,7 @@ class CharsetMatch:
         Return the complete list of possible languages found in decoded sequence.
         Usually not really useful. Returned list may be empty even if 'language' property return something != 'Unknown'.
         """
-        return [e[0] for e in self._languages]
+        return [e[0] for e in self._coherence_matches]
 
     @property
     def language(self) -> str:
@@ -131,7 +192,7 @@ class CharsetMatch:
         Most probable language found in decoded sequence. If none were detected or inferred, the property will return
         "Unknown".
         """
-        if not self._languages:
+        if not self._coherence_matches:
             # Trying to infer the language based on the given encoding
             # Its either English or we should not pronounce ourselves in certain cases.
             if "ascii" in self.could_be_from_charset:
@@ -151,7 +212,7 @@ class CharsetMatch:
 
             return languages[0]
 
-        return self._languages[0][0]
+        return self._coherence_matches[0][0]
 
     @property
     def chaos(self) -> float:
@@ -159,9 +220,67 @@ class CharsetMatch:
 
     @property
     def coherence(self) -> float:
-        if not self._languages:
+        if not self._coherence_matches:
             return 0.0
-        return self._languages[0][1]
+        return self._coherence_matches[0][1]
+
+    @property
+    def _coherence_matches(self) -> CoherenceMatches:
+        """
+        Languages detected in the decoded sequence. A match given without (see api._fast_match) measures them on
+        first use, over the same chunks from_bytes() would with its default steps and chunk_size.
+        """
+        if self._languages is None:
+            # doing it there to avoid circular import
+            from charset_normalizer.cd import (
+                coherence_ratio,
+                encoding_languages,
+                mb_encoding_languages,
+                merge_coherence_ratios,
+            )
+
+            target_languages: list[str] = (
+                mb_encoding_languages(self.encoding)
+                if is_multi_byte_encoding(self.encoding)
+                else encoding_languages(self.encoding)
+            )
+
+            length: int = len(self._payload)
+            steps: int = 5
+            chunk_size: int = 512
+
+            if length <= chunk_size * steps:
+                steps = 1
+                chunk_size = length
+
+            sig_payload: bytes = (
+                identify_sig_or_bom(self._payload)[1] if self._has_sig_or_bom else b""
+            )
+            chunks = cut_sequence_chunks(
+                self._payload,
+                self._encoding,
+                range(len(sig_payload), length, max(length // steps, 1)),
+                chunk_size,
+                self._has_sig_or_bom,
+                should_strip_sig_or_bom(self._encoding),
+                sig_payload,
+                is_multi_byte_encoding(self._encoding),
+                # Not decoding a large payload as a whole for a few chunks.
+                self._string if length >= TOO_BIG_SEQUENCE else str(self),
+            )
+
+            self._languages = merge_coherence_ratios(
+                [
+                    coherence_ratio(
+                        chunk,
+                        0.1,
+                        ",".join(target_languages) if target_languages else None,
+                    )
+                    for chunk in chunks
+                ]
+            )
+
+        return self._languages
 
     @property
     def percent_chaos(self) -> float:
@@ -174,10 +293,21 @@ class CharsetMatch:
     @property
     def raw(self) -> bytes:
         """
-        Original untouched bytes.
+        Original untouched bytes. Those of a mapped file are copied out of the mapping once, and the match releases
+        it.
         """
+        if isinstance(self._payload, mmap):
+            self._payload = self._payload[:]
         return self._payload
 
+    @property
+    def partial(self) -> bool:
+        """
+        Whether the match covers the beginning of the payload only, as does one from a CharsetDetector fed more than
+        it keeps. Then str(), output(), raw and fingerprint all describe that beginning, not the whole payload.
+        """
+        return self._partial
+
     @property
     def submatch(self) -> list[CharsetMatch]:
         return self._leaves
@@ -238,8 +368,34 @@ class CharsetMatch:
     def fingerprint(self) -> str:
         """
         Retrieve the unique SHA256 computed using the transformed (re-encoded) payload. Not the original one.
+        For a large payload, it is computed over evenly spaced chunks instead, each decoded on its own, so that
+        neither the decoded nor the re-encoded payload has to be held.
         """
-        return sha256(self.output()).hexdigest()
+        if self._fingerprint is not None:
+            return self._fingerprint
+
+        length: int = len(self._payload)
+
+        if length <= FINGERPRINT_SAMPLE_COUNT * FINGERPRINT_SAMPLE_SIZE:
+            self._fingerprint = sha256(self.output()).hexdigest()
+            return self._fingerprint
+
+        digest = sha256()
+        step: int = (length - FINGERPRINT_SAMPLE_SIZE) // (FINGERPRINT_SAMPLE_COUNT - 1)
+
+        # Released right away, a bytearray cannot be resized while a view exists.
+        with memoryview(self._payload) as view:
+            for offset in range(0, step * FINGERPRINT_SAMPLE_COUNT, step):
+                digest.update(
+                    str(
+                        view[offset : offset + FINGERPRINT_SAMPLE_SIZE],
+                        self._encoding,
+                        "ignore",
+                    ).encode("utf_8", "replace")
+                )
+
+        self._fingerprint = digest.hexdigest()
+        return self._fingerprint
 
 
 class CharsetMatches:
@@ -286,7 +442,7 @@ class CharsetMatches:
                 )
             )
         # We should disable the submatch factoring when the input file is too heavy (conserve RAM usage)
-        if len(item.raw) < TOO_BIG_SEQUENCE:
+        if len(item._payload) < TOO_BIG_SEQUENCE:
             for match in self._results:
                 if match.fingerprint == item.fingerprint and match.chaos == item.chaos:
                     match.add_submatch(item)
@@ -356,5 +512,9 @@ class CliDetectionResult:
             "is_preferred": self.is_preferred,
         }
 
-    def to_json(self) -> str:
-        return dumps(self.__dict__, ensure_ascii=True, indent=4)
+    def __reduce__(self) -> tuple[type[CliDetectionResult], tuple[Any, ...]]:
+        # __dict__ being a property, the default pickling cannot restore the attributes.
+        return CliDetectionResult, tuple(self.__dict__.values())
+
+    def to_json(self, indent: int | None = 4) -> str:
+        return dumps(self.__dict__, ensure_ascii=True, indent=indent)
@@ -3,9 +3,11 @@ from __future__ import annotations
 import importlib
 import logging
 import unicodedata
+from bisect import bisect_right
 from codecs import IncrementalDecoder
 from encodings.aliases import aliases
 from functools import lru_cache
+from mmap import mmap
 from re import findall
 from typing import Generator
 
@@ -23,6 +25,10 @@ from .constant import (
     COMMON_CJK_CHARACTERS,
 )
 
+_UNICODE_RANGE_NAMES: list[str] = list(UNICODE_RANGES_COMBINED)
+_UNICODE_RANGES: list[range] = list(UNICODE_RANGES_COMBINED.values())
+_UNICODE_RANGE_STARTS: list[int] = [r.start for r in _UNICODE_RANGES]
+
 
 @lru_cache(maxsize=UTF8_MAXIMAL_ALLOCATION)
 def is_accentuated(character: str) -> bool:
@@ -60,9 +66,11 @@ def unicode_range(character: str) -> str | None:
     """
     character_ord: int = ord(character)
 
-    for range_name, ord_range in UNICODE_RANGES_COMBINED.items():
-        if character_ord in ord_range:
-            return range_name
+    # The ranges are sorted and do not overlap.
+    i: int = bisect_right(_UNICODE_RANGE_STARTS, character_ord) - 1
+
+    if i >= 0 and character_ord in _UNICODE_RANGES[i]:
+        return _UNICODE_RANGE_NAMES[i]
 
     return None
 
@@ -222,20 +230,27 @@ def is_unprintable(character: str) -> bool:
     )
 
 
-def any_specified_encoding(sequence: bytes, search_zone: int = 8192) -> str | None:
+def any_specified_encoding(
+    sequence: bytes | mmap, search_zone: int = 8192
+) -> str | None:
     """
     Extract using ASCII-only decoder any specified encoding in the first n-bytes.
     """
-    if not isinstance(sequence, bytes):
+    if not isinstance(sequence, (bytes, mmap)):
         raise TypeError
 
     seq_len: int = len(sequence)
-
-    results: list[str] = findall(
-        RE_POSSIBLE_ENCODING_INDICATION,
-        sequence[: min(seq_len, search_zone)].decode("ascii", errors="ignore"),
+    search_text: str = sequence[: min(seq_len, search_zone)].decode(
+        "ascii", errors="ignore"
     )
 
+    # Much cheaper than the case-insensitive pattern, and most payloads declare nothing.
+    lowered_text: str = search_text.lower()
+    if "coding" not in lowered_text and "charset" not in lowered_text:
+        return None
+
+    results: list[str] = findall(RE_POSSIBLE_ENCODING_INDICATION, search_text)
+
     if len(results) == 0:
         return None
 
@@ -275,7 +290,7 @@ def is_multi_byte_encoding(name: str) -> bool:
     )
 
 
-def identify_sig_or_bom(sequence: bytes) -> tuple[str | None, bytes]:
+def identify_sig_or_bom(sequence: bytes | mmap) -> tuple[str | None, bytes]:
     """
     Identify and extract SIG/BOM in given sequence.
     """
@@ -287,7 +302,8 @@ def identify_sig_or_bom(sequence: bytes) -> tuple[str | None, bytes]:
             marks = [marks]
 
         for mark in marks:
-            if sequence.startswith(mark):
+            # Slicing, as a mmap has no startswith().
+            if sequence[: len(mark)] == mark:
                 return iana_encoding, mark
 
     return None, b""
@@ -174,8 +174,8 @@ from .exceptions import (
     TooManyRedirects,
     URLRequired,
 )
-from .models import PreparedRequest, Request, Response
-from .sessions import Session, session
+from .models import PreparedRequest, Request, RequestTemplate, Response
+from .sessions import Session, ThreadSafeSession, session
 from .status_codes import codes
 
 logging.getLogger(__name__).addHandler(NullHandler())
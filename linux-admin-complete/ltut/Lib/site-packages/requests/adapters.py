@@ -6,8 +6,12 @@ This module contains the transport adapters that Requests uses to define
 and maintain connections.
 """
 
+import copy
+import functools
 import os.path
 import socket  # noqa: F401
+import threading
+import time
 import typing
 import warnings
 
@@ -44,6 +48,7 @@ from .exceptions import (
     RetryError,
     SSLError,
 )
+from .hooks import dispatch_event
 from .models import Response
 from .structures import CaseInsensitiveDict
 from .utils import (
@@ -67,6 +72,54 @@ except ImportError:
 if typing.TYPE_CHECKING:
     from .models import PreparedRequest
 
+# The request HTTPAdapter.send is sending in this thread, for the
+# post_connect and retry hooks, which fire from inside urllib3.
+_sending = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def _hooked_connection_class(cls):
+    """Returns a subclass of the urllib3 connection class ``cls`` that fires
+    ``post_connect`` hooks when it connects."""
+
+    def connect(self):
+        start = time.monotonic()
+        cls.connect(self)
+        request = getattr(_sending, "request", None)
+        if request is not None:
+            dispatch_event(
+                "post_connect",
+                request.hooks,
+                request,
+                duration=time.monotonic() - start,
+            )
+
+    return type(cls.__name__, (cls,), {"connect": connect, "_hooked": True})
+
+
+@functools.lru_cache(maxsize=None)
+def _hooked_retry_class(cls):
+    """Returns a subclass of the urllib3 ``Retry`` class ``cls`` that fires
+    ``retry`` hooks each time urllib3 retries."""
+
+    def increment(self, *args, **kwargs):
+        # Raises once retries are exhausted, so no retry event is fired.
+        new_retries = cls.increment(self, *args, **kwargs)
+        request = getattr(_sending, "request", None)
+        if request is not None:
+            dispatch_event("retry", request.hooks, request, error=kwargs.get("error"))
+        return new_retries
+
+    return type(cls.__name__, (cls,), {"increment": increment})
+
+
+def _hooked_retry(retries):
+    """Returns a copy of the urllib3 ``Retry`` object ``retries`` that fires
+    ``retry`` hooks each time urllib3 retries."""
+    retries = copy.copy(retries)
+    retries.__class__ = _hooked_retry_class(type(retries))
+    return retries
+
 
 DEFAULT_POOLBLOCK = False
 DEFAULT_POOLSIZE = 10
@@ -649,6 +702,15 @@ class HTTPAdapter(BaseAdapter):
 
         chunked = not (request.body is None or "Content-Length" in request.headers)
 
+        hooks = request.hooks
+        # Only pools that served a post_connect hook use the hooked class.
+        if hooks and hooks.get("post_connect"):
+            if not getattr(conn.ConnectionCls, "_hooked", False):
+                conn.ConnectionCls = _hooked_connection_class(conn.ConnectionCls)
+        retries = self.max_retries
+        if hooks and hooks.get("retry"):
+            retries = _hooked_retry(retries)
+
         if isinstance(timeout, tuple):
             try:
                 connect, read = timeout
@@ -663,6 +725,7 @@ class HTTPAdapter(BaseAdapter):
         else:
             timeout = TimeoutSauce(connect=timeout, read=timeout)
 
+        _sending.request = request
         try:
             resp = conn.urlopen(
                 method=request.method,
@@ -673,7 +736,7 @@ class HTTPAdapter(BaseAdapter):
                 assert_same_host=False,
                 preload_content=False,
                 decode_content=False,
-                retries=self.max_retries,
+                retries=retries,
                 timeout=timeout,
                 chunked=chunked,
             )
@@ -716,4 +779,9 @@ class HTTPAdapter(BaseAdapter):
             else:
                 raise
 
-        return self.build_response(request, resp)
+        finally:
+            _sending.request = None
+
+        response = self.build_response(request, resp)
+        dispatch_event("first_byte", request.hooks, request, response=response)
+        return response
@@ -105,13 +105,25 @@ class HTTPProxyAuth(HTTPBasicAuth):
 
 
 class HTTPDigestAuth(AuthBase):
-    """Attaches HTTP Digest Authentication to the given Request object."""
+    """Attaches HTTP Digest Authentication to the given Request object.
+
+    Challenges are shared by every thread using the instance, keyed by host
+    and realm. Once a host has sent a challenge, later requests to it carry
+    an Authorization header up front instead of waiting for another 401.
+    """
 
     def __init__(self, username, password):
         self.username = username
         self.password = password
-        # Keep state in per-thread local storage
+        # Keep per-request state in per-thread local storage
         self._thread_local = threading.local()
+        # Challenges shared across threads: (host, realm) -> challenge,
+        # along with the realm last seen for each host and the nonce count
+        # of each live nonce.
+        self._lock = threading.Lock()
+        self._challenges = {}
+        self._host_realms = {}
+        self._nonce_counts = {}
 
     def init_per_thread_state(self):
         # Ensure state is initialized just once per-thread
@@ -123,6 +135,25 @@ class HTTPDigestAuth(AuthBase):
             self._thread_local.pos = None
             self._thread_local.num_401_calls = None
 
+    def _store_challenge(self, url, chal):
+        """Shares a challenge received for url with all threads."""
+        host = urlparse(url).netloc
+        realm = chal.get("realm")
+        with self._lock:
+            old = self._challenges.get((host, realm))
+            if old is not None:
+                self._nonce_counts.pop(old.get("nonce"), None)
+            self._challenges[(host, realm)] = chal
+            self._host_realms[host] = realm
+
+    def _shared_challenge(self, url):
+        """Returns the challenge last received from the host of url."""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_realms:
+                return None
+            return self._challenges.get((host, self._host_realms[host]))
+
     def build_digest_header(self, method, url):
         """
         :rtype: str
@@ -192,10 +223,11 @@ class HTTPDigestAuth(AuthBase):
         HA1 = hash_utf8(A1)
         HA2 = hash_utf8(A2)
 
-        if nonce == self._thread_local.last_nonce:
-            self._thread_local.nonce_count += 1
-        else:
-            self._thread_local.nonce_count = 1
+        # The nonce count must never repeat, whichever thread sends it.
+        with self._lock:
+            nonce_count = self._nonce_counts.get(nonce, 0) + 1
+            self._nonce_counts[nonce] = nonce_count
+        self._thread_local.nonce_count = nonce_count
         ncvalue = f"{self._thread_local.nonce_count:08x}"
         s = str(self._thread_local.nonce_count).encode("utf-8")
         s += nonce.encode("utf-8")
@@ -261,6 +293,7 @@ class HTTPDigestAuth(AuthBase):
             self._thread_local.num_401_calls += 1
             pat = re.compile(r"digest ", flags=re.IGNORECASE)
             self._thread_local.chal = parse_dict_header(pat.sub("", s_auth, count=1))
+            self._store_challenge(r.request.url, self._thread_local.chal)
 
             # Consume content and release the original connection
             # to allow our new request to reuse the same one.
@@ -285,9 +318,13 @@ class HTTPDigestAuth(AuthBase):
     def __call__(self, r):
         # Initialize per-thread state, if needed
         self.init_per_thread_state()
-        # If we have a saved nonce, skip the 401
-        if self._thread_local.last_nonce:
-            r.headers["Authorization"] = self.build_digest_header(r.method, r.url)
+        # If we have a challenge for this host, skip the 401
+        chal = self._shared_challenge(r.url)
+        if chal is not None:
+            self._thread_local.chal = chal
+            header = self.build_digest_header(r.method, r.url)
+            if header is not None:
+                r.headers["Authorization"] = header
         try:
             self._thread_local.pos = r.body.tell()
         except AttributeError:
@@ -0,0 +1,740 @@
+"""
+requests.caching
+~~~~~~~~~~~~~~~~
+
+This module contains an HTTP caching transport adapter and the storage
+backends it can use.
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from email.utils import mktime_tz, parsedate_tz
+from io import BytesIO
+
+from urllib3._collections import HTTPHeaderDict
+from urllib3.response import HTTPResponse
+
+from .adapters import HTTPAdapter
+from .structures import CaseInsensitiveDict
+from .utils import parse_list_header, unquote_header_value
+
+#: Status codes of responses that may be stored.
+CACHEABLE_STATUS_CODES = frozenset((200, 203, 300, 301, 308, 404, 410))
+
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+_HOP_BY_HOP_HEADERS = frozenset(
+    (
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    )
+)
+
+# Headers of a 304 response that must not replace the stored ones.
+_UNREFRESHABLE_HEADERS = _HOP_BY_HOP_HEADERS | {"content-length"}
+
+_SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "TRACE"))
+
+# Age past which a temporary file is taken for one a crash left behind,
+# rather than one still being written.
+_STALE_TEMPORARY_AGE = 24 * 60 * 60
+
+
+def parse_cache_control(value):
+    """Parses a ``Cache-Control`` header into a dict of directives.
+
+    Directive names are lower-cased; directives without an argument map
+    to ``None``.
+
+    :rtype: dict
+    """
+    directives = {}
+    for item in parse_list_header(value or ""):
+        name, sep, arg = item.partition("=")
+        name = name.strip().lower()
+        if name:
+            directives[name] = unquote_header_value(arg.strip()) if sep else None
+    return directives
+
+
+def _seconds(value):
+    """Parses a delta-seconds value, returning None if it is invalid."""
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _http_date(value):
+    """Parses an HTTP date into a timestamp, returning None if it is invalid."""
+    parsed = parsedate_tz(value) if value else None
+    if parsed is None:
+        return None
+    return mktime_tz(parsed)
+
+
+def _digest(value):
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return hashlib.sha256(value).hexdigest()
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def freshness_lifetime(headers, stored_at):
+    """Returns how many seconds a stored response stays fresh.
+
+    :param headers: the stored response headers.
+    :param stored_at: time at which the response was received.
+    :rtype: int
+    """
+    directives = parse_cache_control(headers.get("Cache-Control"))
+    if "no-cache" in directives:
+        return 0
+    max_age = _seconds(directives.get("max-age"))
+    if max_age is not None:
+        return max_age
+    expires = _http_date(headers.get("Expires"))
+    if expires is None:
+        return 0
+    date = _http_date(headers.get("Date"))
+    return max(0, expires - (stored_at if date is None else date))
+
+
+class CacheMetrics:
+    """Counters describing how a :class:`CachingAdapter` served requests.
+
+    ``hits`` were answered from the cache alone, ``revalidations`` were
+    answered from the cache after the server confirmed them with a 304,
+    and ``misses`` were fetched from the server. ``stores`` counts the
+    responses written to the cache.
+    """
+
+    __attrs__ = ["hits", "misses", "revalidations", "stores"]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stores = 0
+
+    def incr(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self):
+        with self._lock:
+            return {attr: getattr(self, attr) for attr in self.__attrs__}
+
+    def __repr__(self):
+        counters = ", ".join(f"{k}={v}" for k, v in self.as_dict().items())
+        return f"<CacheMetrics {counters}>"
+
+
+class BaseCache:
+    """The Base Cache Backend
+
+    A backend stores response bodies under a key, along with a dict of
+    JSON-serializable metadata describing the response.
+    """
+
+    def get(self, key):
+        """Returns a ``(meta, fp)`` tuple for the entry stored under
+        ``key``, where ``fp`` is a binary file object for the body, or
+        None if there is no such entry.
+        """
+        raise NotImplementedError
+
+    def open_writer(self, key, meta):
+        """Returns a writer for a new entry. The body is passed to its
+        ``write`` method as it arrives; ``commit`` stores the entry and
+        ``abort`` discards it.
+        """
+        raise NotImplementedError
+
+    def update(self, key, meta):
+        """Replaces the metadata of an existing entry."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Removes the entry stored under ``key``, if any."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Removes every entry."""
+        raise NotImplementedError
+
+
+class _MemoryWriter:
+    def __init__(self, cache, key, meta):
+        self.cache = cache
+        self.key = key
+        self.meta = meta
+        self.parts = []
+        self.size = 0
+
+    def write(self, data):
+        if self.parts is None:
+            return
+        self.size += len(data)
+        if self.size > self.cache.max_size:
+            # The entry could never fit; stop buffering it.
+            self.parts = None
+        else:
+            self.parts.append(bytes(data))
+
+    def commit(self):
+        if self.parts is not None:
+            self.cache._store(self.key, self.meta, b"".join(self.parts))
+        self.parts = None
+
+    def abort(self):
+        self.parts = None
+
+
+class MemoryCache(BaseCache):
+    """An in-memory cache backend that evicts the least recently used
+    entries once their bodies exceed ``max_size`` bytes in total.
+
+    :param max_size: (optional) Maximum total size of the stored bodies.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        with self._lock:
+            return {"max_size": self.max_size, "_entries": OrderedDict(self._entries)}
+
+    def __setstate__(self, state):
+        self.__init__(state["max_size"])
+        for key, (meta, body) in state["_entries"].items():
+            self._store(key, meta, body)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def _store(self, key, meta, body):
+        with self._lock:
+            self._remove(key)
+            if len(body) > self.max_size:
+                return
+            self._entries[key] = (meta, body)
+            self._size += len(body)
+            while self._size > self.max_size:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        meta, body = entry
+        return dict(meta), BytesIO(body)
+
+    def open_writer(self, key, meta):
+        return _MemoryWriter(self, key, meta)
+
+    def update(self, key, meta):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (meta, entry[1])
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class _FileWriter:
+    def __init__(self, cache, key, meta):
+        self.cache = cache
+        self.key = key
+        self.meta = meta
+        self.size = 0
+        fd, self.path = tempfile.mkstemp(suffix=".tmp", dir=cache.directory)
+        self.file = os.fdopen(fd, "wb")
+
+    def write(self, data):
+        if self.file is None:
+            return
+        self.size += len(data)
+        if self.size > self.cache.max_size:
+            self.abort()
+            return
+        try:
+            self.file.write(data)
+        except OSError:
+            # A full disk only costs the entry, not the response.
+            self.abort()
+
+    def commit(self):
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        try:
+            self.cache._store(self.key, self.meta, self.path, self.size)
+        except BaseException:
+            _remove_file(self.path)
+            raise
+
+    def abort(self):
+        if self.file is None:
+            return
+        try:
+            self.file.close()
+        finally:
+            self.file = None
+            _remove_file(self.path)
+
+
+class FileCache(BaseCache):
+    """An on-disk cache backend. Each entry is kept as a body file and a
+    JSON metadata file in ``directory``. Bodies are streamed to disk as
+    they are read, and the least recently used entries are evicted once
+    the bodies exceed ``max_size`` bytes in total. Temporary files that a
+    crash left behind are removed once a day old, when a cache is created.
+
+    :param directory: Directory to keep the cache in; created if missing.
+    :param max_size: (optional) Maximum total size of the stored bodies.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self._index = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def __getstate__(self):
+        return {"directory": self.directory, "max_size": self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(state["directory"], state["max_size"])
+
+    def __len__(self):
+        return len(self._index)
+
+    def _paths(self, name):
+        base = os.path.join(self.directory, name)
+        return base + ".body", base + ".json"
+
+    def _load_index(self):
+        found = []
+        stale = time.time() - _STALE_TEMPORARY_AGE
+        for filename in os.listdir(self.directory):
+            name, ext = os.path.splitext(filename)
+            if ext == ".tmp":
+                path = os.path.join(self.directory, filename)
+                try:
+                    if os.path.getmtime(path) < stale:
+                        _remove_file(path)
+                except OSError:
+                    pass
+                continue
+            if ext != ".json":
+                continue
+            body_path, meta_path = self._paths(name)
+            try:
+                mtime = os.path.getmtime(meta_path)
+                found.append((mtime, name, os.path.getsize(body_path)))
+            except OSError:
+                self._discard(name)
+        for _, name, size in sorted(found):
+            self._index[name] = size
+            self._size += size
+        self._evict()
+
+    def _discard(self, name):
+        size = self._index.pop(name, None)
+        if size is not None:
+            self._size -= size
+        for path in self._paths(name):
+            _remove_file(path)
+
+    def _evict(self):
+        while self._size > self.max_size and self._index:
+            self._discard(next(iter(self._index)))
+
+    def _write_meta(self, path, meta):
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            _remove_file(tmp_path)
+            raise
+
+    def _store(self, key, meta, tmp_path, size):
+        name = _digest(key)
+        body_path, meta_path = self._paths(name)
+        with self._lock:
+            self._discard(name)
+            if size > self.max_size:
+                _remove_file(tmp_path)
+                return
+            try:
+                os.replace(tmp_path, body_path)
+            except OSError:
+                _remove_file(tmp_path)
+                return
+            try:
+                self._write_meta(meta_path, dict(meta, key=key))
+            except OSError:
+                self._discard(name)
+                return
+            self._index[name] = size
+            self._size += size
+            self._evict()
+
+    def get(self, key):
+        name = _digest(key)
+        body_path, meta_path = self._paths(name)
+        with self._lock:
+            if name not in self._index:
+                return None
+            try:
+                with open(meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+                fp = open(body_path, "rb")
+            except (OSError, ValueError):
+                self._discard(name)
+                return None
+            self._index.move_to_end(name)
+        if meta.pop("key", None) != key:
+            fp.close()
+            return None
+        try:
+            # Keep the recency order across processes.
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return meta, fp
+
+    def open_writer(self, key, meta):
+        return _FileWriter(self, key, meta)
+
+    def update(self, key, meta):
+        name = _digest(key)
+        with self._lock:
+            if name in self._index:
+                try:
+                    self._write_meta(self._paths(name)[1], dict(meta, key=key))
+                except OSError:
+                    self._discard(name)
+
+    def delete(self, key):
+        with self._lock:
+            self._discard(_digest(key))
+
+    def clear(self):
+        with self._lock:
+            for name in list(self._index):
+                self._discard(name)
+
+
+class _CacheTee:
+    """Wraps the file object of a urllib3 response and copies the body
+    into a cache writer as it is read. The entry is committed once the
+    body has been read in full, and discarded if the response is closed
+    before that.
+
+    This relies on the private ``HTTPResponse._fp`` of urllib3 2.x (as of
+    2.5.0) holding the ``http.client.HTTPResponse``, and on its chunked
+    reader being the only code that goes past it, through ``_fp.fp``. The
+    adapter checks both, and leaves the response uncached when they do not
+    hold.
+    """
+
+    def __init__(self, fp, writer, metrics):
+        self._fp = fp
+        self._writer = writer
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        # Hiding ``fp`` keeps urllib3 off its chunked reader, which reads
+        # from ``self._fp.fp`` directly and would bypass the tee.
+        if name == "fp" or "_fp" not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self._fp, name)
+
+    def _tee(self, data):
+        writer = self._writer
+        if writer is None:
+            return data
+        if data:
+            writer.write(data)
+        if self._fp.isclosed():
+            self._writer = None
+            # http.client leaves ``length`` set when the body was cut short.
+            if getattr(self._fp, "length", None):
+                writer.abort()
+            else:
+                writer.commit()
+                self._metrics.incr("stores")
+        return data
+
+    def read(self, *args):
+        return self._tee(self._fp.read(*args))
+
+    def read1(self, *args):
+        return self._tee(self._fp.read1(*args))
+
+    def close(self):
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.abort()
+        self._fp.close()
+
+
+class CachingAdapter(HTTPAdapter):
+    """An HTTP Adapter that caches responses to GET requests.
+
+    Responses are stored according to their ``Cache-Control`` and
+    ``Expires`` headers. Fresh responses are served without contacting the
+    server, while stale responses carrying an ``ETag`` or ``Last-Modified``
+    validator are revalidated with a conditional request. Bodies are
+    handed to the cache backend as the response is read, so the adapter
+    never buffers them itself. Successful requests with unsafe methods
+    invalidate the entry for their URL.
+
+    Takes the same arguments as :class:`HTTPAdapter
+    <requests.adapters.HTTPAdapter>`, plus:
+
+    :param cache: (optional) The :class:`BaseCache` backend to use.
+        Defaults to a :class:`MemoryCache`.
+
+    Usage::
+
+      >>> import requests
+      >>> from requests.caching import CachingAdapter, FileCache
+      >>> s = requests.Session()
+      >>> a = CachingAdapter(cache=FileCache('.web_cache'))
+      >>> s.mount('https://', a)
+      >>> a.metrics
+      <CacheMetrics hits=0, misses=0, revalidations=0, stores=0>
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["cache"]
+
+    def __init__(self, *args, cache=None, **kwargs):
+        #: The backend responses are stored in.
+        self.cache = MemoryCache() if cache is None else cache
+        #: Hit, miss and revalidation counters for this adapter.
+        self.metrics = CacheMetrics()
+        super().__init__(*args, **kwargs)
+
+    def __setstate__(self, state):
+        self.metrics = CacheMetrics()
+        super().__setstate__(state)
+
+    def cache_key(self, request):
+        """Returns the key a request's response is stored under.
+
+        :param request: The :class:`PreparedRequest <PreparedRequest>`.
+        :rtype: str
+        """
+        return request.url
+
+    def _matches(self, meta, request):
+        """Checks the request against the headers the entry varies on."""
+        for name, value in meta["vary"].items():
+            if request.headers.get(name) != value:
+                return False
+        auth = request.headers.get("Authorization")
+        return meta["auth"] == (None if auth is None else _digest(auth))
+
+    def _is_fresh(self, meta, directives):
+        if "no-cache" in directives:
+            return False
+        headers = CaseInsensitiveDict(meta["headers"])
+        lifetime = freshness_lifetime(headers, meta["time"])
+        max_age = _seconds(directives.get("max-age"))
+        if max_age is not None:
+            lifetime = min(lifetime, max_age)
+        age = max(0, time.time() - meta["time"]) + (_seconds(headers.get("Age")) or 0)
+        return age < lifetime
+
+    def _cached_response(self, request, meta, fp):
+        raw = HTTPResponse(
+            body=fp,
+            headers=HTTPHeaderDict(meta["headers"]),
+            status=meta["status"],
+            version=meta["version"],
+            reason=meta["reason"],
+            preload_content=False,
+            decode_content=False,
+            request_method=request.method,
+            request_url=request.url,
+        )
+        return self.build_response(request, raw)
+
+    def _refresh(self, meta, response):
+        """Merges the headers of a 304 response into a stored entry."""
+        updates = [
+            [name, value]
+            for name, value in response.raw.headers.items()
+            if name.lower() not in _UNREFRESHABLE_HEADERS
+        ]
+        names = {name.lower() for name, _ in updates}
+        headers = [pair for pair in meta["headers"] if pair[0].lower() not in names]
+        return dict(meta, headers=headers + updates, time=time.time())
+
+    def _store(self, key, request, response):
+        headers = response.headers
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        vary = [v.strip().lower() for v in headers.get("Vary", "").split(",")]
+        if (
+            response.status_code not in CACHEABLE_STATUS_CODES
+            or "no-store" in directives
+            or "*" in vary
+        ):
+            return
+        now = time.time()
+        if not (
+            freshness_lifetime(headers, now)
+            or "ETag" in headers
+            or "Last-Modified" in headers
+        ):
+            return
+        raw = response.raw
+        # urllib3 2.x private attribute, see _CacheTee. Another layout is not
+        # cached at all rather than cached wrong.
+        fp = getattr(raw, "_fp", None)
+        if not isinstance(fp, http.client.HTTPResponse) or not hasattr(
+            raw, "supports_chunked_reads"
+        ):
+            return
+        auth = request.headers.get("Authorization")
+        meta = {
+            "url": response.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "version": raw.version,
+            "headers": [
+                [name, value]
+                for name, value in raw.headers.items()
+                if name.lower() not in _HOP_BY_HOP_HEADERS
+            ],
+            "time": now,
+            "vary": {name: request.headers.get(name) for name in vary if name},
+            "auth": None if auth is None else _digest(auth),
+        }
+        writer = self.cache.open_writer(key, meta)
+        raw._fp = _CacheTee(fp, writer, self.metrics)
+        if raw.supports_chunked_reads():
+            # urllib3 would read the body past the tee.
+            raw._fp = fp
+            writer.abort()
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        """Sends PreparedRequest object, answering it from the cache when
+        possible. Returns Response object.
+
+        Takes the same arguments as :meth:`HTTPAdapter.send
+        <requests.adapters.HTTPAdapter.send>`.
+
+        :rtype: requests.Response
+        """
+        kwargs = {
+            "stream": stream,
+            "timeout": timeout,
+            "verify": verify,
+            "cert": cert,
+            "proxies": proxies,
+        }
+        key = self.cache_key(request)
+        directives = parse_cache_control(request.headers.get("Cache-Control"))
+        if (
+            request.method != "GET"
+            or "no-store" in directives
+            or "Range" in request.headers
+            or "If-None-Match" in request.headers
+            or "If-Modified-Since" in request.headers
+        ):
+            response = super().send(request, **kwargs)
+            if request.method not in _SAFE_METHODS and response.status_code < 400:
+                self.cache.delete(key)
+            return response
+
+        cached = self.cache.get(key)
+        if cached is not None and not self._matches(cached[0], request):
+            cached[1].close()
+            cached = None
+
+        sent = request
+        if cached is not None:
+            meta, fp = cached
+            if self._is_fresh(meta, directives):
+                self.metrics.incr("hits")
+                return self._cached_response(request, meta, fp)
+
+            headers = CaseInsensitiveDict(meta["headers"])
+            if "ETag" in headers or "Last-Modified" in headers:
+                sent = request.copy()
+                if "ETag" in headers:
+                    sent.headers["If-None-Match"] = headers["ETag"]
+                if "Last-Modified" in headers:
+                    sent.headers["If-Modified-Since"] = headers["Last-Modified"]
+            else:
+                fp.close()
+                cached = None
+
+        try:
+            response = super().send(sent, **kwargs)
+        except BaseException:
+            if cached is not None:
+                cached[1].close()
+            raise
+
+        if cached is not None:
+            if response.status_code == 304:
+                response.close()
+                meta = self._refresh(meta, response)
+                self.cache.update(key, meta)
+                self.metrics.incr("revalidations")
+                return self._cached_response(request, meta, fp)
+            fp.close()
+
+        self.metrics.incr("misses")
+        self._store(key, request, response)
+        return response
@@ -35,13 +35,14 @@ class MockRequest:
     def __init__(self, request):
         self._r = request
         self._new_headers = {}
-        self.type = urlparse(self._r.url).scheme
+        self._parsed = urlparse(self._r.url)
+        self.type = self._parsed.scheme
 
     def get_type(self):
         return self.type
 
     def get_host(self):
-        return urlparse(self._r.url).netloc
+        return self._parsed.netloc
 
     def get_origin_req_host(self):
         return self.get_host()
@@ -53,7 +54,7 @@ class MockRequest:
             return self._r.url
         # If they did set it, retrieve it and reconstruct the expected domain
         host = to_native_string(self._r.headers["Host"], encoding="utf-8")
-        parsed = urlparse(self._r.url)
+        parsed = self._parsed
         # Reconstruct the URL as we expect it
         return urlunparse(
             [
@@ -131,9 +132,15 @@ def extract_cookies_to_jar(jar, request, response):
     if not (hasattr(response, "_original_response") and response._original_response):
         return
     # the _original_response field is the wrapped httplib.HTTPResponse object,
+    msg = response._original_response.msg
+    # cookiejar ignores responses without any Set-Cookie headers, so don't
+    # bother building the mocks for them.
+    get_all = getattr(msg, "get_all", None)
+    if get_all is not None and not (get_all("Set-Cookie") or get_all("Set-Cookie2")):
+        return
     req = MockRequest(request)
     # pull out the HTTPMessage with the headers and put it in the mock:
-    res = MockResponse(response._original_response.msg)
+    res = MockResponse(msg)
     jar.extract_cookies(res, req)
 
 
@@ -143,6 +150,9 @@ def get_cookie_header(jar, request):
 
     :rtype: str
     """
+    if not getattr(jar, "_cookies", True):
+        # An empty cookielib jar never produces a header.
+        return None
     r = MockRequest(request)
     jar.add_cookie_header(r)
     return r.get_new_headers().get("Cookie")
@@ -188,9 +198,31 @@ class RequestsCookieJar(cookielib.CookieJar, MutableMapping):
 
     Unlike a regular CookieJar, this class is pickleable.
 
+    When used with the default cookie policy, the ``Cookie`` header for a
+    request is built by looking up only the domains that can match the
+    request host, rather than by checking every domain in the jar.
+
+    Iterating over the jar takes a snapshot under the jar's lock, so the
+    jar can be read while other threads add or remove cookies.
+
     .. warning:: dictionary operations that are normally O(1) may be O(n).
     """
 
+    def __init__(self, policy=None):
+        super().__init__(policy)
+        # Insertion order of each domain in ``self._cookies``, used to keep
+        # the Cookie header identical to a full scan of the jar.
+        self._domain_order = {}
+        self._domain_seq = 0
+        # Earliest expiry time of any cookie in the jar; nothing needs to be
+        # purged before then.
+        self._next_expiry = float("inf")
+
+    def __iter__(self):
+        with self._cookies_lock:
+            cookies = list(super().__iter__())
+        return iter(cookies)
+
     def get(self, name, default=None, domain=None, path=None):
         """Dict-like get() that also supports optional domain and path args in
         order to resolve naming collisions from using one cookie jar over
@@ -353,7 +385,71 @@ class RequestsCookieJar(cookielib.CookieJar, MutableMapping):
             and cookie.value.endswith('"')
         ):
             cookie.value = cookie.value.replace('\\"', "")
-        return super().set_cookie(cookie, *args, **kwargs)
+        with self._cookies_lock:
+            if cookie.domain not in self._cookies:
+                self._domain_seq += 1
+                self._domain_order[cookie.domain] = self._domain_seq
+            if cookie.expires is not None and cookie.expires < self._next_expiry:
+                self._next_expiry = cookie.expires
+            return super().set_cookie(cookie, *args, **kwargs)
+
+    def clear(self, domain=None, path=None, name=None):
+        super().clear(domain, path, name)
+        if domain is None:
+            self._domain_order = {}
+        elif path is None:
+            self._domain_order.pop(domain, None)
+
+    def clear_expired_cookies(self):
+        """Discard all expired cookies.
+
+        The jar is only scanned once the earliest known expiry time has
+        passed, instead of on every request.
+        """
+        if time.time() < self._next_expiry:
+            return
+        with self._cookies_lock:
+            super().clear_expired_cookies()
+            self._next_expiry = min(
+                (cookie.expires for cookie in self if cookie.expires is not None),
+                default=float("inf"),
+            )
+
+    def _cookies_for_request(self, request):
+        """Return a list of cookies to be returned to server.
+
+        ``DefaultCookiePolicy.domain_return_ok`` only accepts domains that are
+        a dot-separated suffix of the request host (or the empty domain), so
+        only those keys are looked up in the jar.
+        """
+        if (
+            type(self._policy).domain_return_ok
+            is not cookielib.DefaultCookiePolicy.domain_return_ok
+        ):
+            return super()._cookies_for_request(request)
+
+        domains = {""}
+        for host in cookielib.eff_request_host(request):
+            if not host.startswith("."):
+                host = f".{host}"
+            index = 0
+            while index != -1:
+                suffix = host[index:]
+                domains.add(suffix)
+                domains.add(suffix[1:])
+                index = host.find(".", index + 1)
+
+        order = self._domain_order
+        candidates = [domain for domain in domains if domain in self._cookies]
+        if any(domain not in order for domain in candidates):
+            return super()._cookies_for_request(request)
+        # Visit domains in jar order, as cookielib does.
+        candidates.sort(key=order.__getitem__)
+
+        cookies = []
+        for domain in candidates:
+            cookies.extend(self._cookies_for_domain(domain, request))
+        return cookies
 
     def update(self, other):
         """Updates this jar with cookies from another CookieJar or dict-like"""
@@ -424,6 +520,11 @@ class RequestsCookieJar(cookielib.CookieJar, MutableMapping):
         self.__dict__.update(state)
         if "_cookies_lock" not in self.__dict__:
             self._cookies_lock = threading.RLock()
+        if "_domain_order" not in self.__dict__:
+            # Pickled by an older version; rebuild the indexes.
+            self._domain_order = {domain: i for i, domain in enumerate(self._cookies)}
+            self._domain_seq = len(self._domain_order)
+            self._next_expiry = 0
 
     def copy(self):
         """Return a copy of this RequestsCookieJar."""
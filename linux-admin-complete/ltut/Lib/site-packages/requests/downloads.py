@@ -0,0 +1,408 @@
+"""
+requests.downloads
+~~~~~~~~~~~~~~~~~~
+
+This module contains a connection-pooled manager for downloading many
+files at once, and large files in parallel segments.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .adapters import HTTPAdapter
+from .compat import unquote, urlparse
+from .exceptions import ChunkedEncodingError, ConnectionError, InvalidChecksum, Timeout
+from .sessions import ThreadSafeSession
+from .utils import atomic_open
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_SEGMENTS = 4
+#: Files at least this large are fetched in parallel segments, when the
+#: server supports range requests.
+DEFAULT_SEGMENT_THRESHOLD = 32 * 1024 * 1024
+DEFAULT_RETRIES = 3
+
+CHUNK_SIZE = 64 * 1024
+
+# Errors after which a transfer is resumed (or restarted) rather than failed.
+_RETRYABLE_ERRORS = (ConnectionError, ChunkedEncodingError, Timeout)
+
+
+class DownloadResult:
+    """The outcome of downloading one URL with :func:`download_many`."""
+
+    def __init__(self, url, path):
+        #: URL that was downloaded.
+        self.url = url
+        #: Path of the downloaded file.
+        self.path = path
+        #: Number of bytes written to the file.
+        self.size = 0
+        #: Hex digest of the file, if a checksum was given for it.
+        self.digest = None
+        #: Number of segments the file was fetched in.
+        self.segments = 1
+        #: Number of times a transfer was resumed or restarted after an error.
+        self.retries = 0
+        #: The exception that stopped the download, or ``None``.
+        self.error = None
+
+    def __repr__(self):
+        return f"<DownloadResult [{'ok' if self.ok else 'failed'}] {self.url}>"
+
+    @property
+    def ok(self):
+        """``True`` if the file was downloaded (and verified)."""
+        return self.error is None
+
+
+class _Progress:
+    """Aggregates the bytes received by all transfers for the callback."""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.downloaded = 0
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def expect(self, size):
+        with self._lock:
+            self.total += size
+
+    def advance(self, amount):
+        if self.callback is None:
+            return
+        with self._lock:
+            self.downloaded += amount
+            self.callback(self.downloaded, self.total)
+
+
+class _RestartDownload(Exception):
+    """The server ignored a range request, e.g. because the file changed."""
+
+
+class _Transfer:
+    """Downloads one URL into a file opened with :func:`atomic_open`."""
+
+    def __init__(self, session, result, checksum, progress, options):
+        self.session = session
+        self.url = result.url
+        self.result = result
+        self.progress = progress
+        self.segments = options["segments"]
+        self.segment_threshold = options["segment_threshold"]
+        self.retries = options["retries"]
+        self.timeout = options["timeout"]
+        self.validator = None
+        self.received = 0
+        self.algorithm = self.expected = None
+        if checksum:
+            self.algorithm, _, self.expected = checksum.partition(":")
+            # Fail early on unknown algorithms.
+            hashlib.new(self.algorithm)
+        self._lock = threading.Lock()
+        self._failed = threading.Event()
+
+    def _get(self, start=None, end=None):
+        # Ranges apply to the encoded body, so ask for it unencoded.
+        headers = {"Accept-Encoding": "identity"}
+        if start is not None:
+            end = "" if end is None else end - 1
+            headers["Range"] = f"bytes={start}-{end}"
+            headers["If-Range"] = self.validator
+        return self.session.get(
+            self.url, headers=headers, stream=True, timeout=self.timeout
+        )
+
+    def _advance(self, amount):
+        with self._lock:
+            self.received += amount
+        self.progress.advance(amount)
+
+    def _rewind(self, fp):
+        fp.seek(0)
+        fp.truncate()
+        self._advance(-self.received)
+
+    def _is_partial(self, r, start):
+        """Whether ``r`` answers a range request starting at ``start``."""
+        if r.status_code == 206:
+            return r.headers.get("Content-Range", "").startswith(f"bytes {start}-")
+        if r.status_code != 200:
+            r.raise_for_status()
+        return False
+
+    def run(self):
+        with atomic_open(self.result.path) as fp:
+            r = self._get()
+            r.raise_for_status()
+
+            size = r.headers.get("Content-Length")
+            size = int(size) if size and size.isdigit() else None
+            if size is not None:
+                self.progress.expect(size)
+
+            etag = r.headers.get("ETag")
+            if etag and not etag.startswith("W/"):
+                self.validator = etag
+            else:
+                self.validator = r.headers.get("Last-Modified")
+            resumable = (
+                self.validator is not None
+                and size is not None
+                and r.headers.get("Accept-Ranges", "").lower() == "bytes"
+                and "Content-Encoding" not in r.headers
+            )
+
+            hasher = None
+            if resumable and self.segments > 1 and size >= self.segment_threshold:
+                try:
+                    self._download_segments(fp, r, size)
+                except _RestartDownload:
+                    self._rewind(fp)
+                    resumable = False
+                    r = self._get()
+                    r.raise_for_status()
+                else:
+                    hasher = self._hash_file(fp)
+            if hasher is None:
+                hasher = self._download_stream(fp, r, resumable)
+
+            self.result.size = fp.tell()
+            if self.algorithm:
+                self.result.digest = hasher.hexdigest()
+                if self.result.digest != self.expected.lower():
+                    raise InvalidChecksum(
+                        f"{self.algorithm} of {self.url} is {self.result.digest}, "
+                        f"expected {self.expected}"
+                    )
+
+    def _new_hasher(self):
+        return hashlib.new(self.algorithm) if self.algorithm else _NullHasher()
+
+    def _download_stream(self, fp, r, resumable):
+        """Writes the body of ``r`` to ``fp``, hashing it on the fly, and
+        resumes (or restarts) the transfer after connection errors."""
+        hasher = self._new_hasher()
+        failures = 0
+        while True:
+            try:
+                if r is None:
+                    if resumable and self.received:
+                        r = self._get(self.received)
+                        if not self._is_partial(r, self.received):
+                            self._rewind(fp)
+                            hasher = self._new_hasher()
+                    else:
+                        r = self._get()
+                        r.raise_for_status()
+                for chunk in r.iter_content(CHUNK_SIZE):
+                    fp.write(chunk)
+                    hasher.update(chunk)
+                    self._advance(len(chunk))
+                r.close()
+                return hasher
+            except _RETRYABLE_ERRORS:
+                failures += 1
+                if failures > self.retries:
+                    raise
+                self.result.retries += 1
+                if r is not None:
+                    r.close()
+                    r = None
+                if not resumable:
+                    self._rewind(fp)
+                    hasher = self._new_hasher()
+
+    def _download_segments(self, fp, r, size):
+        """Fetches ``size`` bytes in parallel ranges. The first range is
+        read from ``r``, the response to the initial request."""
+        count = min(self.segments, max(1, size // CHUNK_SIZE))
+        bounds = [(size * i // count, size * (i + 1) // count) for i in range(count)]
+        self.result.segments = count
+        write_lock = threading.Lock()
+
+        with ThreadPoolExecutor(max(1, count - 1)) as executor:
+            futures = [
+                executor.submit(self._fetch_segment, fp, write_lock, start, end)
+                for start, end in bounds[1:]
+            ]
+            try:
+                self._fetch_segment(fp, write_lock, *bounds[0], r=r)
+            except BaseException:
+                self._failed.set()
+                raise
+            finally:
+                # Surface the first error of any segment once all have stopped.
+                errors = [f.exception() for f in futures]
+            for error in errors:
+                if error is not None:
+                    raise error
+        fp.seek(size)
+
+    def _fetch_segment(self, fp, write_lock, start, end, r=None):
+        position = start
+        failures = 0
+        try:
+            while position < end and not self._failed.is_set():
+                try:
+                    if r is None:
+                        r = self._get(position, end)
+                        if not self._is_partial(r, position):
+                            r.close()
+                            raise _RestartDownload(self.url)
+                    for chunk in r.iter_content(CHUNK_SIZE):
+                        chunk = chunk[: end - position]
+                        with write_lock:
+                            fp.seek(position)
+                            fp.write(chunk)
+                        position += len(chunk)
+                        self._advance(len(chunk))
+                        if position >= end or self._failed.is_set():
+                            break
+                except _RETRYABLE_ERRORS:
+                    failures += 1
+                    if failures > self.retries:
+                        raise
+                    with self._lock:
+                        self.result.retries += 1
+                # Ask for whatever is left of the range, if anything.
+                if r is not None:
+                    r.close()
+                    r = None
+        except BaseException:
+            self._failed.set()
+            raise
+        finally:
+            if r is not None:
+                r.close()
+
+    def _hash_file(self, fp):
+        hasher = self._new_hasher()
+        if self.algorithm:
+            fp.flush()
+            # atomic_open gives a write-only file object; read the same
+            # descriptor back through a second one.
+            with open(fp.fileno(), "rb", closefd=False) as reader:
+                reader.seek(0)
+                for chunk in iter(lambda: reader.read(CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+        return hasher
+
+
+class _NullHasher:
+    def update(self, data):
+        pass
+
+
+def _filename_from_url(url):
+    name = os.path.basename(unquote(urlparse(url).path))
+    if name in ("", ".", ".."):
+        raise ValueError(
+            f"Cannot derive a file name from {url!r}; pass a (url, filename) pair"
+        )
+    return name
+
+
+def download_many(
+    urls,
+    dest_dir,
+    concurrency=DEFAULT_CONCURRENCY,
+    session=None,
+    checksums=None,
+    progress=None,
+    segments=DEFAULT_SEGMENTS,
+    segment_threshold=DEFAULT_SEGMENT_THRESHOLD,
+    retries=DEFAULT_RETRIES,
+    timeout=None,
+):
+    """Downloads many URLs into ``dest_dir`` over a shared connection pool.
+
+    Each file is written through :func:`atomic_open
+    <requests.utils.atomic_open>`, so it only appears under its final name
+    once it is complete (and verified). A transfer that fails with a
+    connection error is resumed with a range request when the server sent
+    ``Accept-Ranges: bytes`` and a validator (a strong ``ETag`` or
+    ``Last-Modified``), and restarted otherwise, up to ``retries`` times.
+    Files of at least ``segment_threshold`` bytes on such servers are
+    fetched in ``segments`` parallel ranges.
+
+    Usage::
+
+      >>> from requests.downloads import download_many
+      >>> results = download_many(
+      ...     ['https://example.org/a.iso', ('https://example.org/b?id=1', 'b.bin')],
+      ...     '/srv/mirror',
+      ...     checksums={'https://example.org/a.iso': 'sha256:9f86d0...'},
+      ... )
+      >>> [r.url for r in results if not r.ok]
+      []
+
+    :param urls: Iterable of URLs, or of ``(url, filename)`` pairs. Without
+        a filename, the last segment of the URL path is used.
+    :param dest_dir: Directory the files are written to.
+    :param concurrency: (optional) Number of files downloaded at once.
+    :param session: (optional) Session to download with. It is shared
+        between threads, so it should be a :class:`ThreadSafeSession
+        <requests.ThreadSafeSession>`. By default a new one is created, with
+        a connection pool sized for ``concurrency`` and ``segments``.
+    :param checksums: (optional) Dict mapping URLs to expected checksums,
+        as ``'<hashlib algorithm>:<hex digest>'``. A file that does not match
+        is discarded and its result carries :class:`InvalidChecksum
+        <requests.exceptions.InvalidChecksum>`.
+    :param progress: (optional) Callable receiving ``(downloaded, total)``
+        after every chunk of any file: the bytes received so far and the
+        sum of the sizes of the files whose size is known yet.
+    :param segments: (optional) Number of parallel ranges per large file.
+    :param segment_threshold: (optional) Minimum size, in bytes, of a file
+        fetched in segments.
+    :param retries: (optional) Number of times a transfer is resumed after
+        connection errors before it fails.
+    :param timeout: (optional) Timeout passed to each request.
+    :return: a :class:`DownloadResult` for each URL, in order.
+    :rtype: list
+    """
+    results = []
+    for item in urls:
+        url, name = item if isinstance(item, tuple) else (item, None)
+        path = os.path.join(dest_dir, name or _filename_from_url(url))
+        results.append(DownloadResult(url, path))
+    paths = [result.path for result in results]
+    if len(set(paths)) != len(paths):
+        raise ValueError("Several URLs would be downloaded to the same file")
+
+    options = {
+        "segments": max(1, segments),
+        "segment_threshold": segment_threshold,
+        "retries": retries,
+        "timeout": timeout,
+    }
+    checksums = checksums or {}
+    tracker = _Progress(progress)
+
+    owns_session = session is None
+    if owns_session:
+        session = ThreadSafeSession()
+        pool_size = concurrency * options["segments"]
+        for prefix in ("https://", "http://"):
+            session.mount(prefix, HTTPAdapter(pool_maxsize=pool_size))
+
+    def download(result):
+        try:
+            transfer = _Transfer(
+                session, result, checksums.get(result.url), tracker, options
+            )
+            transfer.run()
+        except Exception as e:
+            result.error = e
+
+    try:
+        with ThreadPoolExecutor(concurrency) as executor:
+            # Consume the iterator so that errors in the workers surface.
+            list(executor.map(download, results))
+    finally:
+        if owns_session:
+            session.close()
+    return results
@@ -136,6 +136,10 @@ class UnrewindableBodyError(RequestException):
     """Requests encountered an error when trying to rewind a body."""
 
 
+class InvalidChecksum(RequestException):
+    """The downloaded content does not match the expected checksum."""
+
+
 # Warnings
 
 
@@ -6,17 +6,63 @@ This module provides the capabilities for the Requests hooks system.
 
 Available hooks:
 
+``pre_send``:
+    A prepared request is about to be sent by a Session.
+``post_connect``:
+    The adapter opened a new connection to send the request on.
+``first_byte``:
+    The status line and headers of the response arrived.
 ``response``:
     The response generated from a Request.
+``body_complete``:
+    The response body has been read to the end.
+``retry``:
+    The adapter is retrying the request, as allowed by its ``max_retries``.
+
+Hooks for ``response`` receive the :class:`Response <requests.Response>`;
+hooks for every other event receive a :class:`HookEvent`.
 """
-HOOKS = ["response"]
+import time
+
+HOOKS = ["pre_send", "post_connect", "first_byte", "response", "body_complete", "retry"]
 
 
 def default_hooks():
     return {event: [] for event in HOOKS}
 
 
-# TODO: response is the only one
+class HookEvent:
+    """A point in the lifecycle of a request, passed to the hooks of every
+    event but ``response``.
+
+    Timestamps come from :func:`time.monotonic`.
+    """
+
+    def __init__(
+        self, name, request, response=None, size=None, duration=None, error=None
+    ):
+        #: Name of the event, e.g. ``'first_byte'``.
+        self.name = name
+        #: The :class:`PreparedRequest <requests.PreparedRequest>` concerned.
+        self.request = request
+        #: The :class:`Response <requests.Response>`, once there is one.
+        self.response = response
+        #: Body size in bytes: sent for ``pre_send`` (when known), received
+        #: off the wire for ``body_complete``.
+        self.size = size
+        #: Time taken by the step that just finished (connecting, for
+        #: ``post_connect``), in seconds.
+        self.duration = duration
+        #: The error that caused a ``retry``.
+        self.error = error
+        #: When the event happened.
+        self.time = time.monotonic()
+        sent_at = getattr(request, "_sent_at", None)
+        #: Seconds since the request's ``pre_send`` event, if it had one.
+        self.elapsed = None if sent_at is None else self.time - sent_at
+
+    def __repr__(self):
+        return f"<HookEvent [{self.name}]>"
 
 
 def dispatch_hook(key, hooks, hook_data, **kwargs):
@@ -31,3 +77,10 @@ def dispatch_hook(key, hooks, hook_data, **kwargs):
             if _hook_data is not None:
                 hook_data = _hook_data
     return hook_data
+
+
+def dispatch_event(key, hooks, request, **event_data):
+    """Dispatches a :class:`HookEvent` for ``request`` to the hooks
+    registered for ``key``. The event is only built if there are any."""
+    if hooks and hooks.get(key):
+        dispatch_hook(key, hooks, HookEvent(key, request, **event_data))
@@ -0,0 +1,218 @@
+"""
+requests.metrics
+~~~~~~~~~~~~~~~~
+
+This module contains a collector of per-host latency and size histograms,
+fed by the lifecycle hooks of :mod:`requests.hooks`.
+"""
+
+import math
+import threading
+from array import array
+
+from .compat import urlparse
+
+#: Hosts beyond this many are aggregated together under ``"*"``.
+DEFAULT_MAX_HOSTS = 1000
+
+
+class Histogram:
+    """Counts values in logarithmic buckets, four per power of two, so that
+    memory stays constant however many values are recorded. Quantiles are
+    estimated to within about 9%.
+
+    :param scale: Values are multiplied by this before bucketing; values
+        below ``1 / scale`` share the lowest bucket. Use e.g. ``1e6`` to
+        resolve microseconds when recording seconds.
+    """
+
+    BUCKETS_PER_OCTAVE = 4
+    #: Enough buckets for values up to 2**48 (after scaling).
+    BUCKETS = 1 + 48 * BUCKETS_PER_OCTAVE
+
+    def __init__(self, scale=1):
+        self.scale = scale
+        self.counts = array("Q", bytes(8 * self.BUCKETS))
+        self.count = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        scaled = value * self.scale
+        if scaled < 1:
+            index = 0
+        else:
+            index = 1 + int(math.log2(scaled) * self.BUCKETS_PER_OCTAVE)
+            index = min(index, self.BUCKETS - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Returns an estimate of the ``q`` quantile (0 to 1), or ``None`` if
+        nothing was recorded."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                break
+        if index == 0:
+            return self.min
+        # Geometric middle of the bucket, kept within the observed range.
+        estimate = 2 ** ((index - 0.5) / self.BUCKETS_PER_OCTAVE) / self.scale
+        return min(max(estimate, self.min), self.max)
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _HostMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.retries = 0
+        self.statuses = {}
+        # Seconds.
+        self.connect_time = Histogram(scale=1e6)
+        self.first_byte_time = Histogram(scale=1e6)
+        self.total_time = Histogram(scale=1e6)
+        # Bytes.
+        self.request_size = Histogram()
+        self.response_size = Histogram()
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "retries": self.retries,
+            "statuses": dict(self.statuses),
+            "connect_time": self.connect_time.as_dict(),
+            "first_byte_time": self.first_byte_time.as_dict(),
+            "total_time": self.total_time.as_dict(),
+            "request_size": self.request_size.as_dict(),
+            "response_size": self.response_size.as_dict(),
+        }
+
+
+class MetricsCollector:
+    """Aggregates per-host request latency and size histograms from the
+    ``pre_send``, ``post_connect``, ``first_byte``, ``body_complete`` and
+    ``retry`` hooks, in constant memory per host.
+
+    For each host it counts requests, new connections, retries and status
+    classes, and keeps histograms of the connect time, the time to the
+    first byte and to the end of the body (in seconds), and of the request
+    and response body sizes (in bytes, as sent and received on the wire).
+
+    Usage::
+
+      >>> from requests.metrics import MetricsCollector
+      >>> metrics = MetricsCollector()
+      >>> s = requests.Session()
+      >>> metrics.register(s)
+      >>> s.get('https://httpbin.org/get')
+      <Response [200]>
+      >>> metrics.snapshot()['httpbin.org']['first_byte_time']['p50']
+      0.0371...
+
+    The hooks can also be passed per request, with ``hooks=metrics.hooks``.
+
+    :param max_hosts: (optional) Number of hosts tracked separately. Further
+        hosts are aggregated under ``"*"``.
+    """
+
+    def __init__(self, max_hosts=DEFAULT_MAX_HOSTS):
+        self.max_hosts = max_hosts
+        self._hosts = {}
+        self._lock = threading.Lock()
+        #: The collector's hooks, by event.
+        self.hooks = {
+            "pre_send": self._pre_send,
+            "post_connect": self._post_connect,
+            "first_byte": self._first_byte,
+            "body_complete": self._body_complete,
+            "retry": self._retry,
+        }
+
+    def register(self, target):
+        """Registers the collector's hooks on a :class:`Session
+        <requests.Session>` or :class:`Request <requests.Request>`."""
+        for event, hook in self.hooks.items():
+            register_hook = getattr(target, "register_hook", None)
+            if register_hook is not None:
+                register_hook(event, hook)
+            else:
+                target.hooks.setdefault(event, []).append(hook)
+
+    def _host(self, request):
+        host = urlparse(request.url).netloc.rpartition("@")[2]
+        metrics = self._hosts.get(host)
+        if metrics is None:
+            if len(self._hosts) >= self.max_hosts:
+                host = "*"
+                metrics = self._hosts.get(host)
+            if metrics is None:
+                metrics = self._hosts[host] = _HostMetrics()
+        return metrics
+
+    def _pre_send(self, event, **kwargs):
+        with self._lock:
+            metrics = self._host(event.request)
+            metrics.requests += 1
+            if event.size is not None:
+                metrics.request_size.add(event.size)
+
+    def _post_connect(self, event, **kwargs):
+        with self._lock:
+            metrics = self._host(event.request)
+            metrics.connections += 1
+            metrics.connect_time.add(event.duration)
+
+    def _first_byte(self, event, **kwargs):
+        status = f"{event.response.status_code // 100}xx"
+        with self._lock:
+            metrics = self._host(event.request)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            if event.elapsed is not None:
+                metrics.first_byte_time.add(event.elapsed)
+
+    def _body_complete(self, event, **kwargs):
+        with self._lock:
+            metrics = self._host(event.request)
+            if event.elapsed is not None:
+                metrics.total_time.add(event.elapsed)
+            if event.size is not None:
+                metrics.response_size.add(event.size)
+
+    def _retry(self, event, **kwargs):
+        with self._lock:
+            self._host(event.request).retries += 1
+
+    def snapshot(self):
+        """Returns the metrics gathered so far, as a dict by host.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {host: m.as_dict() for host, m in self._hosts.items()}
+
+    def reset(self):
+        """Discards all metrics gathered so far."""
+        with self._lock:
+            self._hosts.clear()
@@ -5,13 +5,16 @@ requests.models
 This module contains the primary objects that power Requests.
 """
 
+import codecs
 import datetime
 
 # Import encoding now, to avoid implicit import later.
 # Implicit import within threads may cause LookupError when standard library is in a ZIP,
 # such as in Embedded Python. See https://github.com/psf/requests/issues/3578.
 import encodings.idna  # noqa: F401
-from io import UnsupportedOperation
+from bisect import bisect_right
+from io import TextIOBase, UnsupportedOperation
+from itertools import chain
 
 from urllib3.exceptions import (
     DecodeError,
@@ -21,23 +24,31 @@ from urllib3.exceptions import (
     SSLError,
 )
 from urllib3.fields import RequestField
-from urllib3.filepost import encode_multipart_formdata
+from urllib3.filepost import (
+    choose_boundary,
+    encode_multipart_formdata,
+    iter_field_objects,
+)
 from urllib3.util import parse_url
 
 from ._internal_utils import to_native_string, unicode_is_ascii
-from .auth import HTTPBasicAuth
+from .auth import HTTPBasicAuth, HTTPProxyAuth
 from .compat import (
     Callable,
     JSONDecodeError,
     Mapping,
     basestring,
     builtin_str,
-    chardet,
     cookielib,
 )
 from .compat import json as complexjson
 from .compat import urlencode, urlsplit, urlunparse
-from .cookies import _copy_cookie_jar, cookiejar_from_dict, get_cookie_header
+from .cookies import (
+    _copy_cookie_jar,
+    cookiejar_from_dict,
+    get_cookie_header,
+    merge_cookies,
+)
 from .exceptions import (
     ChunkedEncodingError,
     ConnectionError,
@@ -50,18 +61,21 @@ from .exceptions import JSONDecodeError as RequestsJSONDecodeError
 from .exceptions import MissingSchema
 from .exceptions import SSLError as RequestsSSLError
 from .exceptions import StreamConsumedError
-from .hooks import default_hooks
+from .hooks import default_hooks, dispatch_event
 from .status_codes import codes
-from .structures import CaseInsensitiveDict
+from .structures import CaseInsensitiveDict, CaseInsensitiveOverlay
 from .utils import (
     check_header_validity,
+    detect_encoding,
     get_auth_from_url,
     guess_filename,
     guess_json_utf,
     iter_slices,
     parse_header_links,
     requote_uri,
+    stream_decode_json,
     stream_decode_response_unicode,
+    stream_load_json,
     super_len,
     to_key_val_list,
 )
@@ -78,9 +92,221 @@ REDIRECT_STATI = (
 
 DEFAULT_REDIRECT_LIMIT = 30
 CONTENT_CHUNK_SIZE = 10 * 1024
+DEFAULT_ENCODING_SAMPLE_SIZE = 64 * 1024
 ITER_CHUNK_SIZE = 512
 
 
+class JSONCodec:
+    """Serializes request bodies and parses response bodies as JSON.
+
+    The default codec uses the standard library's :mod:`json` module (or
+    ``simplejson`` when it is installed). Set a codec as
+    :attr:`Session.json_codec <requests.Session.json_codec>` to use another
+    JSON library, e.g. one that serializes straight to bytes::
+
+      >>> class OrjsonCodec(JSONCodec):
+      ...     def dumps(self, obj):
+      ...         return orjson.dumps(obj)
+      ...     def loads(self, s, **kwargs):
+      ...         return orjson.loads(s)
+      >>> s = requests.Session()
+      >>> s.json_codec = OrjsonCodec()
+
+    :param stream_threshold: (optional) Top-level arrays and objects with at
+        least this many items are serialized while the body is sent, item by
+        item, instead of up front. Such bodies are sent with chunked
+        transfer encoding, and errors in the payload (e.g. ``NaN``) only
+        surface while sending. Defaults to ``None`` (never).
+    """
+
+    def __init__(self, stream_threshold=None):
+        self.stream_threshold = stream_threshold
+
+    def dumps(self, obj):
+        """Returns ``obj`` serialized as JSON, as ``str`` or UTF-8 ``bytes``.
+
+        :raises ValueError: If ``obj`` cannot be represented in JSON.
+        """
+        return complexjson.dumps(obj, allow_nan=False)
+
+    def loads(self, s, **kwargs):
+        """Returns the Python object represented by the JSON document ``s``.
+
+        :raises json.JSONDecodeError: If ``s`` is not valid JSON.
+        """
+        return complexjson.loads(s, **kwargs)
+
+    def iterencode(self, obj):
+        """Yields ``obj`` serialized as JSON in pieces, one per item of a
+        top-level array or object, using :meth:`dumps` for each item. Object
+        members are dumped as their key and value apart, so that however
+        :meth:`dumps` lays out its output, the pieces join into valid JSON.
+
+        :rtype: iterator of str or bytes
+        """
+        if isinstance(obj, (list, tuple)):
+            yield "["
+            for i, item in enumerate(obj):
+                if i:
+                    yield ", "
+                yield self.dumps(item)
+            yield "]"
+        elif isinstance(obj, dict):
+            yield "{"
+            for i, (key, value) in enumerate(obj.items()):
+                if i:
+                    yield ", "
+                if not isinstance(key, str):
+                    # Converted to a string exactly as in a full dump, or
+                    # refused, whichever the codec does.
+                    (key,) = self.loads(self.dumps({key: None}))
+                yield self.dumps(key)
+                yield ": "
+                yield self.dumps(value)
+            yield "}"
+        else:
+            yield self.dumps(obj)
+
+
+DEFAULT_JSON_CODEC = JSONCodec()
+
+
+class JSONStreamBody:
+    """A JSON request body serialized while it is sent.
+
+    Iterating over it runs :meth:`JSONCodec.iterencode` afresh, so the body
+    can be sent again for redirects and authentication retries.
+    """
+
+    def __init__(self, codec, obj, chunk_size=64 * 1024):
+        self.codec = codec
+        self.obj = obj
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        pieces, size = [], 0
+        for piece in self.codec.iterencode(self.obj):
+            if not isinstance(piece, bytes):
+                piece = piece.encode("utf-8")
+            pieces.append(piece)
+            size += len(piece)
+            if size >= self.chunk_size:
+                yield b"".join(pieces)
+                pieces, size = [], 0
+        if pieces:
+            yield b"".join(pieces)
+
+
+def _is_streamable_file(fp):
+    """Whether a file part can be read lazily, from its current position.
+    Only files on disk are: one in memory would not save any."""
+    if isinstance(fp, TextIOBase):
+        return False
+    try:
+        # StringIO and BytesIO have seek but no usable fileno
+        fp.fileno()
+        fp.tell()
+        return fp.seekable()
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+class MultipartBody:
+    """A multipart/form-data request body that reads its file parts on
+    demand instead of holding them in memory.
+
+    Each file is read from the position it was at when the body was built,
+    for the number of bytes :func:`super_len <requests.utils.super_len>`
+    reported then. The body is seekable, so it can be rewound for
+    redirects and retries.
+
+    :param fields: Fields as accepted by urllib3's ``encode_multipart_formdata``;
+        file parts hold the file object as their data.
+    :param boundary: (optional) The boundary string to use.
+    """
+
+    def __init__(self, fields, boundary=None):
+        if boundary is None:
+            boundary = choose_boundary()
+        self.boundary = boundary
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+
+        #: List of ``(offset, length, data)`` parts, where data is either
+        #: bytes or a ``(fileobj, start)`` tuple.
+        self._parts = []
+        self._length = 0
+        pending = []
+        for field in iter_field_objects(fields):
+            pending.append(f"--{boundary}\r\n".encode("latin-1"))
+            pending.append(field.render_headers().encode("utf-8"))
+            data = field.data
+            if isinstance(data, int):
+                data = str(data)  # Backwards compatibility
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            if hasattr(data, "read"):
+                self._add_part(b"".join(pending))
+                pending = []
+                self._add_part((data, data.tell()), super_len(data))
+            else:
+                pending.append(data)
+            pending.append(b"\r\n")
+        pending.append(f"--{boundary}--\r\n".encode("latin-1"))
+        self._add_part(b"".join(pending))
+
+        self._offsets = [offset for offset, _, _ in self._parts]
+        self._pos = 0
+
+    def _add_part(self, data, length=None):
+        if length is None:
+            length = len(data)
+        if length:
+            self._parts.append((self._length, length, data))
+            self._length += length
+
+    def __len__(self):
+        return self._length
+
+    def tell(self):
+        return self._pos
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self._length
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._pos = offset
+        return offset
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._length - self._pos
+        chunks = []
+        while size > 0 and self._pos < self._length:
+            index = bisect_right(self._offsets, self._pos) - 1
+            offset, length, data = self._parts[index]
+            start = self._pos - offset
+            count = min(size, length - start)
+            if isinstance(data, bytes):
+                chunk = data[start : start + count]
+            else:
+                fp, fp_start = data
+                fp.seek(fp_start + start)
+                chunk = fp.read(count)
+                if not chunk:
+                    # The file shrank since the body was built.
+                    break
+            chunks.append(chunk)
+            self._pos += len(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+
 class RequestEncodingMixin:
     @property
     def path_url(self):
@@ -142,6 +368,10 @@ class RequestEncodingMixin:
         if parameters are supplied as a dict.
         The tuples may be 2-tuples (filename, fileobj), 3-tuples (filename, fileobj, contentype)
         or 4-tuples (filename, fileobj, contentype, custom_headers).
+
+        If any file object is a seekable binary file on disk, the body is
+        returned as a :class:`MultipartBody` that streams the files instead
+        of bytes.
         """
         if not files:
             raise ValueError("Files must be provided.")
@@ -170,6 +400,7 @@ class RequestEncodingMixin:
                         )
                     )
 
+        streamed = False
         for k, v in files:
             # support for explicit filename
             ft = None
@@ -188,7 +419,11 @@ class RequestEncodingMixin:
             if isinstance(fp, (str, bytes, bytearray)):
                 fdata = fp
             elif hasattr(fp, "read"):
-                fdata = fp.read()
+                if _is_streamable_file(fp):
+                    fdata = fp
+                    streamed = True
+                else:
+                    fdata = fp.read()
             elif fp is None:
                 continue
             else:
@@ -198,6 +433,10 @@ class RequestEncodingMixin:
             rf.make_multipart(content_type=ft)
             new_fields.append(rf)
 
+        if streamed:
+            body = MultipartBody(new_fields)
+            return body, body.content_type
+
         body, content_type = encode_multipart_formdata(new_fields)
 
         return body, content_type
@@ -341,12 +580,20 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
         # The `CookieJar` used to create the Cookie header will be stored here
         # after prepare_cookies is called
         self._cookies = None
-        #: request body to send to the server.
+        #: request body to send to the server. A multipart upload of a file
+        #: on disk is a :class:`MultipartBody`, read as it is sent.
         self.body = None
         #: dictionary of callback hooks, for internal usage.
         self.hooks = default_hooks()
         #: integer denoting starting position of a readable file-like body.
         self._body_position = None
+        # Session headers already passed through check_header_validity, set
+        # by the Session before prepare is called.
+        self._validated_headers = None
+        # JSONCodec for the json argument of prepare, set by the Session.
+        self._json_codec = None
+        # time.monotonic() when the Session fired pre_send for this request.
+        self._sent_at = None
 
     def prepare(
         self,
@@ -483,6 +730,21 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
     def prepare_headers(self, headers):
         """Prepares the given HTTP headers."""
 
+        validated = self._validated_headers
+        if (
+            validated is not None
+            and isinstance(headers, CaseInsensitiveOverlay)
+            and headers.base is validated
+            and all(isinstance(name, str) for name, _ in headers.own_items())
+        ):
+            # Session headers are validated once, when they change, so only
+            # the headers layered over them by this request are checked.
+            for header in headers.own_items():
+                # Raise exception on invalid header value.
+                check_header_validity(header)
+            self.headers = headers.copy()
+            return
+
         self.headers = CaseInsensitiveDict()
         if headers:
             for header in headers.items():
@@ -505,14 +767,25 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
             # urllib3 requires a bytes-like body. Python 2's json.dumps
             # provides this natively, but Python 3 gives a Unicode string.
             content_type = "application/json"
+            codec = self._json_codec or DEFAULT_JSON_CODEC
+            threshold = getattr(codec, "stream_threshold", None)
+
+            if (
+                threshold is not None
+                and isinstance(json, (list, tuple, dict))
+                and len(json) >= threshold
+            ):
+                # Without a length, the adapter sends this chunked.
+                body = JSONStreamBody(codec, json)
+            else:
+                try:
+                    body = codec.dumps(json)
+                except ValueError as ve:
+                    raise InvalidJSONError(ve, request=self)
 
-            try:
-                body = complexjson.dumps(json, allow_nan=False)
-            except ValueError as ve:
-                raise InvalidJSONError(ve, request=self)
-
-            if not isinstance(body, bytes):
-                body = body.encode("utf-8")
+                # Codecs that produce bytes save a copy here.
+                if not isinstance(body, bytes):
+                    body = body.encode("utf-8")
 
         is_stream = all(
             [
@@ -553,6 +826,9 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
             # Multi-part file uploads.
             if files:
                 (body, content_type) = self._encode_files(files, data)
+                if isinstance(body, MultipartBody):
+                    # Allow the body to be rewound for redirects.
+                    self._body_position = body.tell()
             else:
                 if data:
                     body = self._encode_params(data)
@@ -637,6 +913,135 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
             self.register_hook(event, hooks[event])
 
 
+class RequestTemplate:
+    """A reusable, pre-validated template for sending the same kind of
+    request many times.
+
+    The method, URL (including IDNA encoding and requoting), headers and
+    static authentication are prepared once, when the template is created.
+    Each call to :meth:`prepare` only encodes the values that vary between
+    sends (extra query parameters, per-request headers, cookies and the
+    body) on top of that cached state.
+
+    Authentication handlers other than :class:`HTTPBasicAuth
+    <requests.auth.HTTPBasicAuth>` and :class:`HTTPProxyAuth
+    <requests.auth.HTTPProxyAuth>` may keep per-request state (e.g.
+    :class:`HTTPDigestAuth <requests.auth.HTTPDigestAuth>`), so they are still
+    applied on every :meth:`prepare` call.
+
+    Usage::
+
+      >>> import requests
+      >>> s = requests.Session()
+      >>> tmpl = s.prepare_template(requests.Request('GET', 'https://httpbin.org/get'))
+      >>> s.send(tmpl.prepare(params={'page': 2}))
+      <Response [200]>
+    """
+
+    def __init__(
+        self,
+        method=None,
+        url=None,
+        headers=None,
+        params=None,
+        auth=None,
+        cookies=None,
+        hooks=None,
+    ):
+        base = PreparedRequest()
+        base.prepare_method(method)
+        base.prepare_url(url, params)
+        base.prepare_headers(headers)
+
+        # If no Auth is explicitly provided, extract it from the URL first.
+        if auth is None:
+            url_auth = get_auth_from_url(base.url)
+            auth = url_auth if any(url_auth) else None
+        if isinstance(auth, tuple) and len(auth) == 2:
+            auth = HTTPBasicAuth(*auth)
+
+        # Basic credentials only ever set a header, so bake them in once.
+        if type(auth) in (HTTPBasicAuth, HTTPProxyAuth):
+            auth(base)
+            auth = None
+
+        self.method = base.method
+        self.url = base.url
+        self.headers = base.headers
+        self.auth = auth
+        self.hooks = hooks or {}
+        # Cookie sources merged (in order) into the jar of every request.
+        self._cookie_layers = (cookies,)
+        self._json_codec = None
+
+    def __repr__(self):
+        return f"<RequestTemplate [{self.method}]>"
+
+    def _url_with_params(self, params):
+        if isinstance(params, (str, bytes)):
+            params = to_native_string(params)
+
+        enc_params = RequestEncodingMixin._encode_params(params)
+        if not enc_params:
+            return self.url
+
+        # Non-HTTP schemes are left untouched, as in prepare_url.
+        if ":" in self.url and not self.url.lower().startswith("http"):
+            return self.url
+
+        # The cached URL is already fully quoted, so only the new query
+        # parameters need to go through requote_uri.
+        url, sep, fragment = self.url.partition("#")
+        url += "&" if "?" in url else "?"
+        url += requote_uri(enc_params)
+        if sep:
+            url += f"#{fragment}"
+        return url
+
+    def prepare(
+        self, params=None, data=None, files=None, json=None, headers=None, cookies=None
+    ):
+        """Constructs a :class:`PreparedRequest <PreparedRequest>` from the
+        template, filling in the given per-request values.
+
+        :param params: (optional) Extra URL parameters, appended to those of
+            the template.
+        :param data: (optional) The body to attach to the request.
+        :param files: (optional) Dictionary of files to multipart upload.
+        :param json: (optional) json for the body to attach to the request.
+        :param headers: (optional) Extra headers for this request only. A
+            value of ``None`` removes a header set by the template.
+        :param cookies: (optional) Dict or CookieJar of extra cookies.
+        :rtype: requests.PreparedRequest
+        """
+        p = PreparedRequest()
+        p.method = self.method
+        p.url = self._url_with_params(params)
+        p.headers = self.headers.copy()
+        if headers:
+            for header in headers.items():
+                name, value = header
+                if value is None:
+                    p.headers.pop(name, None)
+                    continue
+                # Raise exception on invalid header value.
+                check_header_validity(header)
+                p.headers[to_native_string(name)] = value
+
+        jar = cookiejar_from_dict({})
+        for layer in self._cookie_layers + (cookies,):
+            if layer:
+                merge_cookies(jar, layer)
+        p.prepare_cookies(jar)
+
+        p._json_codec = self._json_codec
+        p.prepare_body(data, files, json)
+        if self.auth is not None:
+            p.prepare_auth(self.auth, p.url)
+        p.prepare_hooks(self.hooks)
+        return p
+
+
 class Response:
     """The :class:`Response <Response>` object, which contains a
     server's response to an HTTP request.
@@ -653,6 +1058,7 @@ class Response:
         "cookies",
         "elapsed",
         "request",
+        "encoding_sample_size",
     ]
 
     def __init__(self):
@@ -679,6 +1085,13 @@ class Response:
         #: Encoding to decode with when accessing r.text.
         self.encoding = None
 
+        #: Number of leading bytes of the body that charset detection looks
+        #: at when no encoding is set. ``None`` examines the whole body.
+        self.encoding_sample_size = DEFAULT_ENCODING_SAMPLE_SIZE
+        self._apparent_encoding = None
+        # JSONCodec used by json(), set by the Session.
+        self._json_codec = None
+
         #: A list of :class:`Response <Response>` objects from
         #: the history of the Request. Any redirect responses will end
         #: up here. The list is sorted from the oldest to the most recent request.
@@ -788,15 +1201,24 @@ class Response:
 
     @property
     def apparent_encoding(self):
-        """The apparent encoding, provided by the charset_normalizer or chardet libraries."""
-        if chardet is not None:
-            return chardet.detect(self.content)["encoding"]
-        else:
-            # If no character detection library is available, we'll fall back
-            # to a standard Python utf-8 str.
-            return "utf-8"
+        """The apparent encoding, provided by the charset_normalizer or chardet libraries.
+
+        Bodies starting with a byte order mark, or holding ASCII or valid
+        UTF-8, skip the detection libraries entirely. Anything else is
+        detected from the first :attr:`encoding_sample_size` bytes. The
+        result is cached for as long as :attr:`content` is unchanged.
+        """
+        content = self.content
+        cached = getattr(self, "_apparent_encoding", None)
+        if cached is not None and cached[0] is content:
+            return cached[1]
+        encoding = detect_encoding(
+            content, getattr(self, "encoding_sample_size", None)
+        )
+        self._apparent_encoding = (content, encoding)
+        return encoding
 
-    def iter_content(self, chunk_size=1, decode_unicode=False):
+    def iter_content(self, chunk_size=1, decode_unicode=False, reuse_buffer=False):
         """Iterates over the response data.  When stream=True is set on the
         request, this avoids reading the content at once into memory for
         large responses.  The chunk size is the number of bytes it should
@@ -811,13 +1233,43 @@ class Response:
 
         If decode_unicode is True, content will be decoded using the best
         available encoding based on the response.
+
+        If reuse_buffer is True, ``memoryview`` objects are returned instead
+        of bytes. When the body isn't content-encoded, they are views into a
+        single buffer of chunk_size bytes that is filled with ``readinto``, so
+        a view is only valid until the next chunk is requested; copy it
+        (e.g. with ``bytes(view)``) to keep it. A chunk_size is required in
+        this mode.
         """
 
+        def read_into():
+            # Fill one buffer over and over instead of allocating a new
+            # bytes object per chunk.
+            buffer = bytearray(chunk_size)
+            view = memoryview(buffer)
+            while True:
+                size = self.raw.readinto(buffer)
+                if not size:
+                    break
+                yield view[:size]
+
+        # urllib3 only decodes gzip/deflate/etc. in read() and stream(), so
+        # encoded bodies can't be read with readinto.
+        use_readinto = (
+            reuse_buffer
+            and hasattr(self.raw, "readinto")
+            and self.headers.get("content-encoding", "identity").lower()
+            == "identity"
+        )
+
         def generate():
             # Special case for urllib3.
             if hasattr(self.raw, "stream"):
                 try:
-                    yield from self.raw.stream(chunk_size, decode_content=True)
+                    if use_readinto:
+                        yield from read_into()
+                    else:
+                        yield from self.raw.stream(chunk_size, decode_content=True)
                 except ProtocolError as e:
                     raise ChunkedEncodingError(e)
                 except DecodeError as e:
@@ -826,6 +1278,8 @@ class Response:
                     raise ConnectionError(e)
                 except SSLError as e:
                     raise RequestsSSLError(e)
+            elif use_readinto:
+                yield from read_into()
             else:
                 # Standard file-like object.
                 while True:
@@ -836,18 +1290,35 @@ class Response:
 
             self._content_consumed = True
 
+            request = self.request
+            if request is not None and getattr(request, "hooks", None):
+                try:
+                    size = self.raw.tell()
+                except (AttributeError, OSError, ValueError):
+                    size = None
+                dispatch_event(
+                    "body_complete", request.hooks, request, response=self, size=size
+                )
+
         if self._content_consumed and isinstance(self._content, bool):
             raise StreamConsumedError()
         elif chunk_size is not None and not isinstance(chunk_size, int):
             raise TypeError(
                 f"chunk_size must be an int, it is instead a {type(chunk_size)}."
             )
-        # simulate reading small chunks of the content
-        reused_chunks = iter_slices(self._content, chunk_size)
-
-        stream_chunks = generate()
-
-        chunks = reused_chunks if self._content_consumed else stream_chunks
+        elif reuse_buffer and (chunk_size is None or chunk_size < 1):
+            raise ValueError("chunk_size must be a positive int with reuse_buffer.")
+
+        if self._content_consumed:
+            # simulate reading small chunks of the content
+            content = self._content
+            if reuse_buffer:
+                content = memoryview(content)
+            chunks = iter_slices(content, chunk_size)
+        else:
+            chunks = generate()
+            if reuse_buffer and not use_readinto:
+                chunks = map(memoryview, chunks)
 
         if decode_unicode:
             chunks = stream_decode_response_unicode(chunks, self)
@@ -861,31 +1332,52 @@ class Response:
         stream=True is set on the request, this avoids reading the
         content at once into memory for large responses.
 
+        A line that spans several chunks is only joined once it is
+        complete. For large bodies, a chunk_size well above the default
+        (e.g. 64 KiB) greatly reduces per-chunk overhead.
+
         .. note:: This method is not reentrant safe.
         """
 
-        pending = None
+        # Pieces of an unterminated line, joined once the line is complete.
+        pending = []
 
         for chunk in self.iter_content(
             chunk_size=chunk_size, decode_unicode=decode_unicode
         ):
-            if pending is not None:
-                chunk = pending + chunk
+            if not chunk:
+                continue
+            empty = chunk[:0]
+
+            if pending and delimiter and len(delimiter) > 1:
+                # A multi-character delimiter may straddle the two chunks.
+                overlap = len(delimiter) - 1
+                tail = empty.join(pending[-overlap:])[-overlap:]
+                if delimiter in tail + chunk[:overlap]:
+                    chunk = empty.join(pending) + chunk
+                    pending = []
 
             if delimiter:
                 lines = chunk.split(delimiter)
             else:
                 lines = chunk.splitlines()
 
-            if lines and lines[-1] and chunk and lines[-1][-1] == chunk[-1]:
-                pending = lines.pop()
+            if lines and lines[-1] and lines[-1][-1] == chunk[-1]:
+                tail = lines.pop()
             else:
-                pending = None
+                tail = None
+
+            if pending and lines:
+                pending.append(lines[0])
+                lines[0] = empty.join(pending)
+                pending = []
+            if tail is not None:
+                pending.append(tail)
 
             yield from lines
 
-        if pending is not None:
-            yield pending
+        if pending:
+            yield pending[0][:0].join(pending)
 
     @property
     def content(self):
@@ -911,7 +1403,8 @@ class Response:
         """Content of the response, in unicode.
 
         If Response.encoding is None, encoding will be guessed using
-        ``charset_normalizer`` or ``chardet``.
+        :attr:`apparent_encoding`, which falls back to ``charset_normalizer``
+        or ``chardet``.
 
         The encoding of the response content is determined based solely on HTTP
         headers, following RFC 2616 to the letter. If you can take advantage of
@@ -944,16 +1437,86 @@ class Response:
 
         return content
 
-    def json(self, **kwargs):
+    def _iter_json_text(self, chunk_size):
+        """Iterates over the response body as text for incremental JSON
+        decoding, detecting the UTF codec from the first bytes when no
+        encoding is set.
+        """
+        chunks = self.iter_content(chunk_size)
+        encoding = self.encoding
+        if not encoding:
+            head = b""
+            for chunk in chunks:
+                head += chunk
+                if len(head) > 3:
+                    break
+            encoding = guess_json_utf(head) or "utf-8"
+            chunks = chain((head,), chunks)
+
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+
+    def iter_json(self, chunk_size=CONTENT_CHUNK_SIZE, **kwargs):
+        r"""Iterates over the JSON values in the response body, decoding
+        them as the data arrives. When stream=True is set on the request,
+        this avoids reading the whole body into memory.
+
+        A body holding a JSON array yields its elements one at a time. Any
+        other body, or one served as ``application/x-ndjson`` or
+        ``application/jsonl``, is read as a sequence of whitespace separated
+        values, such as newline-delimited JSON (NDJSON).
+
+        :param chunk_size: Number of bytes to read from the body at a time.
+        :param \*\*kwargs: Optional arguments that ``json.loads`` takes.
+        :raises requests.exceptions.JSONDecodeError: If the response body does not
+            contain valid json.
+        """
+        cls = kwargs.pop("cls", None) or complexjson.JSONDecoder
+        content_type = self.headers.get("content-type", "")
+        unwrap_array = not ("ndjson" in content_type or "jsonl" in content_type)
+        values = stream_decode_json(
+            self._iter_json_text(chunk_size), cls(**kwargs), unwrap_array
+        )
+        try:
+            yield from values
+        except JSONDecodeError as e:
+            raise RequestsJSONDecodeError(e.msg, e.doc, e.pos)
+
+    def json(self, *, stream=False, **kwargs):
         r"""Decodes the JSON response body (if any) as a Python object.
 
         This may return a dictionary, list, etc. depending on what is in the response.
 
+        :param stream: (optional) Whether to decode the body incrementally
+            while it is read, instead of decoding :attr:`content` in one go.
+            The elements of a top-level array or object are decoded one by
+            one, which keeps memory flat for large bodies. Undecodable bytes
+            are replaced rather than retried with another codec. Streaming
+            always uses the standard library decoder rather than the
+            session's :class:`JSONCodec`.
         :param \*\*kwargs: Optional arguments that ``json.loads`` takes.
         :raises requests.exceptions.JSONDecodeError: If the response body does not
             contain valid json.
         """
 
+        if stream:
+            cls = kwargs.pop("cls", None) or complexjson.JSONDecoder
+            text = self._iter_json_text(CONTENT_CHUNK_SIZE)
+            try:
+                return stream_load_json(text, cls(**kwargs))
+            except JSONDecodeError as e:
+                raise RequestsJSONDecodeError(e.msg, e.doc, e.pos)
+
+        codec = getattr(self, "_json_codec", None) or DEFAULT_JSON_CODEC
         if not self.encoding and self.content and len(self.content) > 3:
             # No encoding set. JSON RFC 4627 section 3 states we should expect
             # UTF-8, -16 or -32. Detect which one to use; If the detection or
@@ -962,7 +1525,7 @@ class Response:
             encoding = guess_json_utf(self.content)
             if encoding is not None:
                 try:
-                    return complexjson.loads(self.content.decode(encoding), **kwargs)
+                    return codec.loads(self.content.decode(encoding), **kwargs)
                 except UnicodeDecodeError:
                     # Wrong UTF codec detected; usually because it's not UTF-8
                     # but some other 8-bit codec.  This is an RFC violation,
@@ -973,7 +1536,7 @@ class Response:
                     raise RequestsJSONDecodeError(e.msg, e.doc, e.pos)
 
         try:
-            return complexjson.loads(self.text, **kwargs)
+            return codec.loads(self.text, **kwargs)
         except JSONDecodeError as e:
             # Catch JSON-related errors and raise as requests.JSONDecodeError
             # This aliases json.JSONDecodeError and simplejson.JSONDecodeError
@@ -7,6 +7,7 @@ requests (cookies, auth, proxies).
 """
 import os
 import sys
+import threading
 import time
 from collections import OrderedDict
 from datetime import timedelta
@@ -14,7 +15,7 @@ from datetime import timedelta
 from ._internal_utils import to_native_string
 from .adapters import HTTPAdapter
 from .auth import _basic_auth_str
-from .compat import Mapping, cookielib, urljoin, urlparse
+from .compat import Callable, Mapping, cookielib, urljoin, urlparse
 from .cookies import (
     RequestsCookieJar,
     cookiejar_from_dict,
@@ -27,19 +28,22 @@ from .exceptions import (
     InvalidSchema,
     TooManyRedirects,
 )
-from .hooks import default_hooks, dispatch_hook
+from .hooks import default_hooks, dispatch_event, dispatch_hook
 
 # formerly defined here, reexposed here for backward compatibility
 from .models import (  # noqa: F401
+    DEFAULT_ENCODING_SAMPLE_SIZE,
     DEFAULT_REDIRECT_LIMIT,
     REDIRECT_STATI,
     PreparedRequest,
     Request,
+    RequestTemplate,
 )
 from .status_codes import codes
-from .structures import CaseInsensitiveDict
+from .structures import CaseInsensitiveDict, CaseInsensitiveOverlay
 from .utils import (  # noqa: F401
     DEFAULT_PORTS,
+    check_header_validity,
     default_headers,
     get_auth_from_url,
     get_environ_proxies,
@@ -91,16 +95,102 @@ def merge_setting(request_setting, session_setting, dict_class=OrderedDict):
 def merge_hooks(request_hooks, session_hooks, dict_class=OrderedDict):
     """Properly merges both requests and session hooks.
 
-    This is necessary because when request_hooks == {'response': []}, the
-    merge breaks Session hooks entirely.
+    This is necessary because requests carry an empty list for every event
+    (e.g. {'response': []}), which would otherwise replace the Session's
+    hooks for that event. Events are merged one by one; hooks set on the
+    request replace the Session's hooks for the same event.
     """
-    if session_hooks is None or session_hooks.get("response") == []:
+    if session_hooks is None:
         return request_hooks
 
-    if request_hooks is None or request_hooks.get("response") == []:
+    if request_hooks is None:
         return session_hooks
 
-    return merge_setting(request_hooks, session_hooks, dict_class)
+    merged = dict_class(session_hooks)
+    for event, hooks in request_hooks.items():
+        if hooks:
+            merged[event] = hooks
+    return merged
+
+
+class RedirectCache:
+    """A bounded cache of permanent (301 and 308) redirects.
+
+    Set an instance as :attr:`Session.redirect_cache` to have the session
+    send requests straight to the cached target of a URL, skipping the
+    redirect round-trip. Entries expire after ``ttl`` seconds, and the least
+    recently used ones are dropped beyond ``max_size`` entries. A 301 is not
+    applied to POST requests, which it would have turned into GETs, nor to
+    requests sent with ``allow_redirects=False``.
+
+    Responses served this way have no redirect history.
+
+    :param max_size: (optional) Maximum number of cached redirects.
+    :param ttl: (optional) Lifetime of an entry, in seconds.
+    """
+
+    def __init__(self, max_size=256, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        #: Number of requests rewritten from the cache.
+        self.hits = 0
+        #: Number of requests looked up without a cached redirect.
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"max_size": self.max_size, "ttl": self.ttl}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, url, target, status_code):
+        """Records that url permanently redirects to target."""
+        with self._lock:
+            self._entries.pop(url, None)
+            self._entries[url] = (target, status_code, time.monotonic() + self.ttl)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def resolve(self, url, method):
+        """Returns the final cached target for a request, or None.
+
+        :rtype: str
+        """
+        now = time.monotonic()
+        seen = {url}
+        target = url
+        with self._lock:
+            while True:
+                entry = self._entries.get(target)
+                if entry is None:
+                    break
+                if entry[2] <= now:
+                    del self._entries[target]
+                    break
+                if entry[1] == codes.moved and method == "POST":
+                    break
+                self._entries.move_to_end(target)
+                target = entry[0]
+                if target in seen:
+                    # A redirect loop; let the server report it.
+                    target = url
+                    break
+                seen.add(target)
+
+            if target == url:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return target
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
 
 
 class SessionRedirectMixin:
@@ -218,6 +308,13 @@ class SessionRedirectMixin:
 
             prepared_request.url = to_native_string(url)
 
+            redirect_cache = getattr(self, "redirect_cache", None)
+            if redirect_cache is not None and resp.status_code in (
+                codes.moved,
+                codes.permanent_redirect,
+            ):
+                redirect_cache.add(req.url, prepared_request.url, resp.status_code)
+
             self.rebuild_method(prepared_request, resp)
 
             # https://github.com/psf/requests/issues/1084
@@ -330,6 +427,39 @@ class SessionRedirectMixin:
 
         return new_proxies
 
+    def follow_cached_redirect(self, prepared_request, proxies):
+        """Points a request at the target of a cached permanent redirect,
+        updating its cookies, and its auth and proxies when the origin
+        changes. Returns the request to send and the proxies to use.
+
+        :rtype: tuple
+        """
+        url = prepared_request.url
+        target = self.redirect_cache.resolve(url, prepared_request.method)
+        if target is None:
+            return prepared_request, proxies
+
+        prepared_request = prepared_request.copy()
+        prepared_request.url = target
+        headers = prepared_request.headers
+        if prepared_request._cookies is not None:
+            headers.pop("Cookie", None)
+            prepared_request.prepare_cookies(prepared_request._cookies)
+
+        old_parsed, new_parsed = urlparse(url), urlparse(target)
+        if (old_parsed.scheme, old_parsed.netloc) != (
+            new_parsed.scheme,
+            new_parsed.netloc,
+        ):
+            if "Authorization" in headers and self.should_strip_auth(url, target):
+                del headers["Authorization"]
+            new_auth = get_netrc_auth(target) if self.trust_env else None
+            if new_auth is not None:
+                prepared_request.prepare_auth(new_auth)
+            proxies = self.rebuild_proxies(prepared_request, proxies)
+
+        return prepared_request, proxies
+
     def rebuild_method(self, prepared_request, response):
         """When being redirected we may want to change the method of the request
         based on certain specs or browser behavior.
@@ -385,6 +515,9 @@ class Session(SessionRedirectMixin):
         "stream",
         "trust_env",
         "max_redirects",
+        "encoding_sample_size",
+        "redirect_cache",
+        "json_codec",
     ]
 
     def __init__(self):
@@ -437,6 +570,26 @@ class Session(SessionRedirectMixin):
         #: authentication and similar.
         self.trust_env = True
 
+        #: Number of leading bytes of a response body that charset detection
+        #: examines when the server did not declare an encoding. Bodies with
+        #: a byte order mark, or that are valid UTF-8, are never sampled.
+        #: Set to ``None`` to run detection over the whole body.
+        self.encoding_sample_size = DEFAULT_ENCODING_SAMPLE_SIZE
+
+        #: Optional :class:`RedirectCache` of permanent redirects. When set,
+        #: requests for a URL known to redirect permanently are sent to the
+        #: target directly. Defaults to ``None`` (disabled).
+        self.redirect_cache = None
+
+        #: :class:`JSONCodec <requests.models.JSONCodec>` that serializes
+        #: ``json=`` request bodies and parses :meth:`Response.json` bodies.
+        #: Defaults to ``None``, which uses the standard library's json
+        #: module.
+        self.json_codec = None
+
+        # Validated session headers, rebuilt whenever self.headers changes.
+        self._headers_cache = None
+
         #: A CookieJar containing all currently outstanding cookies set on this
         #: session. By default it is a
         #: :class:`RequestsCookieJar <requests.cookies.RequestsCookieJar>`, but
@@ -454,6 +607,62 @@ class Session(SessionRedirectMixin):
     def __exit__(self, *args):
         self.close()
 
+    def _session_headers(self):
+        """Returns the session headers with ``None`` values removed, each
+        checked by :func:`check_header_validity`, and whether all of their
+        names are native strings.
+
+        The result is cached until :attr:`headers` is modified or replaced.
+        Headers that are not a :class:`CaseInsensitiveDict` cannot report
+        changes, so they are validated on every call.
+
+        :rtype: tuple
+        """
+        headers = self.headers
+        generation = getattr(headers, "_generation", None)
+        cached = self._headers_cache
+        if cached is not None and cached[0] is headers and cached[1] == generation:
+            return cached[2:]
+
+        validated = CaseInsensitiveDict()
+        native = True
+        for header in to_key_val_list(headers):
+            if header[1] is not None:
+                # Raise exception on invalid header value.
+                check_header_validity(header)
+                validated[header[0]] = header[1]
+                native = native and isinstance(header[0], str)
+        if generation is not None:
+            self._headers_cache = (headers, generation, validated, native)
+        return validated, native
+
+    def _merge_headers(self, request_headers):
+        """Merges the headers of a request with those of the session, as
+        :func:`merge_setting` would.
+
+        The request's headers are layered over the cached session headers
+        without copying them.
+
+        :returns: the merged headers, and the validated session headers they
+            are layered over if those can be sent as they are, or ``None``.
+        """
+        if not (
+            isinstance(self.headers, Mapping) and isinstance(request_headers, Mapping)
+        ):
+            merged = merge_setting(
+                request_headers, self.headers, dict_class=CaseInsensitiveDict
+            )
+            return merged, None
+
+        session_headers, native = self._session_headers()
+        merged = CaseInsensitiveOverlay(session_headers)
+        for name, value in to_key_val_list(request_headers):
+            if value is None:
+                merged.pop(name, None)
+            else:
+                merged[name] = value
+        return merged, session_headers if native else None
+
     def prepare_request(self, request):
         """Constructs a :class:`PreparedRequest <PreparedRequest>` for
         transmission and returns it. The :class:`PreparedRequest` has settings
@@ -480,16 +689,18 @@ class Session(SessionRedirectMixin):
         if self.trust_env and not auth and not self.auth:
             auth = get_netrc_auth(request.url)
 
+        headers, validated_headers = self._merge_headers(request.headers)
+
         p = PreparedRequest()
+        p._validated_headers = validated_headers
+        p._json_codec = self.json_codec
         p.prepare(
             method=request.method.upper(),
             url=request.url,
             files=request.files,
             data=request.data,
             json=request.json,
-            headers=merge_setting(
-                request.headers, self.headers, dict_class=CaseInsensitiveDict
-            ),
+            headers=headers,
             params=merge_setting(request.params, self.params),
             auth=merge_setting(auth, self.auth),
             cookies=merged_cookies,
@@ -497,6 +708,43 @@ class Session(SessionRedirectMixin):
         )
         return p
 
+    def prepare_template(self, request):
+        """Constructs a :class:`RequestTemplate <RequestTemplate>` from the
+        given :class:`Request <Request>` and the settings of this
+        :class:`Session`.
+
+        Headers, params, auth and hooks are merged once, when the template is
+        built. Cookies are merged every time the template is prepared, so
+        cookies the session receives later are still sent. The body of
+        ``request`` is ignored; pass it to :meth:`RequestTemplate.prepare`
+        instead.
+
+        :param request: :class:`Request` instance to build the template from.
+        :rtype: requests.models.RequestTemplate
+        """
+        cookies = request.cookies or {}
+
+        # Bootstrap CookieJar.
+        if not isinstance(cookies, cookielib.CookieJar):
+            cookies = cookiejar_from_dict(cookies)
+
+        # Set environment's basic authentication if not explicitly set.
+        auth = request.auth
+        if self.trust_env and not auth and not self.auth:
+            auth = get_netrc_auth(request.url)
+
+        template = RequestTemplate(
+            method=request.method.upper(),
+            url=request.url,
+            headers=self._merge_headers(request.headers)[0],
+            params=merge_setting(request.params, self.params),
+            auth=merge_setting(auth, self.auth),
+            hooks=merge_hooks(request.hooks, self.hooks),
+        )
+        template._cookie_layers = (self.cookies, cookies)
+        template._json_codec = self.json_codec
+        return template
+
     def request(
         self,
         method,
@@ -690,12 +938,24 @@ class Session(SessionRedirectMixin):
 
         # Set up variables needed for resolve_redirects and dispatching of hooks
         allow_redirects = kwargs.pop("allow_redirects", True)
+
+        # Callers not following redirects expect to get them back as sent.
+        if allow_redirects and self.redirect_cache is not None:
+            request, kwargs["proxies"] = self.follow_cached_redirect(
+                request, kwargs["proxies"]
+            )
+
         stream = kwargs.get("stream")
         hooks = request.hooks
 
         # Get the appropriate adapter to use
         adapter = self.get_adapter(url=request.url)
 
+        request._sent_at = time.monotonic()
+        length = request.headers.get("Content-Length")
+        size = int(length) if length and length.isdigit() else None
+        dispatch_event("pre_send", hooks, request, size=size)
+
         # Start time (approximately) of the request
         start = preferred_clock()
 
@@ -705,6 +965,8 @@ class Session(SessionRedirectMixin):
         # Total elapsed time of the request (approximately)
         elapsed = preferred_clock() - start
         r.elapsed = timedelta(seconds=elapsed)
+        r.encoding_sample_size = self.encoding_sample_size
+        r._json_codec = self.json_codec
 
         # Response manipulation hooks
         r = dispatch_hook("response", hooks, r, **kwargs)
@@ -812,8 +1074,100 @@ class Session(SessionRedirectMixin):
         return state
 
     def __setstate__(self, state):
+        state.setdefault("encoding_sample_size", DEFAULT_ENCODING_SAMPLE_SIZE)
+        state.setdefault("redirect_cache", None)
+        state.setdefault("json_codec", None)
         for attr, value in state.items():
             setattr(self, attr, value)
+        self._headers_cache = None
+
+
+class ThreadSafeSession(Session):
+    """A :class:`Session` that can be shared by many threads, so that a
+    whole process can use a single set of connection pools.
+
+    Requests are prepared under :attr:`lock`, since preparation reads the
+    session's headers, params, auth, hooks and cookies. Hold the same lock
+    when changing those settings while the session is in use. Adapters and
+    hooks are replaced copy-on-write, so looking them up never races with
+    :meth:`mount` or :meth:`register_hook`. Cookies received by concurrent
+    requests are stored under the cookie jar's own lock.
+
+    Usage::
+
+      >>> import requests
+      >>> s = requests.ThreadSafeSession()
+      >>> with s.lock:
+      ...     s.headers['X-Token'] = 'secret'
+    """
+
+    def __init__(self):
+        #: Lock guarding the session settings.
+        self.lock = threading.RLock()
+        super().__init__()
+
+    def __setstate__(self, state):
+        self.lock = threading.RLock()
+        super().__setstate__(state)
+
+    def prepare_request(self, request):
+        with self.lock:
+            return super().prepare_request(request)
+
+    def prepare_template(self, request):
+        with self.lock:
+            return super().prepare_template(request)
+
+    def merge_environment_settings(self, url, proxies, stream, verify, cert):
+        with self.lock:
+            return super().merge_environment_settings(
+                url, proxies, stream, verify, cert
+            )
+
+    def mount(self, prefix, adapter):
+        """Registers a connection adapter to a prefix.
+
+        Adapters are sorted in descending order by prefix length.
+        """
+        with self.lock:
+            adapters = OrderedDict(self.adapters)
+            adapters[prefix] = adapter
+            keys_to_move = [k for k in adapters if len(k) < len(prefix)]
+
+            for key in keys_to_move:
+                adapters[key] = adapters.pop(key)
+            self.adapters = adapters
+
+    def register_hook(self, event, hook):
+        """Registers a session hook for the given event."""
+        if event not in self.hooks:
+            raise ValueError(f'Unsupported event specified, with event name "{event}"')
+
+        if isinstance(hook, Callable):
+            hook = [hook]
+        elif hasattr(hook, "__iter__"):
+            hook = [h for h in hook if isinstance(h, Callable)]
+        else:
+            return
+
+        with self.lock:
+            hooks = dict(self.hooks)
+            hooks[event] = list(hooks[event]) + hook
+            self.hooks = hooks
+
+    def deregister_hook(self, event, hook):
+        """Deregister a previously registered session hook.
+        Returns True if the hook existed, False if not.
+        """
+        with self.lock:
+            hooks = dict(self.hooks)
+            hooks[event] = list(hooks.get(event, ()))
+            try:
+                hooks[event].remove(hook)
+            except ValueError:
+                return False
+            self.hooks = hooks
+            return True
 
 
 def session():
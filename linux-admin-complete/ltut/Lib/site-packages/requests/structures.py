@@ -37,6 +37,10 @@ class CaseInsensitiveDict(MutableMapping):
     behavior is undefined.
     """
 
+    # Bumped on every change, so that values derived from the mapping can be
+    # cached until it is next modified (see Session.prepare_request).
+    _generation = 0
+
     def __init__(self, data=None, **kwargs):
         self._store = OrderedDict()
         if data is None:
@@ -47,12 +51,14 @@ class CaseInsensitiveDict(MutableMapping):
         # Use the lowercased key for lookups, but store the actual
         # key alongside the value.
         self._store[key.lower()] = (key, value)
+        self._generation += 1
 
     def __getitem__(self, key):
         return self._store[key.lower()][1]
 
     def __delitem__(self, key):
         del self._store[key.lower()]
+        self._generation += 1
 
     def __iter__(self):
         return (casedkey for casedkey, mappedvalue in self._store.values())
@@ -64,6 +70,10 @@ class CaseInsensitiveDict(MutableMapping):
         """Like iteritems(), but with all lowercase keys."""
         return ((lowerkey, keyval[1]) for (lowerkey, keyval) in self._store.items())
 
+    def _entries(self):
+        # (lowercased key, (key, value)) pairs, in order.
+        return self._store.items()
+
     def __eq__(self, other):
         if isinstance(other, Mapping):
             other = CaseInsensitiveDict(other)
@@ -80,6 +90,85 @@ class CaseInsensitiveDict(MutableMapping):
         return str(dict(self.items()))
 
 
+class CaseInsensitiveOverlay(CaseInsensitiveDict):
+    """A :class:`CaseInsensitiveDict` layered over another one, ``base``.
+
+    Keys this mapping has not set or deleted itself are looked up in
+    ``base``, so creating an overlay and changing a few keys does not copy
+    ``base``. Iteration yields the keys of ``base`` in their order, with the
+    values set here in place of the ones they override, followed by the keys
+    that are new here::
+
+        base = CaseInsensitiveDict({'Accept': '*/*', 'Connection': 'keep-alive'})
+        cio = CaseInsensitiveOverlay(base, {'accept': 'text/html', 'X-Id': '1'})
+        list(cio) == ['accept', 'Connection', 'X-Id']  # True
+        del cio['connection']
+        'Connection' in base  # True
+
+    ``base`` must not be modified while overlays of it are in use.
+    """
+
+    def __init__(self, base, data=None, **kwargs):
+        self.base = base
+        # Lowercased keys of base that were deleted here.
+        self._hidden = set()
+        super().__init__(data, **kwargs)
+
+    def __getitem__(self, key):
+        lowerkey = key.lower()
+        if lowerkey in self._store:
+            return self._store[lowerkey][1]
+        if lowerkey in self._hidden:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __delitem__(self, key):
+        lowerkey = key.lower()
+        found = self._store.pop(lowerkey, None) is not None
+        if lowerkey not in self._hidden and lowerkey in self.base:
+            self._hidden.add(lowerkey)
+            found = True
+        if not found:
+            raise KeyError(key)
+        self._generation += 1
+
+    def _entries(self):
+        store, hidden = self._store, self._hidden
+        for lowerkey, keyval in self.base._entries():
+            if lowerkey not in hidden:
+                yield lowerkey, store.get(lowerkey, keyval)
+        for lowerkey, keyval in store.items():
+            # A key deleted and set again moves to the end, as in a dict.
+            if lowerkey in hidden or lowerkey not in self.base:
+                yield lowerkey, keyval
+
+    def __iter__(self):
+        return (casedkey for lowerkey, (casedkey, value) in self._entries())
+
+    def __len__(self):
+        added = sum(
+            1
+            for lowerkey in self._store
+            if lowerkey in self._hidden or lowerkey not in self.base
+        )
+        return len(self.base) - len(self._hidden) + added
+
+    def lower_items(self):
+        """Like iteritems(), but with all lowercase keys."""
+        return ((lowerkey, keyval[1]) for (lowerkey, keyval) in self._entries())
+
+    def own_items(self):
+        """The (key, value) pairs set on this mapping rather than inherited
+        from ``base``."""
+        return self._store.values()
+
+    def copy(self):
+        other = CaseInsensitiveOverlay(self.base)
+        other._store = self._store.copy()
+        other._hidden = set(self._hidden)
+        return other
+
+
 class LookupDict(dict):
     """Dictionary lookup object."""
 
@@ -32,9 +32,11 @@ from ._internal_utils import (  # noqa: F401
     to_native_string,
 )
 from .compat import (
+    JSONDecodeError,
     Mapping,
     basestring,
     bytes,
+    chardet,
     getproxies,
     getproxies_environment,
     integer_types,
@@ -578,6 +580,170 @@ def iter_slices(string, slice_length):
         pos += slice_length
 
 
+_JSON_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+_JSON_NUMBER_CHARS = frozenset("+-.0123456789Ee")
+# The most text a cut token can leave after the position of the error it
+# causes: a pair of \uXXXX escapes, or a literal such as -Infinity.
+_JSON_TOKEN_MAX = 12
+
+
+class _JSONStream:
+    """Pulls JSON values out of an iterator of text chunks.
+
+    Only the text that has not been decoded yet is kept in memory.
+    """
+
+    def __init__(self, iterator, decoder):
+        self.chunks = iter(iterator)
+        self.decoder = decoder
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read(self, size):
+        """Reads chunks until at least ``size`` characters are pending."""
+        parts = [self.buffer[self.pos :]]
+        pending = len(parts[0])
+        for chunk in self.chunks:
+            parts.append(chunk)
+            pending += len(chunk)
+            if pending >= size:
+                break
+        else:
+            self.eof = True
+        self.buffer = "".join(parts)
+        self.pos = 0
+
+    def _error(self, msg):
+        return JSONDecodeError(msg, self.buffer, self.pos)
+
+    def _truncated(self, error):
+        """Tells whether a decoding error may come from the pending text
+        being cut short, rather than from invalid JSON."""
+        return (
+            error.msg.startswith("Unterminated string")
+            or error.pos >= len(self.buffer) - _JSON_TOKEN_MAX
+        )
+
+    def peek(self):
+        """Skips whitespace and returns the next character, "" at the end."""
+        while True:
+            self.pos = _JSON_WHITESPACE_RE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos : self.pos + 1]
+            self._read(1)
+
+    def value(self):
+        if not self.peek():
+            raise self._error("Expecting value")
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except JSONDecodeError as e:
+                # Invalid text ahead of the end of the buffer will not be
+                # fixed by reading more, so fail before reading the rest.
+                if self.eof or not self._truncated(e):
+                    raise
+            else:
+                # A number may continue in the next chunk.
+                if self.eof or (
+                    end < len(self.buffer)
+                    and self.buffer[end] not in _JSON_NUMBER_CHARS
+                ):
+                    self.pos = end
+                    return obj
+            # Only try again once the pending text has doubled, so a value
+            # spread over many chunks is still decoded in linear time.
+            self._read(2 * (len(self.buffer) - self.pos))
+
+    def array_items(self):
+        self.pos += 1
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            if char not in (",", "]"):
+                raise self._error("Expecting ',' delimiter")
+            self.pos += 1
+            if char == "]":
+                return
+
+    def object_items(self):
+        self.pos += 1
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.value()
+            if self.peek() != ":":
+                raise self._error("Expecting ':' delimiter")
+            self.pos += 1
+            yield key, self.value()
+            char = self.peek()
+            if char not in (",", "}"):
+                raise self._error("Expecting ',' delimiter")
+            self.pos += 1
+            if char == "}":
+                return
+
+    def end(self):
+        if self.peek():
+            raise self._error("Extra data")
+
+
+def stream_decode_json(iterator, decoder, unwrap_array=True):
+    """Stream decodes the JSON values in an iterator of text chunks.
+
+    With ``unwrap_array``, a top-level array yields its elements one at a
+    time; anything else is read as a sequence of whitespace separated
+    values, as in NDJSON.
+
+    :param iterator: iterator of ``str`` chunks.
+    :param decoder: a ``JSONDecoder`` providing ``raw_decode``.
+    :param unwrap_array: whether to yield the elements of a top-level array.
+    """
+    stream = _JSONStream(iterator, decoder)
+    if unwrap_array and stream.peek() == "[":
+        yield from stream.array_items()
+        stream.end()
+        return
+    while stream.peek():
+        yield stream.value()
+
+
+def stream_load_json(iterator, decoder):
+    """Decodes a single JSON document from an iterator of text chunks.
+
+    The elements of a top-level array or object are decoded one by one, so
+    the raw text of the whole document is never held in memory at once.
+
+    :param iterator: iterator of ``str`` chunks.
+    :param decoder: a ``JSONDecoder`` providing ``raw_decode``.
+    """
+    stream = _JSONStream(iterator, decoder)
+    char = stream.peek()
+    if char == "[":
+        obj = list(stream.array_items())
+    elif char == "{":
+        obj = list(stream.object_items())
+        object_pairs_hook = getattr(decoder, "object_pairs_hook", None)
+        object_hook = getattr(decoder, "object_hook", None)
+        if object_pairs_hook is not None:
+            obj = object_pairs_hook(obj)
+        else:
+            obj = dict(obj)
+            if object_hook is not None:
+                obj = object_hook(obj)
+    else:
+        obj = stream.value()
+    stream.end()
+    return obj
+
+
 def get_unicode_from_response(r):
     """Returns the requested content back in unicode.
 
@@ -976,6 +1142,55 @@ def guess_json_utf(data):
     return None
 
 
+# Bytes of a body decoded at once when checking it is valid UTF-8.
+_UTF8_VALIDATION_SLICE = 1024 * 1024
+
+
+def _is_utf8(content):
+    """Checks that content is valid UTF-8, a slice at a time, so that the
+    decoded body is never held in memory as a whole."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        with memoryview(content) as view:
+            for i in range(0, len(view), _UTF8_VALIDATION_SLICE):
+                with view[i : i + _UTF8_VALIDATION_SLICE] as chunk:
+                    decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def detect_encoding(content, sample_size=None):
+    """Guesses the encoding of a response body.
+
+    A byte order mark, pure ASCII and valid UTF-8 are recognised directly.
+    Only bodies that are none of these are handed to charset_normalizer or
+    chardet, which look at no more than the first ``sample_size`` bytes
+    (the whole body when ``sample_size`` is None).
+
+    :rtype: str
+    """
+    if content[:4] in (codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE):
+        return "utf-32"
+    if content[:3] == codecs.BOM_UTF8:
+        return "utf-8-sig"
+    if content[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+        return "utf-16"
+    if content.isascii():
+        return "ascii"
+    if _is_utf8(content):
+        return "utf-8"
+
+    if chardet is None:
+        # If no character detection library is available, we'll fall back
+        # to a standard Python utf-8 str.
+        return "utf-8"
+    if sample_size is not None:
+        content = content[:sample_size]
+    return chardet.detect(content)["encoding"]
+
+
 def prepend_scheme_if_needed(url, new_scheme):
     """Given a URL that may or may not have a scheme, prepend the given scheme.
     Does not replace a present scheme with the one provided as an argument.
@@ -0,0 +1,442 @@
+"""
+Speed and accuracy benchmarks for the charset_normalizer detection.
+
+Every scenario runs over a generated corpus of texts in many languages and
+code pages, from 64 bytes up to 10 MiB, plus a few binary payloads. The
+encoding each text was written with is known, so every detection is also
+checked against it. A detection counts as accurate when it decodes back to
+the original text, as code pages that agree on the characters used are
+equally good answers. For ``from_bytes`` that is the text ``str()`` reads
+from the match, which must not keep a BOM either.
+
+By default the suite runs twice, in child processes: once on the pure
+Python mess detector, once on the compiled one where the installed wheel
+ships it. Results are written as JSON so that runs on two commits can be
+compared::
+
+    python benchmarks/bench_charset_normalizer.py --output before.json
+    python benchmarks/bench_charset_normalizer.py --output after.json --compare before.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import zlib
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+KiB = 1024
+MiB = 1024 * KiB
+
+SIZES = [64, KiB, 32 * KiB, MiB, 10 * MiB]
+QUICK_SIZES = [64, KiB, 32 * KiB]
+#: Code pages also measured at the largest sizes, where each detection
+#: takes long enough that the whole matrix would not be worth it.
+LARGE_CODE_PAGES = {"utf_8", "cp1252", "cp1251", "shift_jis", "gb18030"}
+
+#: A paragraph per language, with the code pages it is encoded with.
+TEXTS = {
+    "English": (
+        "All human beings are born free and equal in dignity and rights. "
+        "They are endowed with reason and conscience and should act towards "
+        "one another in a spirit of brotherhood. Everyone has the right to "
+        "life, liberty and security of person.",
+        ["ascii", "utf_8", "utf_16", "utf_32"],
+    ),
+    "French": (
+        "Tous les êtres humains naissent libres et égaux en dignité et en "
+        "droits. Ils sont doués de raison et de conscience et doivent agir "
+        "les uns envers les autres dans un esprit de fraternité. Où qu'il "
+        "soit, chacun a droit à la reconnaissance de sa personnalité.",
+        ["cp1252", "latin_1", "mac_roman", "utf_8", "utf_8_sig"],
+    ),
+    "German": (
+        "Alle Menschen sind frei und gleich an Würde und Rechten geboren. "
+        "Sie sind mit Vernunft und Gewissen begabt und sollen einander im "
+        "Geist der Brüderlichkeit begegnen. Jeder hat das Recht auf Leben, "
+        "Freiheit und Sicherheit der Person, auch außerhalb seines Landes.",
+        ["cp1252", "iso8859_15", "cp850", "utf_8"],
+    ),
+    "Russian": (
+        "Все люди рождаются свободными и равными в своем достоинстве и "
+        "правах. Они наделены разумом и совестью и должны поступать в "
+        "отношении друг друга в духе братства. Каждый человек имеет право "
+        "на жизнь, на свободу и на личную неприкосновенность.",
+        ["cp1251", "koi8_r", "iso8859_5", "cp866", "mac_cyrillic", "utf_8"],
+    ),
+    "Greek": (
+        "Όλοι οι άνθρωποι γεννιούνται ελεύθεροι και ίσοι στην αξιοπρέπεια "
+        "και τα δικαιώματα. Είναι προικισμένοι με λογική και συνείδηση, και "
+        "οφείλουν να συμπεριφέρονται μεταξύ τους με πνεύμα αδελφοσύνης.",
+        ["iso8859_7", "cp1253", "utf_8"],
+    ),
+    "Arabic": (
+        "يولد جميع الناس أحرارا متساوين في الكرامة والحقوق. وقد وهبوا عقلا "
+        "وضميرا وعليهم أن يعامل بعضهم بعضا بروح الإخاء. لكل فرد الحق في "
+        "الحياة والحرية وفي الأمان على شخصه.",
+        ["cp1256", "iso8859_6", "utf_8"],
+    ),
+    "Hebrew": (
+        "כל בני האדם נולדו בני חורין ושווים בערכם ובזכויותיהם. כולם חוננו "
+        "בתבונה ובמצפון, לפיכך חובה עליהם לנהוג איש ברעהו ברוח של אחווה. "
+        "כל אדם זכאי לחיים, לחירות ולביטחון אישי.",
+        ["cp1255", "iso8859_8", "utf_8"],
+    ),
+    "Turkish": (
+        "Bütün insanlar hür, haysiyet ve haklar bakımından eşit doğarlar. "
+        "Akıl ve vicdana sahiptirler ve birbirlerine karşı kardeşlik zihniyeti "
+        "ile hareket etmelidirler. Yaşamak, hürriyet ve kişi emniyeti her "
+        "ferdin hakkıdır.",
+        ["cp1254", "iso8859_9", "utf_8"],
+    ),
+    "Polish": (
+        "Wszyscy ludzie rodzą się wolni i równi pod względem swej godności i "
+        "swych praw. Są oni obdarzeni rozumem i sumieniem i powinni "
+        "postępować wobec innych w duchu braterstwa. Każdy człowiek ma prawo "
+        "do życia, wolności i bezpieczeństwa swej osoby.",
+        ["cp1250", "iso8859_2", "utf_8"],
+    ),
+    "Japanese": (
+        "すべての人間は、生まれながらにして自由であり、かつ、尊厳と権利とについて"
+        "平等である。人間は、理性と良心とを授けられており、互いに同胞の精神をもって"
+        "行動しなければならない。すべて人は、生命、自由及び身体の安全に対する権利を"
+        "有する。",
+        ["shift_jis", "cp932", "euc_jp", "iso2022_jp", "utf_8"],
+    ),
+    "Chinese": (
+        "人人生而自由，在尊严和权利上一律平等。他们赋有理性和良心，并应以兄弟关系的"
+        "精神相对待。人人有权享有生命、自由和人身安全。任何人不得使为奴隶或奴役。",
+        ["gb18030", "gb2312", "utf_8", "utf_16"],
+    ),
+    "Traditional Chinese": (
+        "人人生而自由，在尊嚴和權利上一律平等。他們賦有理性和良心，並應以兄弟關係的"
+        "精神相對待。人人有權享有生命、自由和人身安全。",
+        ["big5", "utf_8"],
+    ),
+    "Korean": (
+        "모든 인간은 태어날 때부터 자유로우며 그 존엄과 권리에 있어 동등하다. "
+        "인간은 천부적으로 이성과 양심을 부여받았으며 서로 형제애의 정신으로 "
+        "행동하여야 한다. 모든 사람은 생명과 신체의 자유와 안전에 대한 권리를 가진다.",
+        ["euc_kr", "cp949", "utf_8"],
+    ),
+    "Thai": (
+        "มนุษย์ทั้งหลายเกิดมามีอิสระและเสมอภาคกันในเกียรติศักดิ์และสิทธิ "
+        "ต่างในตนมีเหตุผลและมโนธรรม และควรปฏิบัติต่อกันด้วยเจตนารมณ์แห่งภราดรภาพ",
+        ["cp874", "tis_620", "utf_8"],
+    ),
+}
+
+
+def _sized(text, encoding, size):
+    """Repeats ``text`` into a payload of about ``size`` bytes, cut on a
+    character boundary so that it decodes back as the same text."""
+    unit = len(text.encode(encoding))
+    repeated = text * (size // unit + 2)
+    # Bytes per character, roughly, then trimmed down to the size.
+    chars = max(1, int(size * len(text) / unit))
+    payload = repeated[:chars].encode(encoding)
+    while len(payload) > size and chars > 1:
+        chars -= max(1, (len(payload) - size) * len(text) // unit)
+        payload = repeated[:chars].encode(encoding)
+    return repeated[:chars], payload
+
+
+def _binaries(size, rng):
+    random_bytes = rng.randbytes(size)
+    yield "random", random_bytes
+    yield "zlib", zlib.compress(rng.randbytes(size // 2) * 2)[:size]
+    yield "png", b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + random_bytes[16:]
+    yield "elf", b"\x7fELF\x02\x01\x01" + bytes(57) + random_bytes[64:]
+
+
+def corpus(quick=False):
+    """Returns the samples as ``(name, payload, text, encoding)``, ``text``
+    and ``encoding`` being ``None`` for binary payloads."""
+    rng = random.Random(2024)
+    samples = []
+    for size in QUICK_SIZES if quick else SIZES:
+        for language, (text, encodings) in TEXTS.items():
+            for encoding in encodings:
+                if size >= MiB and encoding not in LARGE_CODE_PAGES:
+                    continue
+                sample_text, payload = _sized(text, encoding, size)
+                name = f"{language}/{encoding}/{size}"
+                samples.append((name, payload, sample_text, encoding))
+        if size < MiB:
+            for kind, payload in _binaries(size, rng):
+                samples.append((f"binary/{kind}/{size}", payload, None, None))
+    return samples
+
+
+def _decodes_to(payload, encoding, text):
+    if encoding is None:
+        return False
+    try:
+        decoded = payload.decode(encoding)
+    except (LookupError, UnicodeDecodeError):
+        return False
+    # The BOM of utf_8 is kept by the decoding, a match reports it apart.
+    return decoded.lstrip("\ufeff") == text
+
+
+def _reads_as(match, text):
+    """Whether a match gives back the original text as ``str()``, the way
+    callers read it, so without any BOM or SIG."""
+    if match is None:
+        return False
+    try:
+        return str(match) == text
+    except UnicodeDecodeError:
+        return False
+
+
+def _clear_caches():
+    # Each repeat starts cold, or the later ones would mostly hit the
+    # coherence cache on the same chunks.
+    from charset_normalizer import cd
+
+    cd.coherence_ratio.cache_clear()
+
+
+def _timed(function, samples):
+    """Calls ``function`` on every payload, and returns the results with the
+    latency of each call in milliseconds."""
+    results, latencies = [], []
+    for _, payload, _, _ in samples:
+        start = time.perf_counter()
+        results.append(function(payload))
+        latencies.append((time.perf_counter() - start) * 1e3)
+    return results, latencies
+
+
+def _latency_stats(name, latencies):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return [
+        (f"{name}_rate", len(ordered) / (sum(ordered) / 1e3), "det/s"),
+        (f"{name}_p50", ordered[len(ordered) // 2], "ms"),
+        (f"{name}_p99", p99, "ms"),
+    ]
+
+
+def bench_from_bytes(samples):
+    """Detections per second, latency, and accuracy overall and per size."""
+    from charset_normalizer import from_bytes
+
+    texts = [s for s in samples if s[2] is not None]
+    matches, latencies = _timed(lambda payload: from_bytes(payload).best(), texts)
+    accurate = []
+    for i, (_, _, text, _) in enumerate(texts):
+        accurate.append(_reads_as(matches[i], text))
+        # Not keeping the decoded text of every match around.
+        matches[i] = None
+    results = _latency_stats("from_bytes", latencies)
+    results.append(("from_bytes_accuracy", sum(accurate) / len(accurate), "ratio"))
+    sizes = sorted({int(s[0].rsplit("/", 1)[1]) for s in texts})
+    for size in sizes:
+        picked = [i for i, s in enumerate(texts) if s[0].endswith(f"/{size}")]
+        results.append(
+            (
+                f"from_bytes_accuracy_{size}B",
+                sum(accurate[i] for i in picked) / len(picked),
+                "ratio",
+            )
+        )
+        results.append(
+            (
+                f"from_bytes_p50_{size}B",
+                statistics.median(latencies[i] for i in picked),
+                "ms",
+            )
+        )
+    return results
+
+
+def bench_is_binary(samples):
+    """Latency, and how often text and binary payloads are told apart."""
+    from charset_normalizer import is_binary
+
+    # The largest texts would only measure the same detection again.
+    picked = [s for s in samples if len(s[1]) < MiB]
+    verdicts, latencies = _timed(is_binary, picked)
+    correct = [
+        verdict is (text is None)
+        for verdict, (_, _, text, _) in zip(verdicts, picked)
+    ]
+    return _latency_stats("is_binary", latencies) + [
+        ("is_binary_accuracy", sum(correct) / len(correct), "ratio")
+    ]
+
+
+def bench_detect(samples):
+    """The chardet compatible ``detect`` shim, on the text payloads."""
+    from charset_normalizer import detect
+
+    texts = [s for s in samples if s[2] is not None and len(s[1]) < MiB]
+    guesses, latencies = _timed(detect, texts)
+    accurate = [
+        _decodes_to(payload, guess["encoding"], text)
+        for guess, (_, payload, text, _) in zip(guesses, texts)
+    ]
+    return _latency_stats("detect", latencies) + [
+        ("detect_accuracy", sum(accurate) / len(accurate), "ratio")
+    ]
+
+
+def run(samples):
+    _clear_caches()
+    yield from bench_from_bytes(samples)
+    _clear_caches()
+    yield from bench_is_binary(samples)
+    _clear_caches()
+    yield from bench_detect(samples)
+
+
+class _PurePythonFinder:
+    """Imports ``charset_normalizer.md`` from its source file, even where a
+    compiled build of it sits next to it and would be preferred."""
+
+    def find_spec(self, name, path=None, target=None):
+        if name != "charset_normalizer.md":
+            return None
+        for entry in path or []:
+            source = os.path.join(entry, "md.py")
+            if os.path.exists(source):
+                return importlib.util.spec_from_file_location(name, source)
+        return None
+
+
+def _md_implementation():
+    from charset_normalizer import md
+
+    return "pure" if md.__file__.lower().endswith(".py") else "compiled"
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=HERE,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def collect(implementation, quick=False, repeat=3):
+    """Runs every scenario ``repeat`` times in this process and returns the
+    JSON report. Must be called before ``charset_normalizer`` is imported
+    for ``implementation="pure"`` to take effect."""
+    if implementation == "pure":
+        sys.meta_path.insert(0, _PurePythonFinder())
+
+    import charset_normalizer
+
+    samples = corpus(quick)
+    results = {}
+    for _ in range(repeat):
+        for name, value, unit in run(samples):
+            results.setdefault((name, unit), []).append(value)
+    return {
+        "meta": {
+            "revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "charset_normalizer": charset_normalizer.__version__,
+            "implementation": _md_implementation(),
+            "samples": len(samples),
+            "quick": quick,
+            "repeat": repeat,
+        },
+        "results": [
+            {
+                "name": name,
+                "unit": unit,
+                "median": statistics.median(values),
+                "samples": values,
+            }
+            for (name, unit), values in results.items()
+        ],
+    }
+
+
+def collect_all(quick=False, repeat=3):
+    """Runs :func:`collect` for each implementation in a child process, and
+    merges the reports, suffixing result names with the implementation. The
+    compiled run is left out when no compiled build is installed."""
+    implementations = ["pure"]
+    if _md_implementation() == "compiled":
+        implementations.append("compiled")
+    else:
+        print("No compiled build of the mess detector, skipped.", file=sys.stderr)
+
+    reports = []
+    for implementation in implementations:
+        argv = [sys.executable, __file__, "--implementation", implementation]
+        argv += ["--repeat", str(repeat)] + (["--quick"] if quick else [])
+        out = subprocess.run(argv, capture_output=True, text=True, check=True)
+        reports.append(json.loads(out.stdout))
+
+    meta = dict(reports[0]["meta"])
+    meta["implementation"] = [r["meta"]["implementation"] for r in reports]
+    results = []
+    for report in reports:
+        for result in report["results"]:
+            name = f"{result['name']}_{report['meta']['implementation']}"
+            results.append(dict(result, name=name))
+    return {"meta": meta, "results": results}
+
+
+def compare(report, baseline):
+    """Prints each result next to the same result from ``baseline``."""
+    old = {r["name"]: r["median"] for r in baseline["results"]}
+    for result in report["results"]:
+        name, new = result["name"], result["median"]
+        if name in old and old[name]:
+            change = f"{(new - old[name]) / old[name]:+.1%}"
+        else:
+            change = "n/a"
+        print(f"{name:36} {new:14.3f} {result['unit']:6} {change:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--implementation",
+        choices=["pure", "compiled", "both"],
+        default="both",
+        help="mess detector to benchmark, each in a child process for both",
+    )
+    parser.add_argument("--quick", action="store_true", help="up to 32 KiB only")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="JSON report of a previous run")
+    args = parser.parse_args(argv)
+
+    if args.implementation == "both":
+        report = collect_all(quick=args.quick, repeat=args.repeat)
+    else:
+        report = collect(args.implementation, quick=args.quick, repeat=args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    elif not args.output:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Benchmarks for the ``Session.request`` -> ``HTTPAdapter.send`` ->
+``HTTPConnectionPool.urlopen`` path.
+
+Every scenario runs against the local server in ``server.py``, over TLS
+with ``--tls``. Results are written as JSON so that runs on two commits can
+be compared::
+
+    python benchmarks/bench_requests.py --output before.json
+    python benchmarks/bench_requests.py --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import urllib3
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import server
+
+MiB = 1024 * 1024
+
+
+def _session(base_url, pool_maxsize=10):
+    session = requests.Session()
+    # Keep proxy and CA bundle variables from the environment out of the
+    # measurements, and from overriding ``verify``.
+    session.trust_env = False
+    session.mount(base_url, HTTPAdapter(pool_maxsize=pool_maxsize, pool_block=True))
+    if base_url.startswith("https"):
+        session.verify = server.CA_BUNDLE
+    return session
+
+
+def _stats(base_url):
+    with _session(base_url) as session:
+        return session.get(f"{base_url}/stats").json()
+
+
+def bench_overhead(base_url, count):
+    """Client CPU time and wall time per sequential request."""
+    with _session(base_url) as session:
+        session.get(f"{base_url}/small")
+        before = _stats(base_url)
+        cpu, wall = time.process_time(), time.perf_counter()
+        for _ in range(count):
+            session.get(f"{base_url}/small")
+        cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+        after = _stats(base_url)
+    connections = after["connections"] - before["connections"] - 1
+    return [
+        ("request_cpu", cpu / count * 1e6, "us"),
+        ("request_latency", wall / count * 1e6, "us"),
+        ("keepalive_reuse_sequential", 1 - connections / count, "ratio"),
+    ]
+
+
+def bench_throughput(base_url, count, concurrency):
+    """Requests per second with ``concurrency`` threads sharing a session."""
+    with _session(base_url, pool_maxsize=concurrency) as session:
+        url = f"{base_url}/small"
+        share = max(1, count // concurrency)
+
+        def worker(_):
+            for _ in range(share):
+                session.get(url).content
+
+        before = _stats(base_url)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            list(executor.map(worker, range(concurrency)))
+        elapsed = time.perf_counter() - start
+        after = _stats(base_url)
+    total = share * concurrency
+    connections = after["connections"] - before["connections"] - 1
+    return [
+        (f"throughput_c{concurrency}", total / elapsed, "req/s"),
+        (f"keepalive_reuse_c{concurrency}", 1 - connections / total, "ratio"),
+    ]
+
+
+def bench_download(base_url, size, gzipped):
+    """Streaming download rate of the decoded body."""
+    route = "gzip" if gzipped else "bytes"
+    with _session(base_url) as session:
+        start = time.perf_counter()
+        with session.get(f"{base_url}/{route}/{size}", stream=True) as r:
+            received = sum(len(chunk) for chunk in r.iter_content(64 * 1024))
+        elapsed = time.perf_counter() - start
+    assert received == size, received
+    name = "download_gzip" if gzipped else "download"
+    return [(name, size / MiB / elapsed, "MB/s")]
+
+
+def bench_upload(base_url, size):
+    """Upload rate of a bytes body."""
+    body = os.urandom(MiB) * (size // MiB)
+    with _session(base_url) as session:
+        start = time.perf_counter()
+        r = session.post(f"{base_url}/upload", data=body)
+        elapsed = time.perf_counter() - start
+    assert int(r.text) == len(body), r.text
+    return [("upload", len(body) / MiB / elapsed, "MB/s")]
+
+
+def run(base_url, quick=False):
+    count = 200 if quick else 2000
+    size = (8 if quick else 64) * MiB
+    yield from bench_overhead(base_url, count)
+    for concurrency in (1, 16, 256):
+        yield from bench_throughput(base_url, count, concurrency)
+    yield from bench_download(base_url, size, gzipped=False)
+    yield from bench_download(base_url, size, gzipped=True)
+    yield from bench_upload(base_url, size)
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=server.HERE,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def collect(tls=False, quick=False, repeat=3):
+    """Runs every scenario ``repeat`` times and returns the JSON report."""
+    process, base_url = server.start(tls)
+    try:
+        samples = {}
+        for _ in range(repeat):
+            for name, value, unit in run(base_url, quick):
+                samples.setdefault((name, unit), []).append(value)
+    finally:
+        process.terminate()
+    return {
+        "meta": {
+            "revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "requests": requests.__version__,
+            "urllib3": urllib3.__version__,
+            "tls": tls,
+            "quick": quick,
+            "repeat": repeat,
+        },
+        "results": [
+            {
+                "name": name,
+                "unit": unit,
+                "median": statistics.median(values),
+                "samples": values,
+            }
+            for (name, unit), values in samples.items()
+        ],
+    }
+
+
+def compare(report, baseline):
+    """Prints each result next to the same result from ``baseline``."""
+    old = {r["name"]: r["median"] for r in baseline["results"]}
+    for result in report["results"]:
+        name, new = result["name"], result["median"]
+        if name in old and old[name]:
+            change = f"{(new - old[name]) / old[name]:+.1%}"
+        else:
+            change = "n/a"
+        print(f"{name:32} {new:14.2f} {result['unit']:6} {change:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tls", action="store_true", help="benchmark over TLS")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="JSON report of a previous run")
+    args = parser.parse_args(argv)
+
+    report = collect(tls=args.tls, quick=args.quick, repeat=args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    elif not args.output:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
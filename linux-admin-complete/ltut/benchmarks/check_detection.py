@@ -0,0 +1,122 @@
+"""
+Regression checks for the charset_normalizer detection.
+
+Each check runs the detection on payloads that once gave a wrong or broken
+result, and verifies what a caller observes of it. Files of
+``TOO_BIG_SEQUENCE`` bytes or more are written to a temporary directory, as
+``from_path()`` maps them rather than reading them::
+
+    python benchmarks/check_detection.py
+
+The exit status is non-zero if any check fails.
+"""
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import tempfile
+import traceback
+
+#: Text spread over the large files, with a few characters outside ASCII.
+TEXT = "Héllo wörld, ça va? The quick brown fox jumps over the lazy dog.\n"
+
+
+def _expect(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def _large_file(directory, name, payload):
+    """Writes ``payload`` repeated to at least ``TOO_BIG_SEQUENCE`` bytes."""
+    from charset_normalizer.constant import TOO_BIG_SEQUENCE
+
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(payload * (TOO_BIG_SEQUENCE // len(payload) + 1))
+    return path
+
+
+def check_undecodable_tail(directory):
+    """A mapped file whose end does not decode with the code page that fits
+    its head still gives a match that decodes."""
+    from charset_normalizer import from_path
+
+    path = _large_file(directory, "tail.txt", TEXT.encode("ascii", "replace"))
+    with open(path, "ab") as f:
+        f.write(b"caf\xe9\n")
+    best = from_path(path).best()
+    _expect(best is not None, "no match")
+    _expect(str(best).endswith("\n"), f"{best.encoding} does not decode it")
+    with open(path, "rb") as f:
+        _expect(best.raw == f.read(), "raw differs from the file")
+
+
+def check_from_paths_workers(directory):
+    """Matches of mapped files come back from the worker processes, the same
+    as when detected in this process."""
+    from charset_normalizer import from_path, from_paths
+
+    paths = [
+        _large_file(directory, "utf_8.txt", TEXT.encode("utf_8")),
+        _large_file(directory, "cp1252.txt", TEXT.encode("cp1252")),
+    ]
+    with open(os.path.join(directory, "small.txt"), "wb") as f:
+        f.write(TEXT.encode("utf_8"))
+    paths.append(f.name)
+
+    for path, matches in from_paths(paths, workers=2):
+        best, expected = matches.best(), from_path(path).best()
+        _expect(best.encoding == expected.encoding, f"{path} is {best.encoding}")
+        _expect(str(best) == str(expected), f"{path} decodes differently")
+        _expect(isinstance(best.raw, bytes), f"raw of {path} is {type(best.raw)}")
+
+    matches = from_path(paths[0])
+    copied = pickle.loads(pickle.dumps(matches))
+    _expect(copied.best().raw == matches.best().raw, "pickled payload differs")
+
+
+def check_fast_path_mess(directory):
+    """Valid UTF-8 or ASCII free of control characters is still measured
+    for mess, and given up when too messy, as by the full detection."""
+    from charset_normalizer import from_bytes, is_binary
+
+    symbols = "Ω€∑ºª¶§•ªº∆˚¬…æ«“‘”’÷≥≤µ∫√ç≈Ω".encode("utf_8") * 30
+    best = from_bytes(symbols).best()
+    _expect(best.chaos >= 0.2, f"symbols have a chaos of {best.chaos}")
+    _expect(is_binary(symbols), "symbols are not binary")
+
+    rng = random.Random(2024)
+    printable = bytes(rng.randrange(32, 127) for _ in range(3000))
+    best = from_bytes(printable).best()
+    _expect(best.chaos > 0.0, f"random ASCII is {best.encoding} without chaos")
+
+    best = from_bytes(TEXT.encode("utf_8") * 20).best()
+    _expect(best.encoding == "utf_8" and best.chaos == 0.0, "text is messy")
+
+
+CHECKS = [check_undecodable_tail, check_from_paths_workers, check_fast_path_mess]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.parse_args(argv)
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for check in CHECKS:
+            name = check.__name__[len("check_") :]
+            try:
+                check(directory)
+            except Exception:
+                failed = True
+                print(f"{name:24} FAILED")
+                traceback.print_exc()
+            else:
+                print(f"{name:24} ok")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Equivalence check of the table-driven mess detector against its plugins.
+
+``charset_normalizer.md`` computes the built-in detectors in one pass over
+a table of character classes, ``_scan()``, while the ``MessDetectorPlugin``
+classes remain the reference for what each detector measures. This script
+feeds both the same generated sequences, at several thresholds, and checks
+that every detector's ratio is identical. It also checks the range of every
+code point in the table against a linear scan of the Unicode ranges::
+
+    python benchmarks/check_mess_detector.py
+    python benchmarks/check_mess_detector.py --count 20000 --seed 7
+
+The pure Python ``md.py`` is checked even where a compiled build of it is
+installed. The exit status is non-zero if anything differs.
+"""
+
+import argparse
+import random
+import sys
+
+from bench_charset_normalizer import _PurePythonFinder
+
+THRESHOLDS = [0.1, 0.2, 0.5, 1.0]
+#: Code pages random bytes are decoded from.
+CODECS = [
+    "utf_8", "cp1252", "cp1250", "cp1251", "cp1253", "cp1254", "cp1255",
+    "cp1256", "koi8_r", "iso8859_7", "mac_roman", "cp437", "shift_jis",
+    "gb18030", "euc_kr", "big5",
+]  # fmt: skip
+#: Code point ranges words and mixed sequences are drawn from.
+SCRIPTS = [
+    (0x20, 0x7F),  # Basic Latin
+    (0xA0, 0x250),  # Latin-1 Supplement, Latin Extended
+    (0x370, 0x400),  # Greek
+    (0x400, 0x500),  # Cyrillic
+    (0x590, 0x600),  # Hebrew
+    (0x600, 0x700),  # Arabic
+    (0xE00, 0xE80),  # Thai
+    (0x2000, 0x2070),  # General Punctuation
+    (0x3000, 0x3100),  # CJK Punctuation, Hiragana, Katakana
+    (0x4E00, 0xA000),  # CJK Unified Ideographs
+    (0xAC00, 0xD7A4),  # Hangul Syllables
+    (0xFE70, 0xFF00),  # Arabic Presentation Forms-B
+    (0xFF00, 0xFFF0),  # Halfwidth and Fullwidth Forms
+    (0x1F300, 0x1F650),  # Emoticons and pictographs
+]
+LENGTHS = [1, 8, 32, 100, 511, 600, 1023, 1500, 3000]
+
+
+def _random_bytes(rng, length):
+    codec = rng.choice(CODECS)
+    return rng.randbytes(length).decode(codec, errors="ignore")
+
+
+def _words(rng, length):
+    scripts = rng.sample(SCRIPTS, 2)
+    parts = []
+    while sum(map(len, parts)) < length:
+        low, high = rng.choice(scripts) if rng.random() < 0.8 else SCRIPTS[0]
+        size = rng.randint(1, 12)
+        word = "".join(chr(rng.randrange(low, high)) for _ in range(size))
+        if rng.random() < 0.2:
+            word = word.capitalize() if rng.random() < 0.5 else word.upper()
+        parts.append(word + rng.choice(" \n,.;:!?-'\"()"))
+    return "".join(parts)[:length]
+
+
+def _mixed(rng, length):
+    return "".join(chr(rng.randrange(*rng.choice(SCRIPTS))) for _ in range(length))
+
+
+def sequences(count, seed):
+    """Yields ``count`` sequences: random bytes decoded from a code page,
+    words in one or two scripts, and characters from mixed scripts."""
+    rng = random.Random(seed)
+    generators = [_random_bytes, _words, _mixed]
+    for _ in range(count):
+        yield rng.choice(generators)(rng, rng.choice(LENGTHS))
+
+
+def _intermediary_step(sequence):
+    """How often ``mess_ratio()`` checks the ratios against the threshold."""
+    length = len(sequence) + 1
+    if length < 512:
+        return 32
+    if length <= 1024:
+        return 64
+    return 128
+
+
+def reference_ratios(md, sequence, maximum_threshold):
+    """The ratio of each built-in detector, feeding the plugins one
+    character at a time as ``mess_ratio()`` used to."""
+    detectors = [md_class() for md_class in md._BUILTIN_DETECTORS]
+    step = _intermediary_step(sequence)
+    last = len(sequence)
+    for index, character in enumerate(sequence + "\n"):
+        for detector in detectors:
+            if detector.eligible(character):
+                detector.feed(character)
+        if (index > 0 and index % step == 0) or index == last:
+            if sum(dt.ratio for dt in detectors) >= maximum_threshold:
+                break
+    return [dt.ratio for dt in detectors]
+
+
+def scan_ratios(md, sequence, maximum_threshold):
+    step = _intermediary_step(sequence)
+    return md._scan(sequence, maximum_threshold, step, [])
+
+
+def check_ratios(md, count, seed):
+    mismatches = 0
+    for sequence in sequences(count, seed):
+        for threshold in THRESHOLDS:
+            expected = reference_ratios(md, sequence, threshold)
+            got = scan_ratios(md, sequence, threshold)
+            if got != expected:
+                mismatches += 1
+                print(f"ratios differ at threshold {threshold} for {sequence!r}")
+                print(f"  plugins: {expected}")
+                print(f"  _scan:   {got}")
+    return mismatches
+
+
+def check_ranges(md):
+    """Compares the range in the class table of every code point with the
+    first range holding it, as ``unicode_range()`` used to find it."""
+    from charset_normalizer.constant import UNICODE_RANGES_COMBINED
+
+    expected = [None] * 0x110000
+    for name, code_points in reversed(UNICODE_RANGES_COMBINED.items()):
+        for code_point in code_points:
+            expected[code_point] = name
+
+    mismatches = 0
+    for block in range(0x110000 >> md._BLOCK_SHIFT):
+        classes = md._character_classes(block)
+        first = block << md._BLOCK_SHIFT
+        for offset, flags in enumerate(classes):
+            code_point = first + offset
+            name = md._RANGE_NAMES[flags >> md._RANGE_SHIFT]
+            if name != expected[code_point]:
+                mismatches += 1
+                print(f"U+{code_point:04X}: {name!r} != {expected[code_point]!r}")
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=3000, help="sequences to check")
+    parser.add_argument("--seed", type=int, default=2024, help="random seed")
+    parser.add_argument(
+        "--skip-ranges", action="store_true", help="skip the per code point check"
+    )
+    args = parser.parse_args(argv)
+
+    sys.meta_path.insert(0, _PurePythonFinder())
+    from charset_normalizer import md
+
+    failed = False
+    mismatches = check_ratios(md, args.count, args.seed)
+    failed |= bool(mismatches)
+    print(
+        f"ratios  {args.count} sequences x {len(THRESHOLDS)} thresholds, "
+        f"{mismatches} mismatches"
+    )
+    if not args.skip_ranges:
+        mismatches = check_ranges(md)
+        failed |= bool(mismatches)
+        print(f"ranges  {0x110000} code points, {mismatches} mismatches")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+A stand-in HTTP/1.1 server for the benchmarks, optionally over TLS.
+
+Routes:
+
+    GET  /small       a two byte body
+    GET  /bytes/<n>   n bytes of incompressible data
+    GET  /gzip/<n>    n bytes of text, sent gzip-encoded
+    GET  /cookie/<name>/<value>
+                      sets a cookie, and echoes the Cookie header it got
+    POST /upload      reads and discards the request body
+    GET  /stats       JSON counts of the connections and requests served
+
+The server runs in its own process (see :func:`start`) so that its CPU time
+does not show up in the client measurements.
+"""
+
+import gzip
+import json
+import multiprocessing
+import os
+import ssl
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CA_BUNDLE = os.path.join(HERE, "certs", "ca.pem")
+SERVER_CERT = os.path.join(HERE, "certs", "server.pem")
+SERVER_KEY = os.path.join(HERE, "certs", "server.key")
+
+CHUNK_SIZE = 64 * 1024
+_RANDOM = os.urandom(CHUNK_SIZE)
+_TEXT = (b"The quick brown fox jumps over the lazy dog. " * 1500)[:CHUNK_SIZE]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def _send(self, body, headers=None):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_bytes(self, size):
+        self.send_response(200)
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        while size > 0:
+            chunk = _RANDOM[:size]
+            self.wfile.write(chunk)
+            size -= len(chunk)
+
+    def do_GET(self):
+        self.server.count("requests")
+        route, _, arg = self.path[1:].partition("/")
+        if route == "small":
+            self._send(b"ok")
+        elif route == "bytes":
+            self._send_bytes(int(arg))
+        elif route == "gzip":
+            self._send(self.server.gzipped(int(arg)), {"Content-Encoding": "gzip"})
+        elif route == "cookie":
+            name, _, value = arg.partition("/")
+            cookie = self.headers.get("Cookie", "").encode()
+            self._send(cookie, {"Set-Cookie": f"{name}={value}; Path=/"})
+        elif route == "stats":
+            stats = json.dumps(self.server.stats()).encode()
+            self._send(stats, {"Content-Type": "application/json"})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        self.server.count("requests")
+        remaining = int(self.headers.get("Content-Length") or 0)
+        received = 0
+        while remaining > 0:
+            data = self.rfile.read(min(CHUNK_SIZE, remaining))
+            if not data:
+                break
+            received += len(data)
+            remaining -= len(data)
+        self._send(str(received).encode())
+
+
+class BenchmarkServer(ThreadingHTTPServer):
+    """Threaded HTTP/1.1 server keeping connection and request counts."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, tls=False):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.context = None
+        if tls:
+            self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.context.load_cert_chain(SERVER_CERT, SERVER_KEY)
+        self._lock = threading.Lock()
+        self._counts = {"connections": 0, "requests": 0}
+        self._gzipped = {}
+
+    def finish_request(self, request, client_address):
+        # Handshake in the connection's own thread rather than in accept().
+        if self.context is not None:
+            try:
+                request = self.context.wrap_socket(request, server_side=True)
+            except (OSError, ssl.SSLError):
+                return
+        super().finish_request(request, client_address)
+
+    def count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def gzipped(self, size):
+        with self._lock:
+            body = self._gzipped.get(size)
+            if body is None:
+                text = _TEXT * (size // len(_TEXT) + 1)
+                body = self._gzipped[size] = gzip.compress(text[:size], 6)
+            return body
+
+
+def _serve(tls, conn):
+    server = BenchmarkServer(tls)
+    conn.send(server.server_address[1])
+    conn.close()
+    server.serve_forever()
+
+
+def start(tls=False):
+    """Starts the server in a child process.
+
+    :returns: the process and the server's base URL.
+    """
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_serve, args=(tls, child), daemon=True)
+    process.start()
+    port = parent.recv()
+    scheme = "https" if tls else "http"
+    return process, f"{scheme}://localhost:{port}"
@@ -0,0 +1,237 @@
+"""
+Concurrency stress checks for ``ThreadSafeSession`` and the cookie jar.
+
+Many threads share one jar, or one session, while other threads change its
+cookies, adapters, hooks and headers. Each check then verifies invariants
+that a data race would break, such as a lost cookie, a skipped hook or a
+domain index out of step with the cookies. The session checks run against
+the local server in ``server.py``, over TLS with ``--tls``::
+
+    python benchmarks/stress_threads.py
+    python benchmarks/stress_threads.py --threads 64 --rounds 500
+
+The exit status is non-zero if any check fails.
+"""
+
+import argparse
+import sys
+import threading
+import traceback
+from http.cookiejar import CookieJar
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar, get_cookie_header
+
+import server
+
+#: Domains the jar checks spread their cookies over, the last one being
+#: set and deleted on alternate rounds.
+DOMAINS = ["example.com", ".example.com", "api.example.com", "example.org"]
+URLS = [
+    "http://example.com/",
+    "https://api.example.com/v1",
+    "http://www.example.com/",
+    "http://example.org/",
+]
+
+
+def _expect(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def _run(targets):
+    """Runs each callable in its own thread, all released at once, and
+    re-raises the first exception any of them raised."""
+    barrier = threading.Barrier(len(targets))
+    errors = []
+
+    def run(target):
+        barrier.wait()
+        try:
+            target()
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(t,)) for t in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def _cookie_header(jar, url):
+    return get_cookie_header(jar, requests.Request("GET", url).prepare())
+
+
+def check_cookie_jar(threads, rounds):
+    """Writers set, overwrite and delete their own cookies in one jar while
+    readers iterate, copy and build Cookie headers from it."""
+    jar = RequestsCookieJar()
+    done = threading.Event()
+
+    def writer(i):
+        for n in range(rounds):
+            for domain in DOMAINS:
+                jar.set(f"w{i}", str(n), domain=domain, path="/")
+            if n % 2:
+                jar.clear(DOMAINS[-1], "/", f"w{i}")
+
+    def reader():
+        last = {}
+        while not done.is_set():
+            # Each writer's values only go up, whichever view they are read
+            # through.
+            for name, value in jar.get_dict(domain=DOMAINS[0]).items():
+                _expect(int(value) >= last.get(name, 0), f"{name} went back")
+                last[name] = int(value)
+            jar.copy().items()
+            len(jar)
+            for url in URLS:
+                _cookie_header(jar, url)
+
+    def writers():
+        try:
+            _run([lambda i=i: writer(i) for i in range(threads)])
+        finally:
+            done.set()
+
+    _run([writers] + [reader] * max(2, threads // 4))
+
+    last = str(rounds - 1)
+    for i in range(threads):
+        for domain in DOMAINS:
+            value = jar.get(f"w{i}", domain=domain, path="/")
+            if domain == DOMAINS[-1] and (rounds - 1) % 2:
+                _expect(value is None, f"w{i} on {domain} was not deleted")
+            else:
+                _expect(value == last, f"w{i} on {domain} is {value!r}")
+    _expect(len(jar) == threads * len(DOMAINS) - threads * ((rounds - 1) % 2),
+            f"jar holds {len(jar)} cookies")
+
+    # The Cookie headers built through the domain index match a full scan
+    # of the same cookies by a plain CookieJar.
+    plain = CookieJar()
+    for cookie in jar:
+        plain.set_cookie(cookie)
+    for url in URLS:
+        indexed, scanned = _cookie_header(jar, url), _cookie_header(plain, url)
+        _expect(indexed == scanned, f"Cookie header for {url} differs")
+    return threads * rounds * (len(DOMAINS) + 1)
+
+
+def _stats(base_url):
+    with requests.Session() as session:
+        session.trust_env = False
+        if base_url.startswith("https"):
+            session.verify = server.CA_BUNDLE
+        return session.get(f"{base_url}/stats").json()
+
+
+def check_session(base_url, threads, rounds):
+    """Workers share one session, each storing and sending back its own
+    cookie, while another thread mounts adapters, swaps hooks and changes
+    headers and cookies."""
+    session = requests.ThreadSafeSession()
+    session.trust_env = False
+    if base_url.startswith("https"):
+        session.verify = server.CA_BUNDLE
+    adapter = HTTPAdapter(pool_maxsize=threads, pool_block=True)
+    session.mount(base_url, adapter)
+
+    lock = threading.Lock()
+    calls = [0]
+
+    def count(response, **kwargs):
+        with lock:
+            calls[0] += 1
+
+    session.register_hook("response", count)
+    before = _stats(base_url)
+    done = threading.Event()
+
+    def worker(i):
+        for n in range(rounds):
+            r = session.get(f"{base_url}/cookie/t{i}/{n}")
+            r.raise_for_status()
+            if n:
+                # The cookie stored by this thread's previous response is
+                # sent with the next request.
+                sent = r.text.split("; ")
+                _expect(f"t{i}={n - 1}" in sent, f"t{i} sent {r.text!r}")
+
+    def mutator():
+        k = 0
+        while not done.is_set():
+            session.mount(f"http://unused-{k % 16}.invalid/", HTTPAdapter())
+            hook = lambda response, **kwargs: None  # noqa: E731
+            session.register_hook("response", hook)
+            _expect(session.deregister_hook("response", hook), "hook lost")
+            with session.lock:
+                session.headers["X-Round"] = str(k)
+            session.cookies.set(f"m{k % 8}", str(k), domain="unused.invalid")
+            k += 1
+
+    def workers():
+        try:
+            _run([lambda i=i: worker(i) for i in range(threads)])
+        finally:
+            done.set()
+
+    try:
+        _run([workers, mutator])
+        after = _stats(base_url)
+        # One pool serves every thread, with at most one connection each.
+        pools = len(adapter.poolmanager.pools)
+    finally:
+        session.close()
+
+    total = threads * rounds
+    _expect(calls[0] == total, f"hook called {calls[0]} times for {total}")
+    for i in range(threads):
+        value = session.cookies.get(f"t{i}")
+        _expect(value == str(rounds - 1), f"t{i} is {value!r}")
+    requests_served = after["requests"] - before["requests"] - 1
+    _expect(requests_served == total, f"server saw {requests_served} requests")
+    _expect(pools == 1, f"{pools} pools used")
+    connections = after["connections"] - before["connections"] - 1
+    _expect(connections <= threads, f"{connections} connections opened")
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tls", action="store_true", help="run over TLS")
+    parser.add_argument("--threads", type=int, default=32, help="worker threads")
+    parser.add_argument("--rounds", type=int, default=100, help="rounds per thread")
+    args = parser.parse_args(argv)
+
+    # Switch threads as often as the interpreter allows, so that they also
+    # interleave within the code under test rather than only around it.
+    sys.setswitchinterval(1e-6)
+    process, base_url = server.start(args.tls)
+    checks = [
+        ("cookie_jar", lambda: check_cookie_jar(args.threads, args.rounds)),
+        ("session", lambda: check_session(base_url, args.threads, args.rounds)),
+    ]
+    failed = False
+    try:
+        for name, check in checks:
+            try:
+                operations = check()
+            except Exception:
+                failed = True
+                print(f"{name:12} FAILED")
+                traceback.print_exc()
+            else:
+                print(f"{name:12} ok ({operations} operations)")
+    finally:
+        process.terminate()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())